@@ -0,0 +1,103 @@
+"""
+Аутентификация по JWT без обращения к таблице пользователей.
+
+Если включена настройка STATELESS_JWT_AUTH, пользователь собирается
+из данных токена (id, username, role, is_staff, is_superuser),
+остальные поля загружаются из БД только при обращении к ним.
+Токен принимается без запроса к БД, только если версия данных
+пользователя в токене совпадает с текущей версией из кэша;
+иначе (например, после смены роли) пользователь загружается из БД.
+Версия хранится в кэше TOKEN_VERSION_CACHE_TIMEOUT секунд, поэтому
+изменения в обход сигналов (update()) или пропущенный сброс кэша
+учитываются не позже чем через этот срок.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .metrics import metrics
+
+User = get_user_model()
+
+TOKEN_VERSION_CLAIM = 'ver'
+TOKEN_VERSION_CACHE_KEY = 'auth:token_version:{}'
+DELETED_USER_VERSION = -1
+
+
+def get_access_token(user):
+    """Выдаёт токен доступа с данными, нужными для проверки прав."""
+    token = AccessToken.for_user(user)
+    for field, value in user.get_token_claims().items():
+        token[field] = value
+    token[TOKEN_VERSION_CLAIM] = user.token_version
+    return token
+
+
+def get_token_version(user_id):
+    key = TOKEN_VERSION_CACHE_KEY.format(user_id)
+    version = cache.get(key)
+    metrics.inc('yamdb_cache_requests_total', {
+        'cache': 'token_version',
+        'result': 'miss' if version is None else 'hit',
+    })
+    if version is None:
+        version = User.objects.filter(pk=user_id).values_list(
+            'token_version', flat=True
+        ).first()
+        if version is None:
+            version = DELETED_USER_VERSION
+        cache.set(
+            key, version, timeout=settings.TOKEN_VERSION_CACHE_TIMEOUT
+        )
+    return version
+
+
+def reset_token_version(user_id):
+    cache.delete(TOKEN_VERSION_CACHE_KEY.format(user_id))
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication, который при включённой настройке
+    STATELESS_JWT_AUTH не загружает пользователя из БД.
+    """
+
+    claim_fields = (*User.TOKEN_CLAIM_FIELDS, TOKEN_VERSION_CLAIM)
+
+    def get_user(self, validated_token):
+        if not getattr(settings, 'STATELESS_JWT_AUTH', False) or any(
+            claim not in validated_token for claim in self.claim_fields
+        ):
+            return super().get_user(validated_token)
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        if validated_token[TOKEN_VERSION_CLAIM] != get_token_version(user_id):
+            return super().get_user(validated_token)
+        if not validated_token['is_active']:
+            raise AuthenticationFailed(
+                'Пользователь неактивен.', code='user_inactive'
+            )
+        return self.build_user(user_id, validated_token)
+
+    def build_user(self, user_id, validated_token):
+        """Собирает пользователя из токена; прочие поля отложены."""
+        values = {
+            'id': user_id,
+            'token_version': validated_token[TOKEN_VERSION_CLAIM],
+            **{
+                field: validated_token[field]
+                for field in User.TOKEN_CLAIM_FIELDS
+            },
+        }
+        fields = [
+            field.attname for field in User._meta.concrete_fields
+            if field.attname in values
+        ]
+        return User.from_db(
+            DEFAULT_DB_ALIAS, fields, [values[field] for field in fields]
+        )
@@ -0,0 +1,53 @@
+"""
+Кэш ответов API для анонимных запросов.
+
+Ключ ответа включает версии групп данных, от которых он зависит.
+При изменении данных сигналы заменяют версию группы, и все ответы,
+построенные по старым данным, перестают находиться в кэше.
+"""
+
+from hashlib import md5
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY_TEMPLATE = 'api:version:{}'
+RESPONSE_KEY_TEMPLATE = 'api:response:{versions}:{path}'
+# Группы, смена версий которых сбрасывает все кэшированные ответы:
+# списки справочников и произведений и ответы по отдельным
+# произведениям, которые зависят и от группы 'catalog'.
+RESPONSE_CACHE_GROUPS = ('categories', 'genres', 'titles', 'catalog')
+
+
+def get_cache_versions(groups):
+    keys = [VERSION_KEY_TEMPLATE.format(group) for group in groups]
+    versions = cache.get_many(keys)
+    missing = {key: uuid4().hex for key in keys if key not in versions}
+    if missing:
+        for key, version in missing.items():
+            cache.add(key, version, timeout=None)
+        versions.update(cache.get_many(missing))
+    return [versions.get(key, missing.get(key)) for key in keys]
+
+
+def bump_cache_versions(*groups):
+    cache.set_many(
+        {VERSION_KEY_TEMPLATE.format(group): uuid4().hex for group in groups},
+        timeout=None,
+    )
+
+
+def bump_cache_versions_on_commit(*groups):
+    """
+    Меняет версии групп после фиксации транзакции,
+    чтобы в кэш не попали данные, прочитанные до коммита.
+    """
+    transaction.on_commit(lambda: bump_cache_versions(*groups))
+
+
+def get_response_cache_key(request, groups):
+    return RESPONSE_KEY_TEMPLATE.format(
+        versions='.'.join(get_cache_versions(groups)),
+        path=md5(request.get_full_path().encode()).hexdigest(),
+    )
@@ -0,0 +1,124 @@
+"""
+Справочники категорий и жанров в памяти процесса.
+
+Обе таблицы маленькие и почти не меняются, поэтому процесс загружает
+их целиком один раз и дальше находит объекты по slug и id без запросов
+к БД. Актуальность проверяется по версиям групп CATALOG_GROUPS
+в общем кэше (api.cache): сигналы меняют их после коммита изменений
+справочника, и каждый процесс при следующем обращении перечитывает
+каталог. Изменения в обход сигналов (update(), bulk_create())
+требуют явного вызова invalidate_catalog(). Если версии не доходят
+до процесса (кэш не общий), снимок всё равно перечитывается
+не реже раза в CATALOG_MAX_AGE секунд. Объекты каталога общие
+для всех запросов процесса и не должны изменяться.
+"""
+
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .cache import bump_cache_versions, get_cache_versions
+from .metrics import metrics
+from reviews.models import Category, Genre
+
+CATALOG_GROUPS = {
+    Category: 'categories:catalog',
+    Genre: 'genres:catalog',
+}
+
+
+class Catalog:
+    """Снимок справочников в порядке сортировки моделей."""
+
+    def __init__(self, versions):
+        self.versions = versions
+        self.loaded_at = monotonic()
+        # Читаем основную БД: реплика может отставать от новой версии.
+        self.objects = {
+            model: tuple(model.objects.using(DEFAULT_DB_ALIAS))
+            for model in CATALOG_GROUPS
+        }
+        self.by_id = {
+            model: {obj.pk: obj for obj in objects}
+            for model, objects in self.objects.items()
+        }
+        self.by_slug = {
+            model: {obj.slug: obj for obj in objects}
+            for model, objects in self.objects.items()
+        }
+        self.positions = {
+            model: {obj.pk: index for index, obj in enumerate(objects)}
+            for model, objects in self.objects.items()
+        }
+
+    def is_current(self, versions):
+        return self.versions == versions and (
+            monotonic() - self.loaded_at < settings.CATALOG_MAX_AGE
+        )
+
+    def all(self, model):
+        return self.objects[model]
+
+    def get_by_id(self, model, pk):
+        return self.by_id[model].get(pk)
+
+    def get_by_slug(self, model, slug):
+        return self.by_slug[model].get(slug)
+
+    def get_many(self, model, ids):
+        """
+        Объекты с данными id в порядке сортировки модели
+        или None, если каких-то id в каталоге нет.
+        """
+        by_id = self.by_id[model]
+        if not all(pk in by_id for pk in ids):
+            return None
+        return sorted(
+            (by_id[pk] for pk in ids), key=self.get_position_key(model)
+        )
+
+    def get_position_key(self, model):
+        positions = self.positions[model]
+        return lambda obj: positions[obj.pk]
+
+
+class CatalogStore:
+    """Каталог процесса, перечитываемый при смене версий в общем кэше."""
+
+    def __init__(self):
+        self.catalog = None
+        self.lock = Lock()
+
+    def get(self):
+        # Версии читаются до загрузки: изменение, зафиксированное
+        # во время загрузки, сменит версию и вызовет повторную загрузку.
+        versions = tuple(get_cache_versions(CATALOG_GROUPS.values()))
+        catalog = self.catalog
+        hit = catalog is not None and catalog.is_current(versions)
+        metrics.inc('yamdb_cache_requests_total', {
+            'cache': 'catalog', 'result': 'hit' if hit else 'miss',
+        })
+        if hit:
+            return catalog
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            # Внутри транзакции видны незафиксированные изменения,
+            # такой снимок не сохраняется для других запросов.
+            return Catalog(versions)
+        with self.lock:
+            catalog = self.catalog
+            if catalog is None or not catalog.is_current(versions):
+                catalog = self.catalog = Catalog(versions)
+        return catalog
+
+
+catalog_store = CatalogStore()
+
+
+def get_catalog():
+    return catalog_store.get()
+
+
+def invalidate_catalog():
+    bump_cache_versions(*CATALOG_GROUPS.values())
@@ -0,0 +1,91 @@
+"""
+Чтение с реплик БД.
+
+Безопасные запросы к вьюсетам с атрибутом `replica_reads = True`
+читают данные приложения reviews с одной из реплик DATABASE_REPLICAS.
+Пользователь, который недавно что-то изменил, в течение
+REPLICA_PIN_SECONDS читает с основной БД и сразу видит свои изменения.
+Ответы, которые сохраняются в общий кэш, тоже читаются с основной БД
+(read_from_primary): иначе отставание реплики закрепилось бы в кэше
+на CACHE_TIMEOUT. Запись всегда идёт в основную БД.
+"""
+
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_APPS = frozenset({'reviews'})
+PRIMARY_PIN_CACHE_KEY = 'db:primary_pin:{}'
+
+replica_reads = ContextVar('replica_reads', default=None)
+
+
+def pin_to_primary(user_id):
+    """Закрепляет чтение пользователя за основной БД на время задержки."""
+    cache.set(
+        PRIMARY_PIN_CACHE_KEY.format(user_id),
+        True,
+        settings.REPLICA_PIN_SECONDS,
+    )
+
+
+def is_pinned_to_primary(user_id):
+    return cache.get(PRIMARY_PIN_CACHE_KEY.format(user_id), False)
+
+
+def read_from_primary():
+    """
+    Дальнейшие чтения запроса - с основной БД. Возвращает False,
+    если запрос уже прочитал данные с реплики.
+    """
+    reads = replica_reads.get()
+    if reads is None:
+        return True
+    if reads.alias is None:
+        reads.alias = DEFAULT_DB_ALIAS
+    return reads.alias == DEFAULT_DB_ALIAS
+
+
+class ReplicaReads:
+    """
+    Выбор БД для чтения в рамках одного запроса.
+    Выбор откладывается до первого запроса к БД, когда DRF
+    уже определил пользователя, и дальше не меняется.
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self.alias = None
+
+    def get_alias(self):
+        if self.alias is None:
+            user = getattr(self.request, 'user', None)
+            if (
+                not settings.DATABASE_REPLICAS
+                or user is not None and user.is_authenticated
+                and is_pinned_to_primary(user.pk)
+            ):
+                self.alias = DEFAULT_DB_ALIAS
+            else:
+                self.alias = random.choice(settings.DATABASE_REPLICAS)
+        return self.alias
+
+
+class ReplicaRouter:
+    """Роутер БД: чтение с реплики, если оно разрешено для запроса."""
+
+    def db_for_read(self, model, **hints):
+        reads = replica_reads.get()
+        if reads is None or model._meta.app_label not in REPLICA_APPS:
+            return None
+        return reads.get_alias()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики содержат те же данные, что и основная БД.
+        return True
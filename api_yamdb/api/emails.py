@@ -1,10 +1,11 @@
 from django.conf import settings
-from django.core.mail import send_mail
 
+from users.services import queue_email
 
-def send_confirmation_email(email, accoun_activation_token):
+
+def queue_confirmation_email(email, accoun_activation_token):
     """
-    Отправляет письмо с кодом подтверждения
+    Ставит в очередь письмо с кодом подтверждения
     на указанный адрес электронной почты.
     """
     subject = 'Токен для активации аккунта на Yamdb'
@@ -12,11 +13,10 @@ def send_confirmation_email(email, accoun_activation_token):
         'Токен для активации Вашего '
         f'аккунта на Yamdb: {accoun_activation_token}'
     )
-    recipient_list = [email]
 
-    send_mail(
+    queue_email(
         from_email=settings.DEFAULT_FROM_EMAIL,
         subject=subject,
-        message=message,
-        recipient_list=recipient_list,
+        body=message,
+        recipient=email,
     )
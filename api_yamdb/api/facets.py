@@ -0,0 +1,91 @@
+"""
+Фасеты списка произведений: количество произведений по категориям,
+жанрам, десятилетиям и оценкам.
+
+Категории, десятилетия и оценки считаются одним запросом с группировкой
+по трём столбцам сразу, жанры - вторым запросом по связям GenreTitle.
+Число запросов не зависит ни от фильтров, ни от размеров справочников;
+названия категорий и жанров берутся из каталога справочников.
+Фасеты всего каталога (без фильтров) хранятся в кэше под версией
+группы 'titles'.
+"""
+
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F
+
+from .cache import get_cache_versions
+from .catalog import get_catalog
+from .metrics import metrics
+from reviews.models import Category, Genre
+
+FACETS_KEY_TEMPLATE = 'api:facets:{version}'
+
+
+def get_lookup_facet(catalog, model, counts):
+    """Счётчики по id справочника -> список slug, name, count."""
+    objects = {pk: catalog.get_by_id(model, pk) for pk in counts}
+    missing = [pk for pk, obj in objects.items() if obj is None]
+    if missing:
+        # Справочник изменён в обход сигналов - дочитываем из БД.
+        objects.update(model.objects.in_bulk(missing))
+    return sorted(
+        (
+            {'slug': obj.slug, 'name': obj.name, 'count': counts[pk]}
+            for pk, obj in objects.items()
+        ),
+        key=lambda facet: (-facet['count'], facet['name']),
+    )
+
+
+def get_title_facets(queryset):
+    """Фасеты произведений из queryset (с уже применёнными фильтрами)."""
+    # distinct: фильтр genre__icontains соединяет произведение
+    # со всеми подходящими жанрами, и строки могут повторяться.
+    queryset = queryset.order_by()
+    groups = queryset.values(
+        'category_id', 'rating', decade=F('year') / 10 * 10
+    ).annotate(count=Count('pk', distinct=True))
+    categories, decades, ratings = Counter(), Counter(), Counter()
+    for group in groups:
+        categories[group['category_id']] += group['count']
+        decades[group['decade']] += group['count']
+        ratings[group['rating']] += group['count']
+    genres = dict(
+        queryset.filter(genre_title__isnull=False)
+        .values_list('genre_title__genre_id')
+        .annotate(count=Count('pk', distinct=True))
+    )
+    catalog = get_catalog()
+    return {
+        'count': sum(categories.values()),
+        'category': get_lookup_facet(catalog, Category, categories),
+        'genre': get_lookup_facet(catalog, Genre, genres),
+        'decade': [
+            {'decade': decade, 'count': decades[decade]}
+            for decade in sorted(decades)
+        ],
+        # Произведения без оценок - в группе с rating = null.
+        'rating': [
+            {'rating': rating, 'count': ratings[rating]}
+            for rating in sorted(
+                ratings, key=lambda rating: (rating is None, rating)
+            )
+        ],
+    }
+
+
+def get_cached_title_facets(queryset):
+    """Фасеты всего каталога из кэша; пересчитываются при изменениях."""
+    version, = get_cache_versions(['titles'])
+    key = FACETS_KEY_TEMPLATE.format(version=version)
+    facets = cache.get(key)
+    metrics.inc('yamdb_cache_requests_total', {
+        'cache': 'facets', 'result': 'miss' if facets is None else 'hit',
+    })
+    if facets is None:
+        facets = get_title_facets(queryset)
+        cache.set(key, facets, settings.CACHE_TIMEOUT)
+    return facets
@@ -1,15 +1,127 @@
-from django_filters import CharFilter, FilterSet
+from django_filters import CharFilter, ChoiceFilter, FilterSet
+from rest_framework.filters import OrderingFilter, SearchFilter
 
-from reviews.models import Title
+from .catalog import get_catalog
+from .pagination import KeysetPagination
+from reviews.models import Category, Genre, GenreTitle, Title
+from reviews.search import get_title_search_backend
 
 
 class TitleFilter(FilterSet):
-    """Filterset для возможности фильтрации произведений по идентификатору."""
+    """
+    Фильтрация произведений.
+    `genre` и `category` - точные slug через запятую; slug переводятся
+    в id по каталогу справочников, поэтому запрос идёт по индексам
+    без соединения со справочниками. Для нескольких жанров
+    `genre_match=all` оставляет произведения со всеми жанрами,
+    по умолчанию (`any`) - хотя бы с одним. Поиск подстроки в slug -
+    только явными параметрами `genre__icontains`, `category__icontains`.
+    """
 
-    genre = CharFilter(field_name='genre__slug', lookup_expr='icontains')
-    category = CharFilter(field_name='category__slug', lookup_expr='icontains')
+    GENRE_MATCH_ANY = 'any'
+    GENRE_MATCH_ALL = 'all'
+
+    genre = CharFilter(method='filter_genre')
+    genre_match = ChoiceFilter(
+        choices=((GENRE_MATCH_ANY, 'any'), (GENRE_MATCH_ALL, 'all')),
+        method='filter_nothing',
+    )
+    category = CharFilter(method='filter_category')
+    genre__icontains = CharFilter(
+        field_name='genre__slug', lookup_expr='icontains', distinct=True
+    )
+    category__icontains = CharFilter(
+        field_name='category__slug', lookup_expr='icontains'
+    )
     name = CharFilter(field_name='name', lookup_expr='icontains')
 
     class Meta:
         model = Title
         fields = ('name', 'year', 'category', 'genre')
+
+    @staticmethod
+    def get_ids(model, value):
+        catalog = get_catalog()
+        slugs = {slug.strip() for slug in value.split(',') if slug.strip()}
+        objects = (catalog.get_by_slug(model, slug) for slug in slugs)
+        return slugs, {obj.pk for obj in objects if obj is not None}
+
+    def filter_nothing(self, queryset, name, value):
+        return queryset
+
+    def filter_category(self, queryset, name, value):
+        _, category_ids = self.get_ids(Category, value)
+        return queryset.filter(category_id__in=category_ids)
+
+    def filter_genre(self, queryset, name, value):
+        slugs, genre_ids = self.get_ids(Genre, value)
+        # Подзапрос вместо соединения: произведение не повторяется,
+        # сколько бы его жанров ни совпало.
+        if self.form.cleaned_data.get('genre_match') != self.GENRE_MATCH_ALL:
+            return queryset.filter(pk__in=GenreTitle.objects.filter(
+                genre_id__in=genre_ids
+            ).values('title_id'))
+        if not genre_ids or len(genre_ids) < len(slugs):
+            return queryset.none()
+        # По подзапросу на жанр: каждый читает диапазон индекса
+        # (genre_id, title_id) без группировки во временном B-дереве.
+        for genre_id in genre_ids:
+            queryset = queryset.filter(pk__in=GenreTitle.objects.filter(
+                genre_id=genre_id
+            ).values('title_id'))
+        return queryset
+
+
+class TitleSearchFilter(SearchFilter):
+    """
+    Поиск произведений по параметру `search` через полнотекстовый индекс,
+    результаты упорядочены по релевантности.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        return get_title_search_backend(queryset.db).search(queryset, terms)
+
+
+class TitleOrderingFilter(OrderingFilter):
+    """
+    Сортировка произведений параметром `ordering` по одному полю
+    из `ordering_fields`, по убыванию - с минусом (`-rating`).
+    Поле дополняется до уникального ключа из `view.ordering_keys`,
+    для каждого ключа есть индекс: страница и пагинация по ключу
+    читают диапазон индекса без сортировки. Без параметра остаётся
+    порядок queryset (по году и названию или по релевантности поиска).
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return None
+        field = ordering[0]
+        key = view.ordering_keys[field.lstrip('-')]
+        if field.startswith('-'):
+            return [KeysetPagination.invert(name) for name in key]
+        return list(key)
+
+
+class CatalogSearchFilter(SearchFilter):
+    """
+    Поиск по параметру `search` в списке объектов каталога справочников:
+    каждое слово должно встречаться (без учёта регистра)
+    хотя бы в одном из полей `search_fields`.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = [term.casefold() for term in self.get_search_terms(request)]
+        fields = self.get_search_fields(view, request)
+        if not terms or not fields:
+            return queryset
+        return [
+            obj for obj in queryset
+            if all(
+                any(term in getattr(obj, field).casefold() for field in fields)
+                for term in terms
+            )
+        ]
@@ -0,0 +1,85 @@
+"""
+Замеры времени обработки запроса: количество и время SQL-запросов,
+время сериализации и рендеринга ответа.
+Замеры текущего запроса хранятся в contextvar и заполняются
+обёрткой выполнения запросов к БД и миксином сериализаторов.
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from time import perf_counter
+
+current_timings = ContextVar('current_timings', default=None)
+
+
+class RequestTimings:
+    """Замеры одного запроса; длительности хранятся в секундах."""
+
+    def __init__(self, collect_sql=False):
+        self.queries = 0
+        self.durations = defaultdict(float)
+        self.sql = [] if collect_sql else None
+        self.view = None
+        self.action = None
+        self._running = set()
+
+    @contextmanager
+    def measure(self, name):
+        # Вложенные замеры одного вида (например, вложенные
+        # сериализаторы) учитываются один раз.
+        if name in self._running:
+            yield
+            return
+        self._running.add(name)
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] += perf_counter() - started
+            self._running.discard(name)
+
+    def __call__(self, execute, sql, params, many, context):
+        """Обёртка выполнения SQL для connection.execute_wrapper()."""
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = perf_counter() - started
+            self.queries += 1
+            self.durations['db'] += duration
+            if self.sql is not None:
+                self.sql.append((sql, duration))
+
+    def get_server_timing(self, total):
+        metrics = [
+            f'db;dur={self.durations["db"] * 1000:.2f};'
+            f'desc="{self.queries} queries"',
+            *(
+                f'{name};dur={self.durations[name] * 1000:.2f}'
+                for name in ('serialize', 'render')
+                if name in self.durations
+            ),
+            f'total;dur={total * 1000:.2f}',
+        ]
+        return ', '.join(metrics)
+
+    def as_dict(self, total):
+        return {
+            'view': self.view,
+            'action': self.action,
+            'queries': self.queries,
+            'total_ms': round(total * 1000, 2),
+            **{
+                f'{name}_ms': round(duration * 1000, 2)
+                for name, duration in self.durations.items()
+            },
+        }
+
+
+def measure(name):
+    """Замер участка кода, если для текущего запроса включены замеры."""
+    timings = current_timings.get()
+    if timings is None:
+        return nullcontext()
+    return timings.measure(name)
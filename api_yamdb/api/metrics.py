@@ -0,0 +1,227 @@
+"""
+Метрики сервиса в текстовом формате Prometheus.
+
+Каждый процесс копит метрики в памяти и не чаще раза в FLUSH_INTERVAL
+секунд сохраняет их в свой файл в каталоге METRICS_DIR. Эндпоинт
+/metrics суммирует файлы всех процессов, поэтому процессы не делят
+между собой блокировки. Без METRICS_DIR отдаются метрики текущего
+процесса.
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+from uuid import uuid4
+
+from django.conf import settings
+
+FLUSH_INTERVAL = 1.0
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICS = {
+    'yamdb_http_requests_total': (
+        'counter', 'Количество запросов.'
+    ),
+    'yamdb_http_errors_total': (
+        'counter', 'Количество ответов со статусом 4xx и 5xx.'
+    ),
+    'yamdb_http_request_duration_seconds': (
+        'histogram', 'Время обработки запроса.'
+    ),
+    'yamdb_db_queries_total': (
+        'counter', 'Количество запросов к БД.'
+    ),
+    'yamdb_db_query_duration_seconds_total': (
+        'counter', 'Суммарное время запросов к БД.'
+    ),
+    'yamdb_cache_requests_total': (
+        'counter', 'Обращения к кэшу по результату (hit/miss).'
+    ),
+}
+
+
+class QueryCounter:
+    """Обёртка выполнения SQL: количество и суммарное время запросов."""
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.duration += time.perf_counter() - started
+
+
+class MetricsRegistry:
+    """Метрики процесса: счётчики и гистограммы с метками."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.counters = defaultdict(float)
+            self.histograms = {}
+            self.pid = os.getpid()
+            self.file_name = f'{self.pid}-{uuid4().hex}.json'
+            self.flushed_at = 0.0
+
+    def check_fork(self):
+        # После fork дочерний процесс не должен повторно
+        # учитывать метрики, накопленные родителем.
+        if self.pid != os.getpid():
+            self.reset()
+
+    @staticmethod
+    def get_key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, labels, value=1):
+        self.check_fork()
+        key = self.get_key(name, labels)
+        with self.lock:
+            self.counters[key] += value
+
+    def observe(self, name, labels, value):
+        self.check_fork()
+        key = self.get_key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {
+                    'buckets': [0] * len(BUCKETS), 'sum': 0.0, 'count': 0,
+                }
+            index = bisect_left(BUCKETS, value)
+            if index < len(BUCKETS):
+                histogram['buckets'][index] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'counters': [
+                    [name, labels, value]
+                    for (name, labels), value in self.counters.items()
+                ],
+                'histograms': [
+                    [name, labels, dict(histogram, buckets=list(
+                        histogram['buckets']
+                    ))]
+                    for (name, labels), histogram in self.histograms.items()
+                ],
+            }
+
+    def flush(self, force=False):
+        directory = settings.METRICS_DIR
+        now = time.monotonic()
+        if not directory or (
+            not force and now - self.flushed_at < FLUSH_INTERVAL
+        ):
+            return
+        self.check_fork()
+        self.flushed_at = now
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        temporary = path / f'.{self.file_name}.tmp'
+        temporary.write_text(json.dumps(self.snapshot()))
+        os.replace(temporary, path / self.file_name)
+
+    def collect(self):
+        """Метрики всех процессов (или только текущего без METRICS_DIR)."""
+        directory = settings.METRICS_DIR
+        if not directory:
+            return [self.snapshot()]
+        self.flush(force=True)
+        snapshots = []
+        for path in Path(directory).glob('*.json'):
+            try:
+                snapshots.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+
+def merge(snapshots):
+    counters = defaultdict(float)
+    histograms = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot['counters']:
+            counters[name, tuple(map(tuple, labels))] += value
+        for name, labels, data in snapshot['histograms']:
+            key = name, tuple(map(tuple, labels))
+            total = histograms.setdefault(key, {
+                'buckets': [0] * len(BUCKETS), 'sum': 0.0, 'count': 0,
+            })
+            for index, count in enumerate(data['buckets']):
+                total['buckets'][index] += count
+            total['sum'] += data['sum']
+            total['count'] += data['count']
+    return counters, histograms
+
+
+def escape_label_value(value):
+    return (
+        str(value).replace('\\', r'\\').replace('"', r'\"')
+        .replace('\n', r'\n')
+    )
+
+
+def format_labels(labels, **extra):
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ''
+    return '{%s}' % ','.join(
+        f'{name}="{escape_label_value(value)}"' for name, value in pairs
+    )
+
+
+def format_value(value):
+    return int(value) if float(value).is_integer() else value
+
+
+def format_histogram(name, labels, data):
+    lines = []
+    cumulative = 0
+    for bound, count in zip(BUCKETS, data['buckets']):
+        cumulative += count
+        lines.append(
+            f'{name}_bucket{format_labels(labels, le=bound)} {cumulative}'
+        )
+    lines.append(f'{name}_bucket{format_labels(labels, le="+Inf")} '
+                 f'{data["count"]}')
+    lines.append(f'{name}_sum{format_labels(labels)} {data["sum"]}')
+    lines.append(f'{name}_count{format_labels(labels)} {data["count"]}')
+    return lines
+
+
+def format_metrics(snapshots):
+    counters, histograms = merge(snapshots)
+    lines = []
+    for name, (metric_type, help_text) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {metric_type}')
+        if metric_type == 'histogram':
+            for (metric, labels), data in sorted(histograms.items()):
+                if metric == name:
+                    lines.extend(format_histogram(name, labels, data))
+            continue
+        for (metric, labels), value in sorted(counters.items()):
+            if metric == name:
+                lines.append(
+                    f'{name}{format_labels(labels)} {format_value(value)}'
+                )
+    return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,172 @@
+import json
+import logging
+import random
+from contextlib import ExitStack
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+
+from .db_router import ReplicaReads, pin_to_primary, replica_reads
+from .instrumentation import RequestTimings, current_timings
+from .metrics import QueryCounter, metrics
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """
+    Метрики запросов для /metrics: количество, время обработки,
+    ошибки и запросы к БД с метками basename маршрута и HTTP-метода.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    @staticmethod
+    def get_view_label(request):
+        match = request.resolver_match
+        if match is None:
+            return 'unmatched'
+        initkwargs = getattr(match.func, 'initkwargs', None) or {}
+        return initkwargs.get('basename') or match.url_name or 'unnamed'
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        started = perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        duration = perf_counter() - started
+
+        labels = {
+            'view': self.get_view_label(request),
+            'method': request.method,
+        }
+        metrics.inc('yamdb_http_requests_total', labels)
+        metrics.observe(
+            'yamdb_http_request_duration_seconds', labels, duration
+        )
+        if response.status_code >= 400:
+            metrics.inc(
+                'yamdb_http_errors_total',
+                {**labels, 'status': str(response.status_code)},
+            )
+        metrics.inc('yamdb_db_queries_total', labels, counter.queries)
+        metrics.inc(
+            'yamdb_db_query_duration_seconds_total', labels, counter.duration
+        )
+        metrics.flush()
+        return response
+
+
+class RequestTimingMiddleware:
+    """
+    Замеры времени обработки запроса.
+    Для доли запросов REQUEST_TIMING_SAMPLE_RATE (по умолчанию ни для
+    одного) добавляет заголовок Server-Timing и пишет строку журнала
+    в JSON. Запросы дольше REQUEST_TIMING_SLOW_MS (если задан)
+    журналируются вместе с SQL независимо от этой доли.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        sampled = random.random() < settings.REQUEST_TIMING_SAMPLE_RATE
+        slow_ms = settings.REQUEST_TIMING_SLOW_MS
+        if not sampled and slow_ms is None:
+            return self.get_response(request)
+        timings = RequestTimings(collect_sql=slow_ms is not None)
+        request.timings = timings
+        token = current_timings.set(timings)
+        started = perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings))
+                response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        total = perf_counter() - started
+
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            **timings.as_dict(total),
+        }
+        if sampled:
+            response['Server-Timing'] = timings.get_server_timing(total)
+            logger.info(json.dumps(record, ensure_ascii=False))
+        if slow_ms is not None and total * 1000 >= slow_ms:
+            record['sql'] = [
+                {'sql': sql, 'ms': round(duration * 1000, 2)}
+                for sql, duration in timings.sql
+            ]
+            logger.warning(json.dumps(record, ensure_ascii=False))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timings = getattr(request, 'timings', None)
+        if timings is None:
+            return None
+        actions = getattr(view_func, 'actions', None)
+        if actions:
+            timings.view = view_func.cls.__name__
+            timings.action = actions.get(request.method.lower())
+        else:
+            timings.view = view_func.__name__
+            timings.action = request.method.lower()
+        return None
+
+    def process_template_response(self, request, response):
+        timings = getattr(request, 'timings', None)
+        if timings is None:
+            return response
+        # Рендеринг выполняется сразу после этого метода,
+        # время фиксируется в колбэке после рендеринга.
+        started = perf_counter()
+
+        def finish_render(response):
+            timings.durations['render'] += perf_counter() - started
+
+        response.add_post_render_callback(finish_render)
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Разрешает чтение с реплик для безопасных запросов к вьюсетам
+    с атрибутом `replica_reads`. После успешного изменяющего запроса
+    пользователь закрепляется за основной БД.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = replica_reads.set(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            replica_reads.reset(token)
+        user = getattr(request, 'user', None)
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and user is not None
+            and user.is_authenticated
+        ):
+            pin_to_primary(user.pk)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'cls', None)
+        if request.method in SAFE_METHODS and getattr(
+            view_class, 'replica_reads', False
+        ):
+            replica_reads.set(ReplicaReads(request))
+        return None
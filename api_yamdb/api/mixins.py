@@ -1,5 +1,24 @@
-from rest_framework import serializers
+from functools import cached_property
+from hashlib import md5
 
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import (
+    Count, F, Max, OuterRef, Subquery, Sum, prefetch_related_objects
+)
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import serializers, status
+from rest_framework.response import Response
+
+from .cache import get_response_cache_key
+from .db_router import read_from_primary
+from .instrumentation import measure
+from .metrics import metrics
+from .renderers import StreamingJSONRenderer
+from .representation import compile_representation
 from api_yamdb.constants import USERNAME_MAX_LENGTH
 from users.validators import validate_username
 
@@ -12,3 +31,353 @@ class UsernameFieldMixin(serializers.Serializer):
         validators=[validate_username],
         max_length=USERNAME_MAX_LENGTH
     )
+
+
+class TimedRepresentationMixin:
+    """Миксин для сериализаторов: замер времени построения представления."""
+
+    def to_representation(self, instance):
+        with measure('serialize'):
+            return super().to_representation(instance)
+
+
+class FastRepresentationMixin:
+    """
+    Миксин для сериализаторов: представление строится заранее
+    собранными функциями доступа к полям (api.representation).
+    Штатный путь DRF включается ключом контекста 'drf_representation'.
+    """
+
+    @cached_property
+    def representation_plan(self):
+        return compile_representation(self)
+
+    def to_representation(self, instance):
+        if self.context.get('drf_representation'):
+            return super().to_representation(instance)
+        return self.representation_plan(instance)
+
+
+class QueryPlanMixin:
+    """
+    Миксин для вьюсетов: декларативный план запросов по действиям.
+    `query_plan` сопоставляет действию (или ключу 'default') словарь
+    с ключами `select_related` и `prefetch_related`.
+    План применяется и к queryset, и к объекту, созданному/изменённому
+    сериализатором, чтобы его представление строилось без лишних запросов.
+    """
+
+    query_plan = {}
+
+    def get_query_plan(self):
+        return self.query_plan.get(
+            self.action, self.query_plan.get('default', {})
+        )
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        plan = self.get_query_plan()
+        if plan.get('select_related'):
+            queryset = queryset.select_related(*plan['select_related'])
+        if plan.get('prefetch_related'):
+            queryset = queryset.prefetch_related(*plan['prefetch_related'])
+        return queryset
+
+    def apply_query_plan(self, instance):
+        plan = self.get_query_plan()
+        prefetch_related_objects(
+            [instance],
+            *plan.get('select_related', ()),
+            *plan.get('prefetch_related', ()),
+        )
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        self.apply_query_plan(serializer.instance)
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        self.apply_query_plan(serializer.instance)
+
+
+class StreamingListMixin:
+    """
+    Миксин для вьюсетов: потоковый режим списка (?stream=true).
+    Объекты страницы читаются из БД через iterator(chunk_size),
+    сериализуются и отправляются клиенту порциями, поэтому память
+    ограничена размером порции, а не размером страницы.
+    Тело ответа совпадает с обычным ответом для той же страницы.
+    """
+
+    stream_query_param = 'stream'
+    stream_renderer_class = StreamingJSONRenderer
+
+    def is_streaming(self):
+        return self.request.query_params.get(
+            self.stream_query_param, ''
+        ).lower() in ('1', 'true')
+
+    def stream_list(self, request):
+        if self.paginator.keyset_pagination_class.cursor_query_param in (
+            request.query_params
+        ):
+            raise serializers.ValidationError({
+                self.stream_query_param: (
+                    'Потоковый режим поддерживает только пагинацию '
+                    'по номеру страницы.'
+                )
+            })
+        queryset = self.filter_queryset(self.get_queryset())
+        # Тело ответа читается после выхода из middleware,
+        # поэтому БД (реплика или основная) выбирается сейчас.
+        queryset = queryset.using(queryset.db)
+        envelope, page = self.paginator.paginate_queryset_lazily(
+            queryset, request, self
+        )
+        chunk_size = settings.STREAMING_CHUNK_SIZE
+        serializer = self.get_serializer()
+        renderer = self.stream_renderer_class()
+        return StreamingHttpResponse(
+            renderer.render_stream(
+                envelope,
+                map(
+                    serializer.to_representation,
+                    page.iterator(chunk_size=chunk_size),
+                ),
+                chunk_size,
+            ),
+            content_type=renderer.media_type,
+        )
+
+    def list(self, request, *args, **kwargs):
+        if self.is_streaming():
+            return self.stream_list(request)
+        return super().list(request, *args, **kwargs)
+
+
+class AnonymousResponseCacheMixin:
+    """
+    Миксин для вьюсетов: кэширует данные ответов на GET-запросы
+    анонимных пользователей с учётом строки запроса.
+    Группы данных, от которых зависит ответ, возвращает
+    `get_cache_groups` (по умолчанию - одна группа `cache_group`);
+    их версии меняются сигналами в api.signals.
+    Ответ для кэша читается с основной БД, а не с реплики.
+    """
+
+    cache_group = None
+
+    def get_cache_groups(self):
+        assert self.cache_group is not None, (
+            f"'{self.__class__.__name__}' should either include a "
+            f"`cache_group` attribute, or override the "
+            f"`get_cache_groups()` method."
+        )
+        return (self.cache_group,)
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return handler(request, *args, **kwargs)
+        key = get_response_cache_key(request, self.get_cache_groups())
+        cached = cache.get(key)
+        metrics.inc('yamdb_cache_requests_total', {
+            'cache': 'responses',
+            'result': 'miss' if cached is None else 'hit',
+        })
+        if cached is not None:
+            data, headers = cached
+            return get_conditional_response(
+                request,
+                etag=headers.get('ETag'),
+                last_modified=parse_http_date_safe(
+                    headers.get('Last-Modified')
+                ),
+            ) or Response(data, headers=headers)
+        cacheable = read_from_primary()
+        response = handler(request, *args, **kwargs)
+        if cacheable and response.status_code == status.HTTP_200_OK and not (
+            response.streaming
+        ):
+            headers = {
+                header: response[header]
+                for header in ('ETag', 'Last-Modified')
+                if response.has_header(header)
+            }
+            cache.set(key, (response.data, headers), settings.CACHE_TIMEOUT)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class AnonymousDetailCacheMixin(AnonymousResponseCacheMixin):
+    """Дополнительно кэширует ответы на запросы отдельных объектов."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class ConditionalGetMixin:
+    """
+    Миксин для вьюсетов: валидаторы ETag/Last-Modified для списков.
+    Валидаторы списка считаются по окну текущей страницы: тот же
+    пагинатор выбирает id строк страницы (и поля ключа пагинации)
+    с датами изменения из `last_modified_fields`, без загрузки
+    объектов. В потоковом режиме окно не читается, а сворачивается
+    одним агрегатом. В постраничном режиме добавляется COUNT(*)
+    для поля count; ответ 304 отдаётся без сериализации.
+    """
+
+    last_modified_fields = ('updated_at',)
+
+    def get_last_modified_annotations(self, model):
+        """
+        Даты изменения страницы. Дата связанного объекта читается
+        подзапросом только для строк окна, без соединения таблиц,
+        которое осталось бы и в COUNT(*).
+        """
+        annotations = {}
+        for index, field in enumerate(self.last_modified_fields):
+            name, _, related_field = field.partition('__')
+            expression = F(name)
+            if related_field:
+                relation = model._meta.get_field(name)
+                expression = Subquery(
+                    relation.related_model.objects.filter(
+                        pk=OuterRef(relation.attname)
+                    ).order_by().values(related_field)[:1]
+                )
+            annotations[f'last_modified_{index}'] = expression
+        return annotations
+
+    def get_list_validator_values(self, queryset):
+        """Состояние страницы (ссылки, id объектов) и дата изменения."""
+        annotations = self.get_last_modified_annotations(queryset.model)
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if hasattr(self, 'is_streaming') and self.is_streaming():
+            return self.get_stream_validator_values(queryset, annotations)
+        paginator = self.paginator
+        pk_name = queryset.model._meta.pk.name
+        fields = {pk_name, *annotations}
+        if paginator.uses_keyset(self.request, self):
+            fields.update(field.lstrip('-') for field in self.keyset_ordering)
+        page = paginator.paginate_queryset(
+            queryset.annotate(**annotations).values(*fields),
+            self.request,
+            view=self,
+        )
+        envelope = paginator.get_paginated_response([]).data
+        envelope.pop('results')
+        last_modified = max(
+            (
+                value for row in page for name in annotations
+                if (value := row[name])
+            ),
+            default=None,
+        )
+        return (envelope, [row[pk_name] for row in page]), last_modified
+
+    def get_stream_validator_values(self, queryset, annotations):
+        """
+        Потоковая страница может быть большой, поэтому её строки
+        не читаются дважды: окно сворачивается в количество, сумму id
+        и даты изменения одним агрегатом.
+        """
+        envelope, page = self.paginator.paginate_queryset_lazily(
+            queryset, self.request, self
+        )
+        values = queryset.model.objects.filter(
+            pk__in=page.values('pk')
+        ).aggregate(
+            rows=Count('pk'),
+            ids=Sum('pk'),
+            **{
+                name: Max(expression)
+                for name, expression in annotations.items()
+            },
+        )
+        last_modified = max(
+            (value for name in annotations if (value := values.pop(name))),
+            default=None,
+        )
+        return (envelope, values), last_modified
+
+    def get_validator_values(self, queryset):
+        """Количество объектов и дата последнего изменения."""
+        aggregates = {
+            f'last_modified_{index}': Max(field)
+            for index, field in enumerate(self.last_modified_fields)
+        }
+        values = queryset.order_by().aggregate(
+            count=Count('pk'), **aggregates
+        )
+        count = values.pop('count')
+        last_modified = max(
+            (value for value in values.values() if value), default=None
+        )
+        return count, last_modified
+
+    def get_validators(self, values):
+        state, last_modified = values
+        if last_modified is None:
+            return None, None
+        fingerprint = '|'.join((
+            self.request.get_full_path(),
+            self.request.accepted_renderer.format,
+            str(state),
+            last_modified.isoformat(),
+        ))
+        return f'"{md5(fingerprint.encode()).hexdigest()}"', last_modified
+
+    def get_conditional_response(self, handler, request, values,
+                                 *args, with_last_modified=False, **kwargs):
+        etag, last_modified = self.get_validators(values)
+        if not with_last_modified:
+            last_modified = None
+        last_modified = last_modified and int(last_modified.timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if etag:
+            response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list,
+            request,
+            self.get_list_validator_values(
+                self.filter_queryset(self.get_queryset())
+            ),
+            *args,
+            **kwargs,
+        )
+
+
+class ConditionalDetailMixin(ConditionalGetMixin):
+    """Дополнительно добавляет ETag/Last-Modified к ответам по объектам."""
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        except (TypeError, ValueError, ValidationError):
+            return super().retrieve(request, *args, **kwargs)
+        return self.get_conditional_response(
+            super().retrieve,
+            request,
+            self.get_validator_values(queryset),
+            *args,
+            with_last_modified=True,
+            **kwargs,
+        )
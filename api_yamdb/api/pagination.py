@@ -0,0 +1,275 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage, Paginator
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Пагинация по ключу (keyset).
+    Позиция страницы задаётся значениями полей сортировки последней
+    (или первой) записи, поэтому стоимость запроса не зависит от глубины.
+    Сортировка берётся из атрибута вьюсета `keyset_ordering`,
+    последним полем должен быть уникальный id, все поля - в одном
+    направлении (по возрастанию или по убыванию). Поля ключа могут
+    допускать NULL.
+    """
+
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Некорректный курсор.'
+
+    def __init__(self, page_size):
+        self.page_size = page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.ordering = view.keyset_ordering
+        values, reverse = self.decode_cursor(request)
+        if values is not None:
+            values = self.clean_values(queryset.model, values)
+
+        ordering = self.ordering
+        if reverse:
+            ordering = [self.invert(field) for field in ordering]
+        queryset = queryset.order_by(*ordering)
+        if values is None:
+            page = list(queryset[:self.page_size + 1])
+        else:
+            page = self.get_rows_after(queryset, ordering, values)
+
+        has_more = len(page) > self.page_size
+        page = page[:self.page_size]
+        if reverse:
+            page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, values is not None
+        self.page = page
+        return page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    @staticmethod
+    def invert(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    def get_rows_after(self, queryset, ordering, values):
+        """
+        Строки после позиции: участки keyset_segments читаются по очереди,
+        пока не наберётся страница. Обычно участок один.
+        """
+        nullable = {
+            field.name for field in queryset.model._meta.concrete_fields
+            if field.null
+        }
+        page = []
+        for condition in self.keyset_segments(ordering, values, nullable):
+            page.extend(
+                queryset.filter(condition)[:self.page_size + 1 - len(page)]
+            )
+            if len(page) > self.page_size:
+                break
+        return page
+
+    @staticmethod
+    def keyset_segments(ordering, values, nullable=()):
+        """
+        Условие "строго после позиции" для составного ключа в виде
+        a >= x AND (a > x OR (b >= y AND (b > y OR c > z))): в отличие
+        от объединения условий через OR, это один диапазон индекса,
+        который читается уже в порядке сортировки. Строки с NULL
+        лежат в отдельном диапазоне, поэтому возвращается список
+        непересекающихся условий в порядке сортировки.
+        """
+        field, value = ordering[0], values[0]
+        name, descending = field.lstrip('-'), field.startswith('-')
+        after = KeysetPagination.after_value(
+            name, value, descending, name in nullable
+        )
+        if len(ordering) == 1:
+            return after
+        tail = KeysetPagination.keyset_segments(
+            ordering[1:], values[1:], nullable
+        )
+        if value is not None and len(tail) == 1:
+            lookup = 'lte' if descending else 'gte'
+            return [
+                Q(**{f'{name}__{lookup}': value}) & (after[0] | tail[0]),
+                *after[1:],
+            ]
+        equal = Q(**(
+            {f'{name}__isnull': True} if value is None else {name: value}
+        ))
+        return [equal & condition for condition in tail] + after
+
+    @staticmethod
+    def after_value(name, value, descending, nullable):
+        """
+        Условия "поле после value" в порядке сортировки. NULL в SQLite
+        меньше любого значения: первый по возрастанию, последний
+        по убыванию.
+        """
+        if value is None:
+            return [] if descending else [Q(**{f'{name}__isnull': False})]
+        if not descending:
+            return [Q(**{f'{name}__gt': value})]
+        before = Q(**{f'{name}__lt': value})
+        if nullable:
+            return [before, Q(**{f'{name}__isnull': True})]
+        return [before]
+
+    def get_position(self, instance):
+        """Значения ключа объекта или строки values()."""
+        values = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            value = (
+                instance[name] if isinstance(instance, dict)
+                else getattr(instance, name)
+            )
+            if hasattr(value, 'isoformat'):
+                value = value.isoformat()
+            values.append(value)
+        return values
+
+    def encode_cursor(self, instance, reverse):
+        payload = {'p': self.get_position(instance)}
+        if reverse:
+            payload['r'] = 1
+        encoded = urlsafe_b64encode(
+            json.dumps(payload, separators=(',', ':')).encode()
+        ).decode()
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded
+        )
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode()))
+            values = payload['p']
+            reverse = bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def clean_values(self, model, values):
+        """Приводит значения из курсора к типам полей ключа."""
+        cleaned = []
+        try:
+            for field_name, value in zip(self.ordering, values):
+                field = model._meta.get_field(field_name.lstrip('-'))
+                if value is None and not field.null:
+                    raise ValidationError('NULL в поле без NULL.')
+                value = field.to_python(value)
+                field.run_validators(value)
+                cleaned.append(value)
+        except (ValidationError, ValueError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+        return cleaned
+
+
+class PageNumberOrKeysetPagination(PageNumberPagination):
+    """
+    По умолчанию - постраничная пагинация с полями count/next/previous.
+    Если в запросе передан параметр `cursor` (в том числе пустой),
+    включается пагинация по ключу без COUNT(*) и OFFSET.
+    """
+
+    keyset_pagination_class = KeysetPagination
+    page_size_query_param = 'page_size'
+    streaming = False
+    # Количество объектов, уже подсчитанное в этом запросе: валидаторы
+    # ETag и сама страница разбивают один и тот же список.
+    known_count = None
+
+    def django_paginator_class(self, object_list, per_page):
+        paginator = Paginator(object_list, per_page)
+        if self.known_count is not None:
+            paginator.count = self.known_count
+        return paginator
+
+    @property
+    def max_page_size(self):
+        if self.streaming:
+            return settings.STREAMING_MAX_PAGE_SIZE
+        return settings.MAX_PAGE_SIZE
+
+    def uses_keyset(self, request, view=None):
+        return (
+            self.keyset_pagination_class.cursor_query_param
+            in request.query_params
+            and bool(getattr(view, 'keyset_ordering', None))
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.uses_keyset(request, view):
+            self.keyset = self.keyset_pagination_class(
+                self.get_page_size(request)
+            )
+            return self.keyset.paginate_queryset(queryset, request, view)
+        page = super().paginate_queryset(queryset, request, view)
+        if page is not None:
+            self.known_count = self.page.paginator.count
+        return page
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def paginate_queryset_lazily(self, queryset, request, view=None):
+        """
+        Страница для потокового режима без загрузки объектов.
+        Возвращает поля страницы (count, next, previous)
+        и queryset объектов страницы.
+        """
+        self.streaming = True
+        self.keyset = None
+        self.request = request
+        paginator = self.django_paginator_class(
+            queryset, self.get_page_size(request)
+        )
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            ))
+        self.known_count = paginator.count
+        envelope = {
+            'count': paginator.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+        }
+        return envelope, self.page.object_list
@@ -41,7 +41,7 @@ class OwnerOrModeratorLevelOrReadOnly(BasePermission):
 
     def has_object_permission(self, request, view, obj):
         return request.method in SAFE_METHODS or any((
-            obj.author == request.user,
+            obj.author_id == request.user.id,
             request.user.is_moderator,
             request.user.is_admin,
             request.user.is_superuser,
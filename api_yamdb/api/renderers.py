@@ -0,0 +1,30 @@
+from itertools import islice
+
+from rest_framework.compat import LONG_SEPARATORS, SHORT_SEPARATORS
+from rest_framework.renderers import JSONRenderer
+
+
+class StreamingJSONRenderer(JSONRenderer):
+    """
+    Рендеринг страницы списка по частям для StreamingHttpResponse.
+    Объекты кодируются порциями по мере чтения, результат совпадает
+    с JSONRenderer для той же страницы.
+    """
+
+    def render_stream(self, envelope, items, chunk_size):
+        """
+        envelope - поля страницы без results (count, next, previous),
+        items - итератор представлений объектов.
+        """
+        # Заголовок кодируется с пустым списком, от которого
+        # остаётся только открывающая скобка.
+        yield self.render({**envelope, 'results': []})[:-2]
+        separator = (
+            SHORT_SEPARATORS if self.compact else LONG_SEPARATORS
+        )[0].encode()
+        first = True
+        while chunk := list(islice(items, chunk_size)):
+            rendered = self.render(chunk)[1:-1]
+            yield rendered if first else separator + rendered
+            first = False
+        yield b']}'
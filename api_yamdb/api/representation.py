@@ -0,0 +1,163 @@
+"""
+Быстрое построение представления объектов для чтения.
+
+Сериализатор DRF на каждый объект и каждое поле вызывает
+`get_attribute` с обходом `source_attrs` и обработкой исключений,
+проверяет PKOnlyObject и собирает вложенные ReturnDict. Здесь поля
+сериализатора один раз превращаются в функции доступа к атрибутам,
+после чего представление объекта - один проход по списку функций.
+Результат совпадает с `Serializer.to_representation`.
+"""
+
+from operator import attrgetter
+
+from django.db.models.manager import BaseManager
+from django.utils import timezone
+from rest_framework import ISO_8601, relations, serializers
+from rest_framework.settings import api_settings
+
+
+def get_nested_representation(serializer):
+    """Быстрый план вложенного сериализатора, если он его поддерживает."""
+    return getattr(
+        serializer, 'representation_plan', serializer.to_representation
+    )
+
+
+def compile_datetime(field):
+    """
+    DateTimeField в формате ISO 8601 без повторного определения
+    часового пояса и формата для каждого значения.
+    """
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = (
+        field.timezone if hasattr(field, 'timezone')
+        else field.default_timezone()
+    )
+    if (
+        output_format is None
+        or output_format.lower() != ISO_8601
+        or field_timezone is None
+    ):
+        return field.to_representation
+
+    def represent(value):
+        if isinstance(value, str) or not timezone.is_aware(value):
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith('+00:00'):
+            return value[:-6] + 'Z'
+        return value
+
+    return represent
+
+
+def get_attribute_getter(field):
+    """
+    Собственный get_attribute класса поля (например, чтение
+    из каталога справочников) или прямой доступ к атрибуту.
+    """
+    if type(field).get_attribute in (
+        serializers.Field.get_attribute, relations.RelatedField.get_attribute
+    ):
+        return attrgetter(field.source)
+    return field.get_attribute
+
+
+def compile_list(field):
+    get_items = get_attribute_getter(field)
+    represent = get_nested_representation(field.child)
+
+    def get_representation(instance):
+        items = get_items(instance)
+        if isinstance(items, BaseManager):
+            # Данные берутся из кэша prefetch_related.
+            items = items.all()
+        return [represent(item) for item in items]
+
+    return get_representation
+
+
+def compile_field(field):
+    """Функция instance -> значение поля в представлении."""
+    if isinstance(field, serializers.ListSerializer):
+        return compile_list(field)
+    if isinstance(field, relations.PrimaryKeyRelatedField):
+        # Значение внешнего ключа без загрузки связанного объекта.
+        model = field.parent.Meta.model
+        return attrgetter(model._meta.get_field(field.source).attname)
+    if isinstance(field, serializers.BaseSerializer):
+        represent = get_nested_representation(field)
+    elif isinstance(field, relations.SlugRelatedField):
+        represent = attrgetter(field.slug_field)
+    elif isinstance(field, serializers.DateTimeField):
+        represent = compile_datetime(field)
+    else:
+        represent = field.to_representation
+    get_value = get_attribute_getter(field)
+
+    def get_representation(instance):
+        value = get_value(instance)
+        return None if value is None else represent(value)
+
+    return get_representation
+
+
+def can_compile(field):
+    """
+    Быстрый путь - для полей модели с простым атрибутом в source.
+    Методы, вычисляемые поля и поля со сложным source остаются за DRF.
+    """
+    model = getattr(getattr(field.parent, 'Meta', None), 'model', None)
+    if (
+        model is None
+        or len(field.source_attrs) != 1
+        or callable(getattr(model, field.source, None))
+        or isinstance(field, (
+            serializers.SerializerMethodField, relations.ManyRelatedField
+        ))
+    ):
+        return False
+    if isinstance(field, relations.PrimaryKeyRelatedField):
+        return field.pk_field is None
+    return True
+
+
+def get_drf_representation(field):
+    """Штатная обработка поля, как в Serializer.to_representation."""
+
+    def get_representation(instance):
+        attribute = field.get_attribute(instance)
+        check_for_none = (
+            attribute.pk
+            if isinstance(attribute, relations.PKOnlyObject)
+            else attribute
+        )
+        if check_for_none is None:
+            return None
+        return field.to_representation(attribute)
+
+    return get_representation
+
+
+def compile_representation(serializer):
+    """Функция instance -> словарь представления для сериализатора."""
+    plan = tuple(
+        (
+            field.field_name,
+            compile_field(field) if can_compile(field)
+            else get_drf_representation(field),
+        )
+        for field in serializer._readable_fields
+    )
+
+    def represent(instance):
+        result = {}
+        for name, get_representation in plan:
+            try:
+                result[name] = get_representation(instance)
+            except serializers.SkipField:
+                continue
+        return result
+
+    return represent
@@ -1,21 +1,41 @@
+from functools import cached_property
+
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
+from django.db import transaction
 from django.db.models import Q
 from django.shortcuts import get_object_or_404
+from django.utils.encoding import smart_str
 from rest_framework import serializers
 from rest_framework.validators import UniqueTogetherValidator
-from rest_framework_simplejwt.tokens import AccessToken
 
 from api_yamdb.constants import EMAIL_MAX_LENGTH
-from .emails import send_confirmation_email
-from .mixins import UsernameFieldMixin
+from .authentication import get_access_token
+from .catalog import get_catalog
+from .emails import queue_confirmation_email
+from .mixins import (
+    FastRepresentationMixin, TimedRepresentationMixin, UsernameFieldMixin
+)
 from .utils import CurrentTitleDefault
-from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.models import (
+    Category, Comment, Genre, LeaderboardEntry, Review, Title
+)
 
 User = get_user_model()
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class BaseModelSerializer(
+    TimedRepresentationMixin,
+    FastRepresentationMixin,
+    serializers.ModelSerializer,
+):
+    """
+    Базовый сериализатор моделей: быстрое построение представления
+    с замером его времени.
+    """
+
+
+class CategorySerializer(BaseModelSerializer):
     """Сериализатор для категорий."""
 
     class Meta:
@@ -23,7 +43,7 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(BaseModelSerializer):
     """Сериализатор для жанров."""
 
     class Meta:
@@ -31,12 +51,63 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class TitleSerializerReadOnly(serializers.ModelSerializer):
+class CatalogCategorySerializer(CategorySerializer):
+    """Категория произведения из каталога процесса по category_id."""
+
+    @cached_property
+    def catalog(self):
+        return get_catalog()
+
+    def get_attribute(self, instance):
+        category = self.catalog.get_by_id(Category, instance.category_id)
+        return category or instance.category
+
+
+class CatalogGenreListSerializer(serializers.ListSerializer):
+    """Жанры произведения из каталога процесса по связям GenreTitle."""
+
+    @cached_property
+    def catalog(self):
+        return get_catalog()
+
+    def get_attribute(self, instance):
+        genres = self.catalog.get_many(Genre, [
+            genre_title.genre_id
+            for genre_title in instance.genre_title.all()
+        ])
+        return instance.genre.all() if genres is None else genres
+
+
+class CatalogGenreSerializer(GenreSerializer):
+    """Жанр произведения из каталога процесса."""
+
+    class Meta(GenreSerializer.Meta):
+        list_serializer_class = CatalogGenreListSerializer
+
+
+class CatalogSlugRelatedField(serializers.SlugRelatedField):
+    """Поиск категории или жанра по slug в каталоге процесса."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, (dict, list)):
+            self.fail('invalid')
+        slug = smart_str(data)
+        obj = get_catalog().get_by_slug(self.get_queryset().model, slug)
+        # Объекта нет в каталоге - проверяем по БД, на случай
+        # изменений справочника в обход сигналов.
+        return obj or super().to_internal_value(slug)
+
+
+class TitleSerializerReadOnly(BaseModelSerializer):
     """Сериализатор данных модели произведения для чтения."""
 
-    category = CategorySerializer(read_only=True)
-    genre = GenreSerializer(many=True)
-    rating = serializers.IntegerField(default=None)
+    category = CatalogCategorySerializer(read_only=True)
+    genre = CatalogGenreSerializer(many=True, read_only=True)
+    rating = serializers.IntegerField(read_only=True)
+    # Количество отзывов совпадает с количеством оценок.
+    reviews_count = serializers.IntegerField(
+        source='score_count', read_only=True
+    )
 
     class Meta:
         model = Title
@@ -45,25 +116,20 @@ class TitleSerializerReadOnly(serializers.ModelSerializer):
             'name',
             'year',
             'rating',
+            'reviews_count',
             'description',
             'genre',
             'category',
         )
 
-    def get_rating(self, obj):
-        reviews = obj.reviews.all()
-        if reviews.exists():
-            return round(obj.rating)
-        return None
 
-
-class TitleSerializerWrite(serializers.ModelSerializer):
+class TitleSerializerWrite(BaseModelSerializer):
     """Сериализатор для произведений."""
 
-    category = serializers.SlugRelatedField(
+    category = CatalogSlugRelatedField(
         queryset=Category.objects.all(), slug_field='slug', required=True
     )
-    genre = serializers.SlugRelatedField(
+    genre = CatalogSlugRelatedField(
         queryset=Genre.objects.all(),
         slug_field='slug',
         many=True,
@@ -83,10 +149,25 @@ class TitleSerializerWrite(serializers.ModelSerializer):
         )
 
     def to_representation(self, instance):
-        return TitleSerializerReadOnly(instance).data
+        return TitleSerializerReadOnly(instance, context=self.context).data
+
+
+class LeaderboardEntrySerializer(BaseModelSerializer):
+    """Место произведения в рейтинге жанра или категории."""
+
+    id = serializers.IntegerField(source='title_id', read_only=True)
+    name = serializers.CharField(source='title.name', read_only=True)
+    year = serializers.IntegerField(source='title.year', read_only=True)
+    reviews_count = serializers.IntegerField(
+        source='score_count', read_only=True
+    )
+
+    class Meta:
+        model = LeaderboardEntry
+        fields = ('id', 'name', 'year', 'rating', 'reviews_count')
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(BaseModelSerializer):
     """Сериализатор для отзывов."""
 
     author = serializers.SlugRelatedField(
@@ -99,7 +180,15 @@ class ReviewSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = ('id', 'title', 'text', 'author', 'score', 'pub_date')
+        fields = (
+            'id',
+            'title',
+            'text',
+            'author',
+            'score',
+            'comments_count',
+            'pub_date',
+        )
         model = Review
         read_only_fields = ('author', 'pub_date')
         validators = [
@@ -111,7 +200,7 @@ class ReviewSerializer(serializers.ModelSerializer):
         ]
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(BaseModelSerializer):
     """Сериализатор для комментариев."""
 
     author = serializers.SlugRelatedField(
@@ -125,7 +214,7 @@ class CommentSerializer(serializers.ModelSerializer):
         model = Comment
 
 
-class AdiminUserSerializer(serializers.ModelSerializer):
+class AdiminUserSerializer(BaseModelSerializer):
     """Админский сериализатор для работы с объектами пользователя."""
 
     class Meta:
@@ -162,7 +251,10 @@ class SignUpSerializer(UsernameFieldMixin):
             )
         return data
 
+    @transaction.atomic
     def create(self, validated_data):
+        # Письмо сохраняется в очередь в той же транзакции,
+        # что и пользователь; отправляет его команда send_outbox_emails.
         user, created = User.objects.get_or_create(
             username=validated_data['username'],
             email=validated_data['email'],
@@ -170,7 +262,7 @@ class SignUpSerializer(UsernameFieldMixin):
         user.is_active = False
         user.save()
         account_activation_token = default_token_generator.make_token(user)
-        send_confirmation_email(user.email, account_activation_token)
+        queue_confirmation_email(user.email, account_activation_token)
         return user
 
 
@@ -196,4 +288,4 @@ class TokenSerializer(UsernameFieldMixin):
         user = get_object_or_404(User, username=validated_data['username'])
         user.is_active = True
         user.save()
-        return AccessToken.for_user(user)
+        return get_access_token(user)
@@ -0,0 +1,56 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import reset_token_version
+from .cache import bump_cache_versions_on_commit
+from reviews.models import Category, Genre, GenreTitle, Review, Title
+
+User = get_user_model()
+
+
+@receiver((post_save, post_delete), sender=Category)
+def invalidate_category_cache(sender, **kwargs):
+    bump_cache_versions_on_commit(
+        'categories', 'categories:catalog', 'titles', 'catalog'
+    )
+
+
+@receiver((post_save, post_delete), sender=Genre)
+def invalidate_genre_cache(sender, **kwargs):
+    bump_cache_versions_on_commit(
+        'genres', 'genres:catalog', 'titles', 'catalog'
+    )
+
+
+@receiver((post_save, post_delete), sender=Title)
+def invalidate_title_cache(sender, instance, **kwargs):
+    bump_cache_versions_on_commit('titles', f'title:{instance.pk}')
+
+
+@receiver((post_save, post_delete), sender=GenreTitle)
+@receiver((post_save, post_delete), sender=Review)
+def invalidate_title_relations_cache(sender, instance, **kwargs):
+    bump_cache_versions_on_commit('titles', f'title:{instance.title_id}')
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres_cache(sender, instance, action, reverse,
+                                  pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        bump_cache_versions_on_commit('titles', f'title:{instance.pk}')
+    elif pk_set:
+        bump_cache_versions_on_commit(
+            'titles', *(f'title:{pk}' for pk in pk_set)
+        )
+    else:
+        bump_cache_versions_on_commit('titles', 'catalog')
+
+
+@receiver((post_save, post_delete), sender=User)
+def invalidate_token_version_cache(sender, instance, **kwargs):
+    user_id = instance.pk
+    transaction.on_commit(lambda: reset_token_version(user_id))
@@ -1,9 +1,10 @@
-from django.urls import include, path
+from django.urls import include, path, re_path
 from rest_framework.routers import DefaultRouter
 
 from .views import (
     CategoryViewSet,
     CommentViewSet,
+    ExportView,
     GenreViewSet,
     ReviewViewSet,
     TitleViewSet,
@@ -29,4 +30,10 @@ urlpatterns = [
     path('v1/', include(v1_router.urls)),
     path('v1/auth/signup/', signup, name='signup'),
     path('v1/auth/token/', activate_account, name='token'),
+    re_path(
+        r'^v1/export/(?P<dataset>\w+)\.(?P<export_format>csv|ndjson)'
+        r'(?P<compression>\.gz)?$',
+        ExportView.as_view(),
+        name='export',
+    ),
 ]
@@ -1,9 +1,12 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Avg
+from django.db import router
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import status
+from rest_framework import serializers, status
 from rest_framework.decorators import action, api_view
+from rest_framework.exceptions import NotFound
 from rest_framework.filters import SearchFilter
 from rest_framework.mixins import (
     CreateModelMixin,
@@ -12,9 +15,23 @@ from rest_framework.mixins import (
 )
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet, ModelViewSet
 
-from .filters import TitleFilter
+from .catalog import get_catalog
+from .facets import get_cached_title_facets, get_title_facets
+from .filters import (
+    CatalogSearchFilter, TitleFilter, TitleOrderingFilter, TitleSearchFilter
+)
+from .metrics import format_metrics, metrics
+from .mixins import (
+    AnonymousDetailCacheMixin,
+    AnonymousResponseCacheMixin,
+    ConditionalDetailMixin,
+    ConditionalGetMixin,
+    QueryPlanMixin,
+    StreamingListMixin,
+)
 from .permissions import (
     AdminLevel,
     AdminLevelOrReadOnly,
@@ -25,6 +42,7 @@ from .serializers import (
     CategorySerializer,
     CommentSerializer,
     GenreSerializer,
+    LeaderboardEntrySerializer,
     ReviewSerializer,
     TitleSerializerReadOnly,
     TitleSerializerWrite,
@@ -32,24 +50,67 @@ from .serializers import (
     TokenSerializer,
     UserSerializer,
 )
-from reviews.models import Category, Genre, Review, Title
+from reviews.export import DATASETS, FORMATS, export_dataset, get_file_name
+from reviews.leaderboards import LEADERBOARD_ORDERING
+from reviews.models import (
+    Category, Comment, Genre, LeaderboardEntry, Review, Title
+)
 
 
 User = get_user_model()
 
 
 class CategoryGenreBaseViewSet(
+        AnonymousResponseCacheMixin,
+        ConditionalGetMixin,
         CreateModelMixin,
         DestroyModelMixin,
         ListModelMixin,
         GenericViewSet,
 ):
-    """Базовый Вьюсет для работы с категориями и жанрами"""
+    """
+    Базовый Вьюсет для работы с категориями и жанрами.
+    Список отдаётся из каталога справочников в памяти процесса.
+    """
 
     permission_classes = (AdminLevelOrReadOnly,)
     lookup_field = 'slug'
-    filter_backends = (SearchFilter,)
+    filter_backends = (CatalogSearchFilter,)
     search_fields = ('name', 'slug')
+    leaderboard_field = None
+    replica_reads = True
+
+    def get_queryset(self):
+        if self.action == 'list':
+            return list(get_catalog().all(self.queryset.model))
+        return super().get_queryset()
+
+    def get_list_validator_values(self, objects):
+        return len(objects), max(
+            (obj.updated_at for obj in objects), default=None
+        )
+
+    @action(detail=True, methods=('get',), url_path='top')
+    def top(self, request, slug=None):
+        """
+        Эндпоинт '/v1/{categories|genres}/{slug}/top/': лучшие
+        произведения из материализованного рейтинга, одно чтение
+        диапазона индекса.
+        """
+        model = self.queryset.model
+        obj = get_catalog().get_by_slug(model, slug) or get_object_or_404(
+            model, slug=slug
+        )
+        entries = (
+            LeaderboardEntry.objects.filter(
+                **{self.leaderboard_field: obj.pk}
+            )
+            .select_related('title')
+            .only('title', 'rating', 'score_count', 'title__name',
+                  'title__year')
+            .order_by(*LEADERBOARD_ORDERING)
+        )
+        return Response(LeaderboardEntrySerializer(entries, many=True).data)
 
 
 class CategoryViewSet(CategoryGenreBaseViewSet):
@@ -57,6 +118,8 @@ class CategoryViewSet(CategoryGenreBaseViewSet):
 
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_group = 'categories'
+    leaderboard_field = 'category'
 
 
 class GenreViewSet(CategoryGenreBaseViewSet):
@@ -64,20 +127,47 @@ class GenreViewSet(CategoryGenreBaseViewSet):
 
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_group = 'genres'
+    leaderboard_field = 'genre'
 
 
-class TitleViewSet(ModelViewSet):
+class TitleViewSet(
+        AnonymousDetailCacheMixin,
+        ConditionalDetailMixin,
+        StreamingListMixin,
+        QueryPlanMixin,
+        ModelViewSet,
+):
     """Вьюсет для работы с произведениями."""
 
-    queryset = (
-        Title.objects.all()
-        .annotate(rating=Avg('reviews__score'))
-        .order_by('year', 'name')
-    )
+    queryset = Title.objects.all().order_by('year', 'name')
+    query_plan = {
+        # Категория и жанры берутся из каталога справочников,
+        # из БД читаются только связи с жанрами.
+        'default': {'prefetch_related': ('genre_title',)},
+        # Валидатор уникальности читает категорию изменяемого объекта.
+        'partial_update': {
+            'select_related': ('category',),
+            'prefetch_related': ('genre_title',),
+        },
+        'destroy': {},
+        'facets': {},
+    }
+    cache_group = 'titles'
+    replica_reads = True
     permission_classes = (AdminLevelOrReadOnly,)
-    filter_backends = (DjangoFilterBackend, SearchFilter)
+    filter_backends = (
+        DjangoFilterBackend, TitleSearchFilter, TitleOrderingFilter
+    )
     filterset_class = TitleFilter
-    ordering_fields = ('id', 'name', 'year')
+    ordering_fields = ('id', 'name', 'year', 'rating')
+    # Уникальные ключи сортировки, у каждого - свой индекс.
+    ordering_keys = {
+        'id': ('id',),
+        'name': ('name', 'id'),
+        'year': ('year', 'name', 'id'),
+        'rating': ('rating', 'score_count', 'id'),
+    }
     http_method_names = ('get', 'post', 'patch', 'delete')
     search_fields = ('name', 'description')
 
@@ -86,32 +176,86 @@ class TitleViewSet(ModelViewSet):
             return TitleSerializerWrite
         return TitleSerializerReadOnly
 
+    @property
+    def keyset_ordering(self):
+        ordering = TitleOrderingFilter().get_ordering(
+            self.request, self.queryset, self
+        )
+        if ordering:
+            return ordering
+        if TitleSearchFilter().get_search_terms(self.request):
+            # Позицию в порядке релевантности нельзя выразить ключом.
+            raise serializers.ValidationError({
+                'cursor': (
+                    'Результаты поиска упорядочены по релевантности; '
+                    'пагинация по ключу доступна только вместе '
+                    'с параметром ordering.'
+                )
+            })
+        return self.ordering_keys['year']
+
+    def get_cache_groups(self):
+        if self.action == 'retrieve':
+            title_id = self.kwargs[self.lookup_field]
+            if title_id.isdigit():
+                title_id = int(title_id)
+            return ('catalog', f'title:{title_id}')
+        return super().get_cache_groups()
+
+    @action(detail=False, methods=('get',), url_path='facets')
+    def facets(self, request):
+        """
+        Эндпоинт '/v1/titles/facets/': количество произведений
+        по категориям, жанрам, десятилетиям и оценкам с теми же
+        параметрами фильтрации, что и у списка.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        if settings.FACETS_CACHE and not request.query_params:
+            return Response(get_cached_title_facets(queryset))
+        return Response(get_title_facets(queryset))
+
 
-class ReviewViewSet(ModelViewSet):
+class ReviewViewSet(ConditionalDetailMixin, QueryPlanMixin, ModelViewSet):
     """Вьюсет для работы с отзывами."""
 
+    queryset = Review.objects.all()
     serializer_class = ReviewSerializer
     permission_classes = (OwnerOrModeratorLevelOrReadOnly,)
     http_method_names = ('get', 'post', 'patch', 'delete')
+    keyset_ordering = ('-pub_date', '-id')
+    replica_reads = True
+    last_modified_fields = ('updated_at', 'author__updated_at')
+    query_plan = {
+        'default': {'select_related': ('author',)},
+        'partial_update': {'select_related': ('author', 'title')},
+        'destroy': {},
+    }
 
     def get_title(self):
         return get_object_or_404(Title, id=self.kwargs['title_id'])
 
     def get_queryset(self):
-        title = self.get_title()
-        return title.reviews.all()
+        return super().get_queryset().filter(title=self.get_title())
 
     def perform_create(self, serializer):
         title = self.get_title()
         serializer.save(author=self.request.user, title=title)
 
 
-class CommentViewSet(ModelViewSet):
+class CommentViewSet(ConditionalDetailMixin, QueryPlanMixin, ModelViewSet):
     """Вьюсет для работы с комментариями."""
 
+    queryset = Comment.objects.all()
     serializer_class = CommentSerializer
     permission_classes = (OwnerOrModeratorLevelOrReadOnly,)
     http_method_names = ('get', 'post', 'patch', 'delete')
+    keyset_ordering = ('-pub_date', '-id')
+    replica_reads = True
+    last_modified_fields = ('updated_at', 'author__updated_at')
+    query_plan = {
+        'default': {'select_related': ('author',)},
+        'destroy': {},
+    }
 
     def get_review(self):
         return get_object_or_404(
@@ -121,20 +265,20 @@ class CommentViewSet(ModelViewSet):
         )
 
     def get_queryset(self):
-        review = self.get_review()
-        return review.comments.all()
+        return super().get_queryset().filter(review=self.get_review())
 
     def perform_create(self, serializer):
         review = self.get_review()
         serializer.save(author=self.request.user, review=review)
 
 
-class UserViewSet(ModelViewSet):
+class UserViewSet(ConditionalDetailMixin, StreamingListMixin, ModelViewSet):
     """Вьюсет для модели пользователя."""
 
     http_method_names = ('get', 'post', 'patch', 'delete')
     serializer_class = AdiminUserSerializer
     queryset = User.objects.all()
+    keyset_ordering = ('username', 'id')
     lookup_field = 'username'
     filter_backends = (DjangoFilterBackend, SearchFilter)
     permission_classes = (AdminLevel,)
@@ -153,12 +297,15 @@ class UserViewSet(ModelViewSet):
         - GET: просмотр данных своей учетной записи.
         - PATCH: редактирование данных своей учетной записи, кроме поля 'role'.
         """
+        user = request.user
+        deferred_fields = user.get_deferred_fields()
+        if deferred_fields:
+            # Пользователь собран из токена - дозагружаем его одним запросом.
+            user.refresh_from_db(fields=deferred_fields)
         if request.method == 'GET':
-            serializer = UserSerializer(request.user)
+            serializer = UserSerializer(user)
             return Response(serializer.data)
-        serializer = UserSerializer(
-            request.user, data=request.data, partial=True
-        )
+        serializer = UserSerializer(user, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
         return Response(serializer.data)
@@ -178,3 +325,45 @@ def activate_account(request):
     serializer.is_valid(raise_exception=True)
     access_token = serializer.save()
     return Response({'token': str(access_token)}, status=status.HTTP_200_OK)
+
+
+class ExportView(APIView):
+    """
+    Потоковая выгрузка набора данных в CSV или NDJSON
+    (с суффиксом .gz - сжатая gzip) для администраторов.
+    """
+
+    permission_classes = (AdminLevel,)
+    replica_reads = True
+
+    def get(self, request, dataset, export_format, compression=None):
+        if dataset not in DATASETS:
+            raise NotFound(f'Неизвестный набор данных: {dataset}.')
+        compress = bool(compression)
+        model, _ = DATASETS[dataset]
+        # Тело ответа читается после выхода из middleware,
+        # поэтому БД (реплика или основная) выбирается сейчас.
+        response = StreamingHttpResponse(
+            export_dataset(
+                dataset,
+                export_format,
+                compress,
+                using=router.db_for_read(model),
+            ),
+            content_type=(
+                'application/gzip' if compress else FORMATS[export_format]
+            ),
+        )
+        file_name = get_file_name(dataset, export_format, compress)
+        response['Content-Disposition'] = (
+            f'attachment; filename="{file_name}"'
+        )
+        return response
+
+
+def metrics_view(request):
+    """Метрики всех процессов в текстовом формате Prometheus."""
+    return HttpResponse(
+        format_metrics(metrics.collect()),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
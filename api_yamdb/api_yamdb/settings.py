@@ -32,6 +32,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.MetricsMiddleware',
+    'api.middleware.RequestTimingMiddleware',
+    'api.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -69,9 +72,50 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': int(os.getenv('CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Настройки SQLite, которые выполняются при открытии соединения:
+# WAL (чтение не ждёт записи), отображение файла в память, кэш страниц
+# и ожидание блокировки. Транзакции начинаются с BEGIN IMMEDIATE,
+# чтобы конкурирующие записи ждали блокировку (busy_timeout),
+# а не завершались ошибкой `database is locked`.
+SQLITE_TUNING = os.getenv('SQLITE_TUNING', 'True') == 'True'
+SQLITE_PRAGMAS = {
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'mmap_size': os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)),
+    'cache_size': os.getenv('SQLITE_CACHE_SIZE', '-65536'),
+    'temp_store': os.getenv('SQLITE_TEMP_STORE', 'MEMORY'),
+    'busy_timeout': os.getenv('SQLITE_BUSY_TIMEOUT', '5000'),
+}
+if SQLITE_TUNING:
+    DATABASES['default']['OPTIONS'] = {
+        'init_command': ';'.join(
+            f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()
+        ),
+        'transaction_mode': 'IMMEDIATE',
+    }
+
+# Реплики только для чтения: пути к файлам SQLite через запятую.
+# В тестах реплики указывают на тестовую основную БД.
+DATABASE_REPLICAS = []
+for index, replica_name in enumerate(
+    filter(None, os.getenv('SQLITE_REPLICAS', '').split(',')), start=1
+):
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'NAME': replica_name,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica_{index}')
+DATABASE_ROUTERS = ['api.db_router.ReplicaRouter']
+# Сколько секунд после изменения данных пользователь читает
+# с основной БД, пока реплики не догонят её.
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', '5'))
+
 
 # Password validation
 
@@ -114,15 +158,87 @@ AUTH_USER_MODEL = 'users.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.PageNumberOrKeysetPagination',
     'PAGE_SIZE': 5,
 }
+# Размер страницы задаётся параметром page_size. В потоковом режиме
+# (?stream=true) страница может быть больше: объекты читаются из БД
+# и отправляются клиенту порциями по STREAMING_CHUNK_SIZE.
+MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', '100'))
+STREAMING_MAX_PAGE_SIZE = int(os.getenv('STREAMING_MAX_PAGE_SIZE', '10000'))
+STREAMING_CHUNK_SIZE = int(os.getenv('STREAMING_CHUNK_SIZE', '500'))
 
 DEFAULT_FROM_EMAIL = 'admin@yamdb.com'
+
+# Для нескольких процессов-воркеров нужен общий бэкенд кэша
+# (Redis, Memcached, файловый), иначе версии кэша не будут
+# согласованы между процессами.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
 CACHE_TIMEOUT = 300
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+# Категории и жанры в памяти процесса перечитываются при смене версии
+# в общем кэше и не реже раза в CATALOG_MAX_AGE секунд - на случай,
+# если кэш не общий для процессов.
+CATALOG_MAX_AGE = int(os.getenv('CATALOG_MAX_AGE', '60'))
+# Фасеты всего каталога произведений (/titles/facets/ без параметров)
+# хранятся в кэше до следующего изменения произведений.
+FACETS_CACHE = os.getenv('FACETS_CACHE', 'True') == 'True'
+
+# Рейтинги жанров и категорий: сколько лучших произведений хранится
+# и сколько оценок нужно произведению, чтобы попасть в рейтинг.
+LEADERBOARD_SIZE = int(os.getenv('LEADERBOARD_SIZE', '10'))
+LEADERBOARD_MIN_REVIEWS = int(os.getenv('LEADERBOARD_MIN_REVIEWS', '5'))
+
+# Замеры запросов: доля запросов с заголовком Server-Timing и записью
+# в журнал (по умолчанию выключены: заголовок раскрывает клиентам
+# внутренние тайминги); запросы дольше REQUEST_TIMING_SLOW_MS
+# (мс, если задан) журналируются вместе с SQL.
+REQUEST_TIMING_SAMPLE_RATE = float(
+    os.getenv('REQUEST_TIMING_SAMPLE_RATE', '0')
+)
+REQUEST_TIMING_SLOW_MS = (
+    float(os.getenv('REQUEST_TIMING_SLOW_MS'))
+    if os.getenv('REQUEST_TIMING_SLOW_MS') else None
+)
+
+# Каталог для файлов метрик процессов; нужен, если воркеров несколько.
+METRICS_DIR = os.getenv('METRICS_DIR')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'api.middleware': {
+            'handlers': ['console'],
+            'level': os.getenv('REQUEST_TIMING_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
+
+# Аутентификация по данным из JWT без запроса пользователя к БД.
+STATELESS_JWT_AUTH = os.getenv('STATELESS_JWT_AUTH', 'False') == 'True'
+# Сколько секунд версия данных пользователя для таких токенов
+# хранится в кэше.
+TOKEN_VERSION_CACHE_TIMEOUT = int(
+    os.getenv('TOKEN_VERSION_CACHE_TIMEOUT', '60')
+)
+# Письма отправляются из очереди командой send_outbox_emails.
+EMAIL_BACKEND = os.getenv(
+    'EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend'
+)
+EMAIL_FILE_PATH = os.getenv('EMAIL_FILE_PATH', BASE_DIR / 'sent_emails')
 EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
@@ -25,17 +25,23 @@ class GenreTitleInline(admin.TabularInline):
 
 @admin.register(Title)
 class TitleAdmin(admin.ModelAdmin):
-    list_display = ('pk', 'name', 'year', 'description', 'category')
+    list_display = (
+        'pk', 'name', 'year', 'description', 'category', 'rating'
+    )
     search_fields = ('name', 'description')
     list_filter = ('category', 'genre', 'year')
+    readonly_fields = ('score_sum', 'score_count', 'rating')
     inlines = [GenreTitleInline]
 
 
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
-    list_display = ('pk', 'title', 'text', 'author', 'score', 'pub_date')
+    list_display = (
+        'pk', 'title', 'text', 'author', 'score', 'comments_count', 'pub_date'
+    )
     search_fields = ('text', 'title', 'pub_date')
     list_filter = ('author', 'score')
+    readonly_fields = ('comments_count',)
 
 
 @admin.register(Comment)
@@ -23,6 +23,9 @@ class CategoryGenreBaseModel(models.Model):
             'символы латиницы, цифры, дефис и подчёркивание.'
         ),
     )
+    updated_at = models.DateTimeField(
+        auto_now=True, verbose_name='Дата изменения'
+    )
 
     class Meta:
         abstract = True
@@ -0,0 +1,140 @@
+"""
+Выгрузка каталога в CSV или NDJSON.
+
+Наборы данных и их колонки совпадают с файлами, которые читает
+команда import_data_from_csv. Строки читаются из БД через
+values_list().iterator(), кодируются и (при необходимости) сжимаются
+gzip порциями, поэтому память не зависит от объёма выгрузки.
+"""
+
+import csv
+import json
+import zlib
+from datetime import datetime
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+
+from .models import Category, Comment, Genre, GenreTitle, Review, Title
+
+User = get_user_model()
+
+CHUNK_SIZE = 2000
+
+# Набор данных: модель и колонки (имя колонки -> поле модели).
+# Порядок наборов совпадает с порядком импорта.
+DATASETS = {
+    'users': (User, {
+        'id': 'id',
+        'username': 'username',
+        'email': 'email',
+        'role': 'role',
+        'bio': 'bio',
+        'first_name': 'first_name',
+        'last_name': 'last_name',
+    }),
+    'category': (Category, {'id': 'id', 'name': 'name', 'slug': 'slug'}),
+    'genre': (Genre, {'id': 'id', 'name': 'name', 'slug': 'slug'}),
+    'titles': (Title, {
+        'id': 'id',
+        'name': 'name',
+        'year': 'year',
+        'category': 'category_id',
+        'description': 'description',
+    }),
+    'genre_title': (GenreTitle, {
+        'id': 'id', 'title_id': 'title_id', 'genre_id': 'genre_id',
+    }),
+    'review': (Review, {
+        'id': 'id',
+        'title_id': 'title_id',
+        'text': 'text',
+        'author': 'author_id',
+        'score': 'score',
+        'pub_date': 'pub_date',
+    }),
+    'comments': (Comment, {
+        'id': 'id',
+        'review_id': 'review_id',
+        'text': 'text',
+        'author': 'author_id',
+        'pub_date': 'pub_date',
+    }),
+}
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def format_value(value):
+    if isinstance(value, datetime):
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+    return value
+
+
+def get_rows(dataset, chunk_size=CHUNK_SIZE, using=None):
+    """Строки набора данных по возрастанию id без загрузки объектов."""
+    model, columns = DATASETS[dataset]
+    queryset = model.objects.using(using).order_by('pk').values_list(
+        *columns.values()
+    )
+    for row in queryset.iterator(chunk_size=chunk_size):
+        yield [format_value(value) for value in row]
+
+
+class LineBuffer:
+    """Приёмник для csv.writer: возвращает записанную строку."""
+
+    def write(self, line):
+        return line
+
+
+def encode_csv(columns, rows):
+    writer = csv.writer(LineBuffer())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(
+            ['' if value is None else value for value in row]
+        )
+
+
+def encode_ndjson(columns, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), ensure_ascii=False) + '\n'
+
+
+ENCODERS = {'csv': encode_csv, 'ndjson': encode_ndjson}
+
+
+def join_lines(lines, chunk_size):
+    """Склеивает строки в порции, чтобы не отдавать их по одной."""
+    while chunk := list(islice(lines, chunk_size)):
+        yield ''.join(chunk).encode()
+
+
+def gzip_stream(chunks):
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_dataset(dataset, export_format='csv', compress=False,
+                   chunk_size=CHUNK_SIZE, using=None):
+    """Итератор байтов выгрузки набора данных."""
+    _, columns = DATASETS[dataset]
+    lines = ENCODERS[export_format](
+        list(columns), get_rows(dataset, chunk_size, using)
+    )
+    chunks = join_lines(lines, chunk_size)
+    return gzip_stream(chunks) if compress else chunks
+
+
+def get_file_name(dataset, export_format, compress=False):
+    return f'{dataset}.{export_format}{".gz" if compress else ""}'
@@ -0,0 +1,246 @@
+"""
+Материализованные рейтинги жанров и категорий (LeaderboardEntry).
+
+Рейтинг (board) - пара (поле, id): ('genre_id', id жанра) или
+('category_id', id категории). В нём до LEADERBOARD_SIZE лучших
+произведений, у которых не меньше LEADERBOARD_MIN_REVIEWS оценок.
+После изменения оценок, категории или жанров произведения
+refresh_title_leaderboards меняет только места этого произведения,
+а рейтинг пересобирается целиком (refill_board), лишь когда
+произведение покидает заполненный рейтинг. rebuild_leaderboards
+пересчитывает все рейтинги.
+"""
+
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+
+from .models import GenreTitle, LeaderboardEntry, Title
+
+# Порядок мест: оценка, количество оценок, более новое произведение.
+LEADERBOARD_ORDERING = ('-rating', '-score_count', '-title_id')
+TITLE_ORDERING = ('-rating', '-score_count', '-id')
+
+
+def get_board_filter(boards):
+    return reduce(or_, (Q(**{field: group_id}) for field, group_id in boards))
+
+
+def get_entry_board(genre_id, category_id):
+    if genre_id is not None:
+        return 'genre_id', genre_id
+    return 'category_id', category_id
+
+
+def get_qualified_titles():
+    return Title.objects.filter(
+        rating__isnull=False,
+        score_count__gte=settings.LEADERBOARD_MIN_REVIEWS,
+    )
+
+
+def refill_board(field, group_id):
+    """Пересобирает один рейтинг по данным произведений."""
+    titles = get_qualified_titles()
+    if field == 'genre_id':
+        titles = titles.filter(genre_title__genre_id=group_id)
+    else:
+        titles = titles.filter(category_id=group_id)
+    rows = titles.order_by(*TITLE_ORDERING).values_list(
+        'pk', 'rating', 'score_count'
+    )[:settings.LEADERBOARD_SIZE]
+    LeaderboardEntry.objects.filter(**{field: group_id}).delete()
+    LeaderboardEntry.objects.bulk_create(
+        LeaderboardEntry(
+            **{field: group_id},
+            title_id=title_id,
+            rating=rating,
+            score_count=score_count,
+        )
+        for title_id, rating, score_count in rows
+    )
+
+
+def get_title_boards(title_id):
+    """Рейтинги, в которых произведение сейчас занимает место."""
+    return {
+        get_entry_board(genre_id, category_id)
+        for genre_id, category_id in LeaderboardEntry.objects.filter(
+            title_id=title_id
+        ).values_list('genre_id', 'category_id')
+    }
+
+
+def refresh_title_leaderboards(title_id):
+    """
+    Обновляет места произведения во всех рейтингах. Для произведения
+    без мест и без нужного числа оценок - два запроса.
+    """
+    title = Title.objects.filter(pk=title_id).values_list(
+        'category_id', 'rating', 'score_count'
+    ).first()
+    qualified = (
+        title is not None
+        and title[1] is not None
+        and title[2] >= settings.LEADERBOARD_MIN_REVIEWS
+    )
+    if not qualified:
+        refill_title_boards(title_id)
+        return
+    category_id, rating, score_count = title
+    boards = {('category_id', category_id)} | {
+        ('genre_id', genre_id)
+        for genre_id in GenreTitle.objects.filter(
+            title_id=title_id
+        ).values_list('genre_id', flat=True)
+    }
+    entries, members = get_board_entries(boards, title_id)
+    title_key = (rating, score_count, title_id)
+    updates, inserts, trims, refills = plan_title_places(
+        title_key, entries, members
+    )
+    if updates or inserts or refills:
+        with transaction.atomic(savepoint=False):
+            update_title_places(
+                title_key, updates, inserts, trims, refills
+            )
+
+
+def get_board_entries(boards, title_id):
+    """
+    Места в рейтингах boards (кроме самого произведения) одним запросом
+    и рейтинги, в которых произведение занимает место.
+    """
+    entries = {board: [] for board in boards}
+    members = set()
+    for genre_id, category_id, entry_title_id, *key in (
+        LeaderboardEntry.objects.filter(
+            get_board_filter(boards) | Q(title_id=title_id)
+        ).values_list(
+            'genre_id', 'category_id', 'title_id', 'rating', 'score_count'
+        )
+    ):
+        board = get_entry_board(genre_id, category_id)
+        if entry_title_id == title_id:
+            members.add(board)
+        else:
+            entries[board].append((*key, entry_title_id))
+    return entries, members
+
+
+def plan_title_places(title_key, entries, members):
+    """
+    Какие места произведения обновить, какие добавить (и чьи места
+    при этом освобождаются) и какие рейтинги пересобрать.
+    """
+    # Рейтинги, из которых произведение ушло вместе с жанром/категорией.
+    refills = members - entries.keys()
+    updates, inserts, trims = [], [], []
+    size = settings.LEADERBOARD_SIZE
+    for board, others in entries.items():
+        others = sorted(others, reverse=True)[:size]
+        full = len(others) + (board in members) >= size
+        if full and others and title_key < others[-1]:
+            if board in members:
+                refills.add(board)
+        elif board in members:
+            updates.append(board)
+        else:
+            inserts.append(board)
+            if full:
+                trims.append((board, others[-1][-1]))
+    return updates, inserts, trims, refills
+
+
+def update_title_places(title_key, updates, inserts, trims, refills):
+    rating, score_count, title_id = title_key
+    if updates:
+        LeaderboardEntry.objects.filter(
+            get_board_filter(updates), title_id=title_id
+        ).update(rating=rating, score_count=score_count)
+    if trims:
+        LeaderboardEntry.objects.filter(reduce(or_, (
+            Q(**{field: group_id}, title_id=worst_title_id)
+            for (field, group_id), worst_title_id in trims
+        ))).delete()
+    LeaderboardEntry.objects.bulk_create(
+        LeaderboardEntry(
+            **{field: group_id},
+            title_id=title_id,
+            rating=rating,
+            score_count=score_count,
+        )
+        for field, group_id in inserts
+    )
+    for board in refills:
+        refill_board(*board)
+
+
+def refill_title_boards(title_id, boards=()):
+    """
+    Пересобирает рейтинги, в которых произведение занимает место,
+    и переданные boards: произведение из них выбывает.
+    """
+    boards = set(boards) | get_title_boards(title_id)
+    if boards:
+        with transaction.atomic(savepoint=False):
+            for board in boards:
+                refill_board(*board)
+
+
+def get_top_rows(queryset, partition_by, title_prefix=''):
+    """
+    Первые LEADERBOARD_SIZE строк каждой группы partition_by
+    одним запросом с оконной функцией.
+    """
+    return queryset.annotate(
+        position=Window(
+            RowNumber(),
+            partition_by=F(partition_by),
+            order_by=[
+                F(f'{title_prefix}{name.lstrip("-")}').desc()
+                for name in TITLE_ORDERING
+            ],
+        )
+    ).filter(position__lte=settings.LEADERBOARD_SIZE)
+
+
+@transaction.atomic
+def rebuild_leaderboards():
+    """
+    Пересчитывает все рейтинги двумя запросами с оконной функцией.
+    Возвращает количество мест во всех рейтингах.
+    """
+    titles = get_qualified_titles()
+    category_rows = get_top_rows(titles, 'category_id').values_list(
+        'category_id', 'pk', 'rating', 'score_count'
+    )
+    genre_rows = get_top_rows(
+        GenreTitle.objects.filter(
+            title__rating__isnull=False,
+            title__score_count__gte=settings.LEADERBOARD_MIN_REVIEWS,
+        ),
+        'genre_id',
+        title_prefix='title__',
+    ).values_list(
+        'genre_id', 'title_id', 'title__rating', 'title__score_count'
+    )
+    LeaderboardEntry.objects.all().delete()
+    entries = [
+        LeaderboardEntry(
+            **{field: group_id},
+            title_id=title_id,
+            rating=rating,
+            score_count=score_count,
+        )
+        for field, rows in (
+            ('category_id', category_rows), ('genre_id', genre_rows)
+        )
+        for group_id, title_id, rating, score_count in rows
+    ]
+    LeaderboardEntry.objects.bulk_create(entries, batch_size=1000)
+    return len(entries)
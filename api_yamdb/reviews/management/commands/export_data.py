@@ -0,0 +1,72 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from reviews.export import (
+    CHUNK_SIZE, DATASETS, FORMATS, export_dataset, get_file_name
+)
+
+
+class Command(BaseCommand):
+    """
+    Выгрузка каталога и пользователей в файлы CSV или NDJSON.
+    Файлы CSV с именами по умолчанию читает import_data_from_csv.
+    """
+
+    help = 'Выгружает данные в CSV или NDJSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output-dir',
+            default='export',
+            help='Каталог для файлов выгрузки.',
+        )
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            default='csv',
+            dest='export_format',
+            help='Формат файлов.',
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Сжимать файлы gzip.',
+        )
+        parser.add_argument(
+            '--datasets',
+            nargs='+',
+            choices=DATASETS,
+            default=list(DATASETS),
+            help='Наборы данных для выгрузки.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Количество строк, читаемых из БД за один раз.',
+        )
+
+    def handle(self, *args, **options):
+        output_dir = Path(options['output_dir'])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for dataset in options['datasets']:
+            started = time.perf_counter()
+            path = output_dir / get_file_name(
+                dataset, options['export_format'], options['gzip']
+            )
+            size = 0
+            with open(path, 'wb') as file:
+                for chunk in export_dataset(
+                    dataset,
+                    options['export_format'],
+                    options['gzip'],
+                    options['chunk_size'],
+                ):
+                    file.write(chunk)
+                    size += len(chunk)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(self.style.SUCCESS(
+                f'{path}: {size} bytes in {elapsed:.2f}s.'
+            ))
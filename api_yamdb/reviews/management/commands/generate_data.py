@@ -0,0 +1,243 @@
+import random
+import time
+from argparse import ArgumentTypeError
+from itertools import islice
+from math import gcd
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from reviews.services import rebuild_denormalized_data
+
+User = get_user_model()
+
+WORDS = (
+    'война мир ночь день город море звезда дракон король тень огонь '
+    'лёд песня дорога дом сад зима лето небо река остров лес сердце '
+    'тайна путь время свет память голос берег ветер степь гора'
+).split()
+
+
+# Объекты, без которых нельзя создать зависимые от них:
+# произведению нужны категория и жанр, отзыву и комментарию - автор.
+REQUIRED_SIZES = (
+    ('titles', 'categories'),
+    ('titles', 'genres'),
+    ('reviews', 'users'),
+    ('comments', 'users'),
+)
+
+
+def non_negative_int(value):
+    value = int(value)
+    if value < 0:
+        raise ArgumentTypeError('значение не может быть отрицательным')
+    return value
+
+
+def positive_int(value):
+    value = int(value)
+    if value < 1:
+        raise ArgumentTypeError('значение должно быть больше нуля')
+    return value
+
+
+def zipf_counts(total, size, exponent):
+    """
+    Распределяет total объектов по size позициям по закону Ципфа:
+    позиции с рангом r достаётся доля, пропорциональная 1 / r^exponent.
+    Сумма значений равна total; значения выдаются по одному.
+    """
+    norm = sum(1 / rank ** exponent for rank in range(1, size + 1))
+    cumulative = assigned = 0
+    for rank in range(1, size + 1):
+        cumulative += total / norm / rank ** exponent
+        count = round(cumulative) - assigned
+        assigned += count
+        yield count
+
+
+def permutation(size, seed):
+    """
+    Перестановка индексов 0..size-1 без хранения в памяти:
+    популярные объекты не должны идти подряд по id.
+    """
+    step = 2654435761 + seed
+    while gcd(step, size) != 1:
+        step += 1
+    return lambda index: index * step % size
+
+
+class Command(BaseCommand):
+    """
+    Генерация синтетических данных для нагрузочного тестирования.
+    Отзывы распределяются по произведениям, а комментарии - по отзывам
+    по закону Ципфа: у немногих популярных объектов много записей,
+    у большинства - единицы. Данные добавляются к существующим.
+    """
+
+    help = 'Заполняет базу синтетическими данными заданного объёма.'
+
+    def add_arguments(self, parser):
+        sizes = (
+            ('--users', non_negative_int, 1000, 'Количество пользователей.'),
+            ('--categories', non_negative_int, 10, 'Количество категорий.'),
+            ('--genres', non_negative_int, 30, 'Количество жанров.'),
+            ('--titles', non_negative_int, 10000,
+             'Количество произведений.'),
+            ('--max-genres', positive_int, 3,
+             'Максимум жанров у произведения.'),
+            ('--reviews', non_negative_int, 100000, 'Количество отзывов.'),
+            ('--comments', non_negative_int, 200000,
+             'Количество комментариев.'),
+            ('--batch-size', positive_int, 5000,
+             'Количество строк в одном запросе.'),
+            ('--seed', int, 42, 'Начальное значение генератора.'),
+        )
+        for option, option_type, default, help_text in sizes:
+            parser.add_argument(
+                option, type=option_type, default=default, help=help_text
+            )
+        parser.add_argument(
+            '--zipf',
+            type=float,
+            default=1.1,
+            help='Показатель степени распределения Ципфа.',
+        )
+
+    @staticmethod
+    def _next_pk(model):
+        return (model.objects.aggregate(pk__max=Max('pk'))['pk__max'] or 0) + 1
+
+    def _save(self, model, objects, batch_size):
+        started = time.perf_counter()
+        saved = 0
+        while batch := list(islice(objects, batch_size)):
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+            saved += len(batch)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'{model.__name__}: {saved} rows in {elapsed:.2f}s '
+            f'({saved / max(elapsed, 1e-9):.0f} rows/s).'
+        ))
+        return saved
+
+    def _users(self, start, count):
+        password = make_password(None)
+        for pk in range(start, start + count):
+            yield User(
+                pk=pk,
+                username=f'user{pk}',
+                email=f'user{pk}@yamdb.fake',
+                password=password,
+            )
+
+    def _categories(self, model, start, count):
+        name = model._meta.verbose_name.capitalize()
+        slug = model._meta.model_name
+        for pk in range(start, start + count):
+            yield model(pk=pk, name=f'{name} {pk}', slug=f'{slug}-{pk}')
+
+    def _titles(self, start, count, category_ids):
+        for pk in range(start, start + count):
+            yield Title(
+                pk=pk,
+                name=f'{" ".join(self.rng.sample(WORDS, 3))} {pk}',
+                year=self.rng.randint(1950, 2024),
+                description=' '.join(self.rng.choices(WORDS, k=20)),
+                category_id=self.rng.choice(category_ids),
+            )
+
+    def _genre_titles(self, title_ids, genre_ids, max_genres):
+        for title_id in title_ids:
+            count = self.rng.randint(1, min(max_genres, len(genre_ids)))
+            for genre_id in self.rng.sample(genre_ids, count):
+                yield GenreTitle(genre_id=genre_id, title_id=title_id)
+
+    def _reviews(self, start, title_ids, user_ids, total, exponent):
+        order = permutation(len(title_ids), self.seed)
+        counts = zipf_counts(total, len(title_ids), exponent)
+        pk = start
+        for rank, count in enumerate(counts):
+            title_id = title_ids[order(rank)]
+            # Автор оставляет не больше одного отзыва на произведение.
+            for author_id in self.rng.sample(
+                user_ids, min(count, len(user_ids))
+            ):
+                yield Review(
+                    pk=pk,
+                    title_id=title_id,
+                    author_id=author_id,
+                    text=' '.join(self.rng.choices(WORDS, k=30)),
+                    score=self.rng.randint(1, 10),
+                )
+                pk += 1
+
+    def _comments(self, review_ids, user_ids, total, exponent):
+        order = permutation(len(review_ids), self.seed)
+        counts = zipf_counts(total, len(review_ids), exponent)
+        for rank, count in enumerate(counts):
+            review_id = review_ids[order(rank)]
+            for _ in range(count):
+                yield Comment(
+                    review_id=review_id,
+                    author_id=self.rng.choice(user_ids),
+                    text=' '.join(self.rng.choices(WORDS, k=15)),
+                )
+
+    def handle(self, *args, **options):
+        for dependent, required in REQUIRED_SIZES:
+            if options[dependent] and not options[required]:
+                raise CommandError(
+                    f'--{dependent} требует ненулевого --{required}.'
+                )
+        self.rng = random.Random(options['seed'])
+        self.seed = options['seed']
+        batch_size = options['batch_size']
+
+        starts = {
+            model: self._next_pk(model)
+            for model in (User, Category, Genre, Title, Review)
+        }
+        objects = (
+            (User, self._users(starts[User], options['users'])),
+            (Category, self._categories(
+                Category, starts[Category], options['categories']
+            )),
+            (Genre, self._categories(
+                Genre, starts[Genre], options['genres']
+            )),
+        )
+        for model, generated in objects:
+            self._save(model, generated, batch_size)
+
+        def new_ids(model):
+            return range(starts[model], self._next_pk(model))
+
+        title_ids = range(starts[Title], starts[Title] + options['titles'])
+        self._save(Title, self._titles(
+            starts[Title], options['titles'], new_ids(Category)
+        ), batch_size)
+        self._save(GenreTitle, self._genre_titles(
+            title_ids, new_ids(Genre), options['max_genres']
+        ), batch_size)
+        if title_ids and options['reviews']:
+            self._save(Review, self._reviews(
+                starts[Review], title_ids, new_ids(User),
+                options['reviews'], options['zipf'],
+            ), batch_size)
+        review_ids = new_ids(Review)
+        if review_ids and options['comments']:
+            self._save(Comment, self._comments(
+                review_ids, new_ids(User),
+                options['comments'], options['zipf'],
+            ), batch_size)
+
+        # bulk_create не отправляет сигналы.
+        for message in rebuild_denormalized_data(batch_size):
+            self.stdout.write(self.style.SUCCESS(message))
@@ -1,19 +1,43 @@
 import csv
+import time
+from itertools import islice
 
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
 from django.core.management.base import BaseCommand
+from django.db import DatabaseError, transaction
 
+from api.cache import RESPONSE_CACHE_GROUPS, bump_cache_versions
+from api.catalog import invalidate_catalog
 from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from reviews.services import rebuild_denormalized_data
 
 
 User = get_user_model()
 
+# Ошибки сохранения строки: нарушения ограничений БД и значения,
+# которые не приводятся к типу поля (year=abc, некорректная дата).
+SAVE_ERRORS = (DatabaseError, ValueError, TypeError, ValidationError)
+
 
 class Command(BaseCommand):
-    """Импорт данных из csv-файлов."""
+    """
+    Импорт данных из csv-файлов.
+    Файлы читаются построчно и сохраняются пачками через bulk_create,
+    каждая пачка - в отдельной транзакции. Внешние ключи передаются
+    идентификаторами, без загрузки связанных объектов.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество строк, сохраняемых одним запросом.',
+        )
 
-    def _import_user(self, row):
-        User.objects.create(
+    def _build_user(self, row):
+        return User(
             pk=row['id'],
             username=row['username'],
             email=row['email'],
@@ -23,76 +47,124 @@ class Command(BaseCommand):
             last_name=row['last_name'],
         )
 
-    def _import_category(self, row):
-        Category.objects.create(
+    def _build_category(self, row):
+        return Category(
             pk=row['id'],
             name=row['name'],
             slug=row['slug'],
         )
 
-    def _import_genre(self, row):
-        Genre.objects.create(
+    def _build_genre(self, row):
+        return Genre(
             pk=row['id'],
             name=row['name'],
             slug=row['slug'],
         )
 
-    def _import_title(self, row):
-        Title.objects.create(
+    def _build_title(self, row):
+        return Title(
             pk=row['id'],
             name=row['name'],
             year=row['year'],
-            category=Category.objects.get(id=row['category']),
+            category_id=row['category'],
+            description=row.get('description', ''),
         )
 
-    def _import_genre_title(self, row):
-        GenreTitle.objects.create(
+    def _build_genre_title(self, row):
+        return GenreTitle(
             pk=row['id'],
-            genre=Genre.objects.get(id=row['genre_id']),
-            title=Title.objects.get(id=row['title_id']),
+            genre_id=row['genre_id'],
+            title_id=row['title_id'],
         )
 
-    def _import_review(self, row):
-        Review.objects.create(
+    def _build_review(self, row):
+        return Review(
             pk=row['id'],
-            title=Title.objects.get(id=row['title_id']),
+            title_id=row['title_id'],
             text=row['text'],
-            author=User.objects.get(id=row['author']),
+            author_id=row['author'],
             score=row['score'],
             pub_date=row['pub_date'],
         )
 
-    def _import_comments(self, row):
-        Comment.objects.create(
+    def _build_comment(self, row):
+        return Comment(
             pk=row['id'],
-            review=Review.objects.get(id=row['review_id']),
+            review_id=row['review_id'],
             text=row['text'],
-            author=User.objects.get(id=row['author']),
+            author_id=row['author'],
             pub_date=row['pub_date'],
         )
 
+    def _error(self, message):
+        self.stdout.write(self.style.ERROR(f'Error importing data: {message}'))
+
+    def _build_objects(self, builder, reader):
+        for row in reader:
+            try:
+                yield builder(row)
+            except (KeyError, ValueError) as e:
+                self._error(e)
+
+    def _save_batch(self, model, batch):
+        """
+        Сохраняет пачку объектов одним запросом.
+        Если пачка не сохраняется целиком, объекты сохраняются по одному,
+        чтобы пропустить только ошибочные строки.
+        """
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+            return len(batch)
+        except SAVE_ERRORS:
+            pass
+        saved = 0
+        for obj in batch:
+            try:
+                with transaction.atomic():
+                    model.objects.bulk_create([obj])
+                saved += 1
+            except SAVE_ERRORS as e:
+                self._error(f'{model.__name__} id={obj.pk}: {e}')
+        return saved
+
+    def _import_file(self, model, builder, path, batch_size):
+        started = time.perf_counter()
+        saved = 0
+        with open(path, newline='', encoding='utf-8') as csvfile:
+            objects = self._build_objects(builder, csv.DictReader(csvfile))
+            while batch := list(islice(objects, batch_size)):
+                saved += self._save_batch(model, batch)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'{path} processed: {saved} rows in {elapsed:.2f}s '
+            f'({saved / max(elapsed, 1e-9):.0f} rows/s).'
+        ))
+
     def handle(self, *args, **kwargs):
+        batch_size = kwargs['batch_size']
         files_paths = (
-            (self._import_user, 'static/data/users.csv'),
-            (self._import_category, 'static/data/category.csv'),
-            (self._import_genre, 'static/data/genre.csv'),
-            (self._import_title, 'static/data/titles.csv'),
-            (self._import_genre_title, 'static/data/genre_title.csv'),
-            (self._import_review, 'static/data/review.csv'),
-            (self._import_comments, 'static/data/comments.csv'),
+            (User, self._build_user, 'static/data/users.csv'),
+            (Category, self._build_category, 'static/data/category.csv'),
+            (Genre, self._build_genre, 'static/data/genre.csv'),
+            (Title, self._build_title, 'static/data/titles.csv'),
+            (
+                GenreTitle,
+                self._build_genre_title,
+                'static/data/genre_title.csv',
+            ),
+            (Review, self._build_review, 'static/data/review.csv'),
+            (Comment, self._build_comment, 'static/data/comments.csv'),
         )
 
-        for method, path in files_paths:
+        for model, builder, path in files_paths:
             try:
-                with open(path, newline='', encoding='utf-8') as csvfile:
-                    reader = csv.DictReader(csvfile)
-                    for row in reader:
-                        try:
-                            method(row)
-                        except Exception as e:
-                            self.stdout.write(
-                                self.style.ERROR(f'Error importing data: {e}')
-                            )
-                    self.stdout.write(self.style.SUCCESS(f'{path} processed.'))
+                self._import_file(model, builder, path, batch_size)
             except FileNotFoundError:
                 self.stdout.write(self.style.ERROR(f'File not found: {path}'))
+
+        # bulk_create не отправляет сигналы.
+        for message in rebuild_denormalized_data(batch_size):
+            self.stdout.write(self.style.SUCCESS(message))
+        invalidate_catalog()
+        bump_cache_versions(*RESPONSE_CACHE_GROUPS)
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from reviews.services import rebuild_denormalized_data
+
+
+class Command(BaseCommand):
+    """
+    Сверка денормализованных счётчиков с данными: количество отзывов
+    (и рейтинг) произведений и количество комментариев к отзывам.
+    """
+
+    help = 'Пересчитывает счётчики отзывов и комментариев.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Количество объектов в одной транзакции.',
+        )
+
+    def handle(self, *args, **options):
+        for message in rebuild_denormalized_data(options['chunk_size']):
+            self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from reviews.leaderboards import rebuild_leaderboards
+
+
+class Command(BaseCommand):
+    """
+    Полный пересчёт материализованных рейтингов жанров и категорий
+    по текущим оценкам произведений.
+    """
+
+    help = 'Пересчитывает рейтинги лучших произведений жанров и категорий.'
+
+    def handle(self, *args, **options):
+        processed = rebuild_leaderboards()
+        self.stdout.write(self.style.SUCCESS(
+            f'Рейтинги жанров и категорий пересчитаны, мест: {processed}.'
+        ))
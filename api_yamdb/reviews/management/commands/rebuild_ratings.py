@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from reviews.services import rebuild_denormalized_data
+
+
+class Command(BaseCommand):
+    """Полный пересчёт рейтинга произведений по отзывам."""
+
+    help = 'Пересчитывает score_sum/score_count/rating всех произведений.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Количество произведений в одной транзакции.',
+        )
+
+    def handle(self, *args, **options):
+        for message in rebuild_denormalized_data(
+            options['chunk_size'], comments=False
+        ):
+            self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,106 @@
+# Generated by Django 5.1.1 on 2026-10-18 21:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+
+def fill_leaderboards(apps, schema_editor):
+    GenreTitle = apps.get_model('reviews', 'GenreTitle')
+    LeaderboardEntry = apps.get_model('reviews', 'LeaderboardEntry')
+    Title = apps.get_model('reviews', 'Title')
+    for field, queryset, prefix in (
+        ('category_id', Title.objects.all(), ''),
+        ('genre_id', GenreTitle.objects.all(), 'title__'),
+    ):
+        rows = queryset.filter(**{
+            f'{prefix}rating__isnull': False,
+            f'{prefix}score_count__gte': settings.LEADERBOARD_MIN_REVIEWS,
+        }).annotate(position=Window(
+            RowNumber(),
+            partition_by=F(field),
+            order_by=[
+                F(f'{prefix}{name}').desc()
+                for name in ('rating', 'score_count', 'id')
+            ],
+        )).filter(
+            position__lte=settings.LEADERBOARD_SIZE
+        ).values_list(
+            field, f'{prefix}id', f'{prefix}rating', f'{prefix}score_count'
+        )
+        LeaderboardEntry.objects.bulk_create(
+            (
+                LeaderboardEntry(
+                    **{field: group_id},
+                    title_id=title_id,
+                    rating=rating,
+                    score_count=score_count,
+                )
+                for group_id, title_id, rating, score_count in rows
+            ),
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_review_comments_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rating', models.PositiveSmallIntegerField(verbose_name='Рейтинг')),
+                ('score_count', models.PositiveIntegerField(verbose_name='Количество оценок')),
+            ],
+            options={
+                'verbose_name': 'место в рейтинге',
+                'verbose_name_plural': 'Рейтинги жанров и категорий',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', 'rating', 'score_count', 'id'], name='title_category_rating_idx'),
+        ),
+        migrations.AddField(
+            model_name='leaderboardentry',
+            name='category',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard', to='reviews.category', verbose_name='Категория'),
+        ),
+        migrations.AddField(
+            model_name='leaderboardentry',
+            name='genre',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard', to='reviews.genre', verbose_name='Жанр'),
+        ),
+        migrations.AddField(
+            model_name='leaderboardentry',
+            name='title',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='reviews.title', verbose_name='Произведение'),
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(condition=models.Q(('genre__isnull', False)), fields=['genre', 'rating', 'score_count', 'title'], name='leaderboard_genre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(condition=models.Q(('category__isnull', False)), fields=['category', 'rating', 'score_count', 'title'], name='leaderboard_category_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('category__isnull', True), ('genre__isnull', False)), models.Q(('category__isnull', False), ('genre__isnull', True)), _connector='OR'), name='leaderboard_genre_or_category'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(condition=models.Q(('genre__isnull', False)), fields=('genre', 'title'), name='unique_leaderboard_genre_title'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(condition=models.Q(('category__isnull', False)), fields=('category', 'title'), name='unique_leaderboard_category_title'),
+        ),
+        migrations.RunPython(fill_leaderboards, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,9 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
 
 from .constants import LIMIT_LENGTH, LIMIT_LENGTH_STR_AND_SLUG
 from .base import CategoryGenreBaseModel
+from .search import FTS_TABLE, MatchField
 from .validators import validate_year
 
 User = get_user_model()
@@ -23,6 +24,8 @@ class Genre(CategoryGenreBaseModel):
 
 
 class Title(models.Model):
+    DENORMALIZED_FIELDS = ('score_sum', 'score_count', 'rating')
+
     name = models.CharField(
         max_length=LIMIT_LENGTH,
         verbose_name='Наименование'
@@ -44,11 +47,47 @@ class Title(models.Model):
         through='GenreTitle',
     )
     description = models.TextField(blank=True, verbose_name='Описание')
+    score_sum = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Сумма оценок'
+    )
+    score_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Количество оценок'
+    )
+    rating = models.PositiveSmallIntegerField(
+        null=True, editable=False, verbose_name='Рейтинг'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True, verbose_name='Дата изменения'
+    )
 
     class Meta:
         verbose_name = 'произведение'
         verbose_name_plural = 'Произведения'
         ordering = ('year', 'name')
+        indexes = [
+            # Сортировка списка и пагинация по ключу (year, name, id).
+            models.Index(
+                fields=['year', 'name', 'id'], name='title_year_name_idx'
+            ),
+            # Сортировки списка ?ordering=name и ?ordering=rating
+            # (по возрастанию и убыванию) с пагинацией по ключу.
+            models.Index(fields=['name', 'id'], name='title_name_idx'),
+            models.Index(
+                fields=['rating', 'score_count', 'id'],
+                name='title_rating_idx',
+            ),
+            # Список ?category= в порядке по умолчанию с пагинацией
+            # по ключу.
+            models.Index(
+                fields=['category', 'year', 'name', 'id'],
+                name='title_category_year_idx',
+            ),
+            # Лучшие произведения категории при пересчёте её рейтинга.
+            models.Index(
+                fields=['category', 'rating', 'score_count', 'id'],
+                name='title_category_rating_idx',
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['name', 'category', 'year'],
@@ -59,6 +98,31 @@ class Title(models.Model):
     def __str__(self):
         return self.name[:LIMIT_LENGTH_STR_AND_SLUG]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_category()
+        return instance
+
+    def remember_category(self):
+        """
+        Запоминает категорию в том виде, в котором она сохранена в БД.
+        При её смене произведение переходит в рейтинг новой категории.
+        """
+        self._saved_category_id = self.__dict__.get('category_id')
+
+    def save(self, *args, **kwargs):
+        # Рейтинг обновляется только через F()-выражения, поэтому
+        # при сохранении произведения его поля не перезаписываются.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.DENORMALIZED_FIELDS
+            ]
+        super().save(*args, **kwargs)
+        self.remember_category()
+
 
 class GenreTitle(models.Model):
     genre = models.ForeignKey(
@@ -72,11 +136,18 @@ class GenreTitle(models.Model):
         on_delete=models.CASCADE,
         verbose_name='Произведение',
         related_name='genre_title',
+        db_index=False,
     )
 
     class Meta:
         verbose_name = 'жанр произведения'
         verbose_name_plural = 'жанры произведений'
+        indexes = [
+            # Жанры произведения: поиск по title, genre_id из индекса.
+            models.Index(
+                fields=['title', 'genre'], name='genretitle_title_genre_idx'
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['genre', 'title'], name='unique_genre_title'
@@ -89,6 +160,8 @@ class GenreTitle(models.Model):
 
 
 class Review(models.Model):
+    DENORMALIZED_FIELDS = ('comments_count',)
+
     text = models.TextField(verbose_name='Текст отзыва')
     author = models.ForeignKey(
         User,
@@ -101,6 +174,7 @@ class Review(models.Model):
         verbose_name='Произведение',
         on_delete=models.CASCADE,
         related_name='reviews',
+        db_index=False,
     )
     score = models.IntegerField(
         verbose_name='Оценка произведения',
@@ -109,11 +183,24 @@ class Review(models.Model):
     pub_date = models.DateTimeField(
         verbose_name='Дата добавления', auto_now_add=True, db_index=True
     )
+    comments_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Количество комментариев'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True, verbose_name='Дата изменения'
+    )
 
     class Meta:
         verbose_name = 'отзыв'
         verbose_name_plural = 'Отзывы'
         ordering = ('-pub_date',)
+        indexes = [
+            # Отзывы произведения в порядке (-pub_date, -id).
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pub_date_idx',
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['author', 'title'], name='unique_author_title'
@@ -123,6 +210,36 @@ class Review(models.Model):
     def __str__(self):
         return self.text[:LIMIT_LENGTH_STR_AND_SLUG]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_rating_state()
+        return instance
+
+    def remember_rating_state(self):
+        """
+        Запоминает произведение и оценку в том виде,
+        в котором они сохранены в БД.
+        Нужно для инкрементального пересчёта рейтинга при изменении отзыва.
+        """
+        self._saved_rating_state = (
+            self.__dict__.get('title_id'), self.__dict__.get('score')
+        )
+
+    def save(self, *args, **kwargs):
+        # Счётчик комментариев обновляется только через F()-выражения.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.DENORMALIZED_FIELDS
+            ]
+        # Рейтинг произведения обновляется сигналами
+        # в той же транзакции, что и сам отзыв.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        self.remember_rating_state()
+
 
 class Comment(models.Model):
     text = models.TextField(verbose_name='Текст комментария')
@@ -137,15 +254,134 @@ class Comment(models.Model):
         verbose_name='Отзыв',
         on_delete=models.CASCADE,
         related_name='comments',
+        db_index=False,
     )
     pub_date = models.DateTimeField(
         verbose_name='Дата добавления', auto_now_add=True, db_index=True
     )
+    updated_at = models.DateTimeField(
+        auto_now=True, verbose_name='Дата изменения'
+    )
 
     class Meta:
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('-pub_date',)
+        indexes = [
+            # Комментарии к отзыву в порядке (-pub_date, -id).
+            models.Index(
+                fields=['review', 'pub_date', 'id'],
+                name='comment_review_pub_date_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.text[:LIMIT_LENGTH_STR_AND_SLUG]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+        # Счётчик комментариев отзыва обновляется сигналом
+        # в той же транзакции, что и создание комментария.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class LeaderboardEntry(models.Model):
+    """
+    Материализованный рейтинг: лучшие произведения жанра или категории.
+    Заполнено ровно одно из полей genre и category. Строки ведут
+    функции reviews.leaderboards, порядок мест - LEADERBOARD_ORDERING.
+    """
+
+    genre = models.ForeignKey(
+        Genre,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        verbose_name='Жанр',
+        related_name='leaderboard',
+        db_index=False,
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        verbose_name='Категория',
+        related_name='leaderboard',
+        db_index=False,
+    )
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        verbose_name='Произведение',
+        related_name='leaderboard_entries',
+    )
+    rating = models.PositiveSmallIntegerField(verbose_name='Рейтинг')
+    score_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок'
+    )
+
+    class Meta:
+        verbose_name = 'место в рейтинге'
+        verbose_name_plural = 'Рейтинги жанров и категорий'
+        indexes = [
+            # Места в рейтинге жанра (категории) в порядке
+            # (-rating, -score_count, -title_id) - чтение одного диапазона.
+            models.Index(
+                fields=['genre', 'rating', 'score_count', 'title'],
+                name='leaderboard_genre_idx',
+                condition=models.Q(genre__isnull=False),
+            ),
+            models.Index(
+                fields=['category', 'rating', 'score_count', 'title'],
+                name='leaderboard_category_idx',
+                condition=models.Q(category__isnull=False),
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=(
+                    models.Q(genre__isnull=False, category__isnull=True)
+                    | models.Q(genre__isnull=True, category__isnull=False)
+                ),
+                name='leaderboard_genre_or_category',
+            ),
+            models.UniqueConstraint(
+                fields=['genre', 'title'],
+                condition=models.Q(genre__isnull=False),
+                name='unique_leaderboard_genre_title',
+            ),
+            models.UniqueConstraint(
+                fields=['category', 'title'],
+                condition=models.Q(category__isnull=False),
+                name='unique_leaderboard_category_title',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.genre or self.category}: {self.title}'
+
+
+class TitleSearchIndex(models.Model):
+    """
+    Полнотекстовый индекс произведений на SQLite (reviews.search).
+    Таблицу FTS5 и триггеры создаёт install_title_search_index,
+    а не миграции; модель нужна, чтобы присоединять индекс к запросу.
+    """
+
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        db_constraint=False,
+        related_name='search_index',
+    )
+    document = MatchField(db_column=FTS_TABLE)
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = FTS_TABLE
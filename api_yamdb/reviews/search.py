@@ -0,0 +1,145 @@
+"""
+Полнотекстовый поиск по произведениям.
+
+Бэкенд выбирается настройкой TITLE_SEARCH_BACKEND (путь к классу).
+По умолчанию на SQLite с поддержкой FTS5 используется индекс
+`reviews_title_fts`, иначе - поиск через icontains.
+"""
+
+import re
+from functools import cache, reduce
+from operator import and_
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import F, Lookup, Q, TextField
+from django.utils.module_loading import import_string
+
+FTS_TABLE = 'reviews_title_fts'
+
+FTS_SCHEMA = (
+    f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+    "name, description, content='reviews_title', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')"
+)
+
+FTS_TRIGGERS = {
+    f'{FTS_TABLE}_insert': (
+        f'CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert '
+        'AFTER INSERT ON reviews_title BEGIN '
+        f'INSERT INTO {FTS_TABLE}(rowid, name, description) '
+        'VALUES (new.id, new.name, new.description); END'
+    ),
+    f'{FTS_TABLE}_delete': (
+        f'CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete '
+        'AFTER DELETE ON reviews_title BEGIN '
+        f'INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) '
+        "VALUES ('delete', old.id, old.name, old.description); END"
+    ),
+    f'{FTS_TABLE}_update': (
+        f'CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update '
+        'AFTER UPDATE OF name, description ON reviews_title BEGIN '
+        f'INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) '
+        "VALUES ('delete', old.id, old.name, old.description); "
+        f'INSERT INTO {FTS_TABLE}(rowid, name, description) '
+        'VALUES (new.id, new.name, new.description); END'
+    ),
+}
+
+
+class MatchField(TextField):
+    """Скрытый столбец FTS5 с именем таблицы - левый операнд MATCH."""
+
+
+@MatchField.register_lookup
+class Match(Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', (*lhs_params, *rhs_params)
+
+
+class IContainsTitleSearchBackend:
+    """Поиск подстрокой по названию и описанию (полный просмотр таблицы)."""
+
+    def search(self, queryset, terms):
+        return queryset.filter(reduce(and_, (
+            Q(name__icontains=term) | Q(description__icontains=term)
+            for term in terms
+        )))
+
+
+class SQLiteFTS5TitleSearchBackend:
+    """
+    Поиск по индексу FTS5 с сортировкой по релевантности (bm25).
+    Каждое слово запроса ищется по префиксу, все слова обязательны.
+    """
+
+    @staticmethod
+    def build_match(terms):
+        words = re.findall(r'\w+', ' '.join(terms))
+        return ' '.join(f'"{word}"*' for word in words)
+
+    def search(self, queryset, terms):
+        match = self.build_match(terms)
+        if not match:
+            return queryset.none()
+        return queryset.filter(
+            search_index__document__match=match
+        ).annotate(
+            search_rank=F('search_index__rank')
+        ).order_by('search_rank', 'id')
+
+
+@cache
+def fts5_available(using):
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA compile_options')
+        options = {row[0] for row in cursor.fetchall()}
+    return 'ENABLE_FTS5' in options
+
+
+def install_title_search_index(using='default'):
+    """
+    Создаёт индекс FTS5 и триггеры синхронизации с reviews_title.
+    Операция идемпотентна; если индекс или триггеры пришлось создавать
+    заново (например, после пересоздания таблицы миграцией),
+    индекс перестраивается по текущему содержимому таблицы.
+    """
+    connection = connections[using]
+    if (
+        not fts5_available(using)
+        or 'reviews_title' not in connection.introspection.table_names()
+    ):
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')"
+            ' AND name LIKE %s',
+            [f'{FTS_TABLE}%'],
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        missing = ({FTS_TABLE} | set(FTS_TRIGGERS)) - existing
+        if not missing:
+            return True
+        cursor.execute(FTS_SCHEMA)
+        for statement in FTS_TRIGGERS.values():
+            cursor.execute(statement)
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+        )
+    return True
+
+
+def get_title_search_backend(using='default'):
+    backend_path = getattr(settings, 'TITLE_SEARCH_BACKEND', None)
+    if backend_path:
+        return import_string(backend_path)()
+    if fts5_available(using):
+        return SQLiteFTS5TitleSearchBackend()
+    return IContainsTitleSearchBackend()
@@ -0,0 +1,136 @@
+"""Поддержка денормализованных рейтингов и счётчиков."""
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, NullIf
+from django.utils import timezone
+
+from .leaderboards import rebuild_leaderboards
+from .models import Comment, Review, Title
+
+
+def update_title_rating(title_id, score_delta, count_delta):
+    """
+    Инкрементально изменяет сумму и количество оценок произведения
+    и пересчитывает рейтинг одним UPDATE-запросом.
+    """
+    score_sum = F('score_sum') + score_delta
+    score_count = F('score_count') + count_delta
+    Title.objects.filter(pk=title_id).update(
+        score_sum=score_sum,
+        score_count=score_count,
+        rating=score_sum / NullIf(score_count, 0),
+        updated_at=timezone.now(),
+    )
+
+
+def touch_titles(queryset):
+    """
+    Обновляет дату изменения произведений, представление которых
+    зависит от изменившихся связанных объектов (категорий, жанров).
+    """
+    queryset.update(updated_at=timezone.now())
+
+
+def recalculate_title_ratings(title_ids):
+    """Пересчитывает рейтинг указанных произведений по их отзывам."""
+    reviews = (
+        Review.objects.filter(title=OuterRef('pk'))
+        .order_by()
+        .values('title')
+    )
+    score_sum = Subquery(reviews.annotate(total=Sum('score')).values('total'))
+    score_count = Subquery(reviews.annotate(total=Count('pk')).values('total'))
+    Title.objects.filter(pk__in=title_ids).update(
+        score_sum=Coalesce(score_sum, 0),
+        score_count=Coalesce(score_count, 0),
+        rating=Subquery(
+            reviews.annotate(
+                average=Sum('score') / Count('pk')
+            ).values('average')
+        ),
+        updated_at=timezone.now(),
+    )
+
+
+def update_comments_count(review_id, delta):
+    """Изменяет счётчик комментариев отзыва одним UPDATE-запросом."""
+    Review.objects.filter(pk=review_id).update(
+        comments_count=F('comments_count') + delta,
+        updated_at=timezone.now(),
+    )
+
+
+def recalculate_comment_counts(review_ids):
+    """Пересчитывает счётчик комментариев указанных отзывов."""
+    comments = (
+        Comment.objects.filter(review=OuterRef('pk'))
+        .order_by()
+        .values('review')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    Review.objects.filter(pk__in=review_ids).update(
+        comments_count=Coalesce(Subquery(comments), 0),
+        updated_at=timezone.now(),
+    )
+
+
+def iterate_id_chunks(model, chunk_size):
+    """Отдаёт идентификаторы объектов порциями по возрастанию id."""
+    last_id = 0
+    while True:
+        ids = list(
+            model.objects.filter(pk__gt=last_id)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:chunk_size]
+        )
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+def rebuild_title_ratings(chunk_size):
+    """
+    Пересчитывает рейтинг всех произведений порциями,
+    каждая порция в отдельной транзакции.
+    Возвращает количество обработанных произведений.
+    """
+    processed = 0
+    for title_ids in iterate_id_chunks(Title, chunk_size):
+        with transaction.atomic():
+            recalculate_title_ratings(title_ids)
+        processed += len(title_ids)
+    return processed
+
+
+def rebuild_comment_counts(chunk_size):
+    """
+    Пересчитывает счётчики комментариев всех отзывов порциями,
+    каждая порция в отдельной транзакции.
+    Возвращает количество обработанных отзывов.
+    """
+    processed = 0
+    for review_ids in iterate_id_chunks(Review, chunk_size):
+        with transaction.atomic():
+            recalculate_comment_counts(review_ids)
+        processed += len(review_ids)
+    return processed
+
+
+def rebuild_denormalized_data(chunk_size, comments=True):
+    """
+    Пересчитывает рейтинг произведений, счётчики комментариев
+    (если comments) и рейтинги жанров и категорий после изменений
+    в обход сигналов (bulk_create, UPDATE). Отдаёт сообщения о ходе
+    пересчёта.
+    """
+    processed = rebuild_title_ratings(chunk_size)
+    yield f'Рейтинг пересчитан, произведений: {processed}.'
+    if comments:
+        processed = rebuild_comment_counts(chunk_size)
+        yield f'Счётчики комментариев пересчитаны, отзывов: {processed}.'
+    # Рейтинги жанров и категорий строятся по рейтингу произведений.
+    processed = rebuild_leaderboards()
+    yield f'Рейтинги жанров и категорий пересчитаны, мест: {processed}.'
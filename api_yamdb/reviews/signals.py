@@ -0,0 +1,186 @@
+from django.db.models import QuerySet
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from .leaderboards import (
+    get_title_boards,
+    refill_board,
+    refill_title_boards,
+    refresh_title_leaderboards,
+)
+from .models import Category, Comment, Genre, GenreTitle, Review, Title
+from .search import install_title_search_index
+from .services import (
+    touch_titles,
+    update_comments_count,
+    update_title_rating,
+)
+
+
+def is_deleted_with(origin, *models):
+    """
+    Удаление началось с объекта или queryset одной из моделей:
+    каскад удаляет и тех, чьи счётчики пришлось бы обновлять.
+    """
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, models)
+
+
+@receiver(pre_save, sender=Review)
+def load_review_rating_state(sender, instance, raw, **kwargs):
+    """Дочитывает из БД прежнюю оценку, если отзыв загружен не полностью."""
+    if raw or instance._state.adding:
+        return
+    state = getattr(instance, '_saved_rating_state', (None, None))
+    if None in state:
+        instance._saved_rating_state = (
+            Review.objects.filter(pk=instance.pk)
+            .values_list('title_id', 'score')
+            .first()
+        ) or (None, None)
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_review_save(sender, instance, created, raw, **kwargs):
+    """Обновляет рейтинг произведения после создания/изменения отзыва."""
+    if raw:
+        return
+    old_title_id, old_score = (
+        (None, None) if created
+        else getattr(instance, '_saved_rating_state', (None, None))
+    )
+    if old_title_id == instance.title_id:
+        if old_score != instance.score:
+            update_title_rating(
+                instance.title_id, instance.score - old_score, 0
+            )
+            refresh_title_leaderboards(instance.title_id)
+        return
+    if old_title_id is not None:
+        update_title_rating(old_title_id, -old_score, -1)
+        refresh_title_leaderboards(old_title_id)
+    update_title_rating(instance.title_id, instance.score, 1)
+    refresh_title_leaderboards(instance.title_id)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_review_delete(sender, instance, origin=None, **kwargs):
+    """
+    Обновляет рейтинг произведения после удаления отзыва. Отзывы,
+    удаляемые вместе с произведением, рейтинг не меняют.
+    """
+    if is_deleted_with(origin, Title, Category):
+        return
+    title_id, score = getattr(instance, '_saved_rating_state', (None, None))
+    if None in (title_id, score):
+        title_id, score = instance.title_id, instance.score
+    update_title_rating(title_id, -score, -1)
+    refresh_title_leaderboards(title_id)
+
+
+@receiver(post_save, sender=Comment)
+def update_comments_count_on_save(sender, instance, created, raw, **kwargs):
+    """Увеличивает счётчик комментариев отзыва."""
+    if created and not raw:
+        update_comments_count(instance.review_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def update_comments_count_on_delete(sender, instance, origin=None,
+                                    **kwargs):
+    """
+    Уменьшает счётчик комментариев отзыва, в том числе при каскадном
+    удалении комментариев вместе с автором. Комментарии, удаляемые
+    вместе с отзывом, счётчик не меняют.
+    """
+    if is_deleted_with(origin, Review, Title, Category):
+        return
+    update_comments_count(instance.review_id, -1)
+
+
+@receiver(post_save, sender=Category)
+def touch_category_titles(sender, instance, raw, **kwargs):
+    """Произведения отображают категорию - отмечаем их изменёнными."""
+    if not raw:
+        touch_titles(Title.objects.filter(category=instance))
+
+
+@receiver(post_save, sender=Genre)
+def touch_genre_titles(sender, instance, raw, **kwargs):
+    """Произведения отображают жанры - отмечаем их изменёнными."""
+    if not raw:
+        touch_titles(Title.objects.filter(genre=instance))
+
+
+@receiver((post_save, post_delete), sender=GenreTitle)
+def touch_genre_title(sender, instance, origin=None, **kwargs):
+    if not is_deleted_with(origin, Title, Category):
+        touch_titles(Title.objects.filter(pk=instance.title_id))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def touch_title_on_genres_change(sender, instance, action, reverse,
+                                 pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        touch_titles(Title.objects.filter(genre=instance))
+    elif not action.startswith('post_'):
+        return
+    elif not reverse:
+        touch_titles(Title.objects.filter(pk=instance.pk))
+    elif pk_set:
+        touch_titles(Title.objects.filter(pk__in=pk_set))
+
+
+@receiver(post_save, sender=Title)
+def move_title_to_category_leaderboard(sender, instance, created, raw,
+                                       **kwargs):
+    """При смене категории произведение переходит в её рейтинг."""
+    if created or raw:
+        return
+    if instance.category_id != getattr(instance, '_saved_category_id', None):
+        refresh_title_leaderboards(instance.pk)
+
+
+@receiver(pre_delete, sender=Title)
+def load_title_leaderboards(sender, instance, **kwargs):
+    """Запоминает рейтинги, из которых произведение уйдёт при удалении."""
+    instance._leaderboards = get_title_boards(instance.pk)
+
+
+@receiver(post_delete, sender=Title)
+def refill_deleted_title_leaderboards(sender, instance, **kwargs):
+    """Освободившиеся места занимают следующие произведения."""
+    refill_title_boards(instance.pk, getattr(instance, '_leaderboards', ()))
+
+
+@receiver((post_save, post_delete), sender=GenreTitle)
+def update_genre_title_leaderboards(sender, instance, raw=False,
+                                    origin=None, **kwargs):
+    if not raw and not is_deleted_with(origin, Title, Category):
+        refresh_title_leaderboards(instance.title_id)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def update_genres_leaderboards(sender, instance, action, reverse, pk_set,
+                               **kwargs):
+    """Жанры произведения изменились - обновляем рейтинги жанров."""
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        refresh_title_leaderboards(instance.pk)
+    elif pk_set:
+        for title_id in pk_set:
+            refresh_title_leaderboards(title_id)
+    elif action == 'post_clear':
+        refill_board('genre_id', instance.pk)
+
+
+def create_title_search_index(sender, using, **kwargs):
+    """Создаёт (или восстанавливает) полнотекстовый индекс после миграций."""
+    install_title_search_index(using)
@@ -3,6 +3,8 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth.models import Group
 
+from .models import OutboxEmail
+
 User = get_user_model()
 
 admin.site.unregister(Group)
@@ -56,3 +58,20 @@ class UserAdmin(UserAdmin):
         'first_name',
         'last_name',
     )
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    """Очередь писем."""
+
+    list_display = (
+        'recipient',
+        'subject',
+        'status',
+        'attempts',
+        'next_attempt_at',
+        'sent_at',
+    )
+    list_filter = ('status',)
+    search_fields = ('recipient',)
+    readonly_fields = ('created_at', 'sent_at', 'last_error')
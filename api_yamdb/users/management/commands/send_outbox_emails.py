@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.services import send_pending_emails
+
+
+class Command(BaseCommand):
+    """
+    Фоновая отправка писем из очереди.
+    Без флага --once работает постоянно, опрашивая очередь.
+    """
+
+    help = 'Отправляет письма из очереди OutboxEmail.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Количество писем, отправляемых через одно соединение.',
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=5,
+            help='Количество попыток отправки одного письма.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='Пауза в секундах, если очередь пуста.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Отправить все готовые письма и завершиться.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                sent, failed = send_pending_emails(
+                    options['batch_size'], options['max_attempts']
+                )
+                if sent or failed:
+                    self.stdout.write(
+                        f'Отправлено писем: {sent}, ошибок: {failed}.'
+                    )
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
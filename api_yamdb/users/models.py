@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from .validators import validate_username
@@ -39,6 +40,19 @@ class User(AbstractUser):
         verbose_name='Биография',
         blank=True,
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+    )
+    token_version = models.PositiveIntegerField(
+        verbose_name='Версия данных токена',
+        default=0,
+        editable=False,
+    )
+
+    TOKEN_CLAIM_FIELDS = (
+        'username', 'role', 'is_staff', 'is_superuser', 'is_active'
+    )
 
     class Meta:
         verbose_name = 'Пользователь'
@@ -59,3 +73,94 @@ class User(AbstractUser):
 
     def __str__(self):
         return self.username
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_token_claims = instance.get_token_claims()
+        return instance
+
+    def get_token_claims(self):
+        """Данные пользователя, которые передаются в токене доступа."""
+        return {
+            field: self.__dict__.get(field)
+            for field in self.TOKEN_CLAIM_FIELDS
+        }
+
+    def save(self, *args, **kwargs):
+        # При изменении данных, вшитых в токены, версия увеличивается,
+        # и выданные ранее токены перестают использоваться без обращения к БД.
+        if (
+            not self._state.adding
+            and getattr(self, '_saved_token_claims', None)
+            != self.get_token_claims()
+        ):
+            self.token_version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'token_version'}
+        super().save(*args, **kwargs)
+        self._saved_token_claims = self.get_token_claims()
+
+
+class OutboxEmail(models.Model):
+    """
+    Письмо в очереди на отправку.
+    Письма сохраняются в одной транзакции с данными, которые их порождают,
+    и отправляются фоновым процессом (команда send_outbox_emails).
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Ожидает отправки'
+        SENT = 'sent', 'Отправлено'
+        FAILED = 'failed', 'Не отправлено'
+
+    subject = models.CharField(verbose_name='Тема', max_length=256)
+    body = models.TextField(verbose_name='Текст')
+    from_email = models.EmailField(
+        verbose_name='Отправитель',
+        max_length=EMAIL_MAX_LENGTH,
+        blank=True,
+    )
+    recipient = models.EmailField(
+        verbose_name='Получатель',
+        max_length=EMAIL_MAX_LENGTH,
+    )
+    status = models.CharField(
+        verbose_name='Статус',
+        max_length=max([len(status[0]) for status in Status.choices]),
+        choices=Status,
+        default=Status.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Попыток отправки',
+        default=0,
+    )
+    next_attempt_at = models.DateTimeField(
+        verbose_name='Следующая попытка',
+        default=timezone.now,
+    )
+    last_error = models.TextField(verbose_name='Последняя ошибка', blank=True)
+    created_at = models.DateTimeField(
+        verbose_name='Дата создания',
+        auto_now_add=True,
+    )
+    sent_at = models.DateTimeField(
+        verbose_name='Дата отправки',
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+        ordering = ('next_attempt_at', 'id')
+        indexes = (
+            models.Index(
+                fields=('status', 'next_attempt_at'),
+                name='outbox_status_next_attempt',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
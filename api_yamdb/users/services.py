@@ -0,0 +1,106 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+RETRY_DELAY = timedelta(seconds=30)
+MAX_RETRY_DELAY = timedelta(hours=1)
+# На время отправки письма откладываются, чтобы параллельный
+# отправитель не взял их повторно.
+SEND_LEASE = timedelta(minutes=5)
+
+
+def queue_email(subject, body, recipient, from_email=None):
+    """Ставит письмо в очередь на отправку."""
+    return OutboxEmail.objects.create(
+        subject=subject,
+        body=body,
+        recipient=recipient,
+        from_email=from_email or '',
+    )
+
+
+def get_retry_delay(attempts):
+    """Экспоненциальная задержка перед повторной попыткой."""
+    return min(RETRY_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+
+
+def claim_pending_emails(batch_size):
+    """Выбирает письма, готовые к отправке, и откладывает их на SEND_LEASE."""
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True).filter(
+                status=OutboxEmail.Status.PENDING,
+                next_attempt_at__lte=now,
+            )[:batch_size]
+        )
+        OutboxEmail.objects.filter(
+            pk__in=[email.pk for email in emails]
+        ).update(next_attempt_at=now + SEND_LEASE)
+    return emails
+
+
+def mark_sent(email):
+    email.attempts += 1
+    email.status = OutboxEmail.Status.SENT
+    email.sent_at = timezone.now()
+    email.last_error = ''
+    email.save(update_fields=('attempts', 'status', 'sent_at', 'last_error'))
+
+
+def mark_failed(email, error, max_attempts):
+    email.attempts += 1
+    email.last_error = str(error) or error.__class__.__name__
+    if email.attempts >= max_attempts:
+        email.status = OutboxEmail.Status.FAILED
+    else:
+        email.next_attempt_at = (
+            timezone.now() + get_retry_delay(email.attempts)
+        )
+    email.save(update_fields=(
+        'attempts', 'last_error', 'status', 'next_attempt_at'
+    ))
+
+
+def send_pending_emails(batch_size=100, max_attempts=5):
+    """
+    Отправляет пачку писем из очереди через одно соединение
+    с почтовым сервером. Возвращает количество отправленных
+    и неотправленных писем.
+    """
+    emails = claim_pending_emails(batch_size)
+    if not emails:
+        return 0, 0
+    sent = failed = 0
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as error:
+        for email in emails:
+            mark_failed(email, error, max_attempts)
+        return 0, len(emails)
+    try:
+        for email in emails:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                from_email=email.from_email or settings.DEFAULT_FROM_EMAIL,
+                to=[email.recipient],
+                connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as error:
+                mark_failed(email, error, max_attempts)
+                failed += 1
+            else:
+                mark_sent(email)
+                sent += 1
+    finally:
+        connection.close()
+    return sent, failed
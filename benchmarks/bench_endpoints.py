@@ -0,0 +1,308 @@
+"""
+Бенчмарк всех маршрутов API: p50/p95 времени ответа, количество
+запросов к БД и пиковая память на один запрос.
+
+Без --db база создаётся заново и заполняется командой generate_data:
+
+    python benchmarks/bench_endpoints.py --titles 100000 --reviews 1000000
+    python benchmarks/bench_endpoints.py --db /data/bench.sqlite3 \\
+        --output benchmarks/baselines/endpoints.json
+
+Изменяющие запросы выполняются в транзакции, которая откатывается,
+поэтому данные между повторами не меняются.
+"""
+
+import argparse
+import json
+import logging
+import platform
+import tracemalloc
+from dataclasses import dataclass, field
+
+from utils import get_git_commit, percentile, setup_django, timeit
+
+
+@dataclass
+class Scenario:
+    route: str
+    method: str
+    url: str
+    data: dict = field(default_factory=dict)
+    name: str = ''
+
+    def __post_init__(self):
+        self.name = self.name or self.route
+
+
+def get_route_names():
+    from api.urls import urlpatterns, v1_router
+
+    names = {url.name for url in v1_router.urls}
+    names.update(url.name for url in urlpatterns if hasattr(url, 'name'))
+    return names
+
+
+def prepare_objects():
+    """Выбирает самые популярные объекты и создаёт пустые для удаления."""
+    from django.contrib.auth import get_user_model
+    from django.db.models import Count
+    from reviews.models import Category, Genre, Review, Title
+
+    User = get_user_model()
+    admin, _ = User.objects.get_or_create(
+        username='bench_admin',
+        defaults={'email': 'bench_admin@yamdb.fake', 'role': 'admin'},
+    )
+    title = Title.objects.order_by('-score_count', 'id').first()
+    review = (
+        Review.objects.filter(title=title)
+        .annotate(comment_count=Count('comments'))
+        .order_by('-comment_count', 'id')
+        .first()
+    )
+    comment = review.comments.order_by('id').first()
+    empty_category, _ = Category.objects.get_or_create(
+        name='Бенчмарк', slug='bench-category'
+    )
+    empty_genre, _ = Genre.objects.get_or_create(
+        name='Бенчмарк', slug='bench-genre'
+    )
+    return {
+        'admin': admin,
+        'title': title,
+        'review': review,
+        'comment': comment,
+        'category': Category.objects.exclude(pk=empty_category.pk).first(),
+        'genre': Genre.objects.exclude(pk=empty_genre.pk).first(),
+        'empty_category': empty_category,
+        'empty_genre': empty_genre,
+    }
+
+
+def get_scenarios(objects):
+    title_url = f'/api/v1/titles/{objects["title"].pk}/'
+    reviews_url = f'{title_url}reviews/'
+    review_url = f'{reviews_url}{objects["review"].pk}/'
+    comments_url = f'{review_url}comments/'
+    comment_url = f'{comments_url}{objects["comment"].pk}/'
+    category, genre = objects['category'], objects['genre']
+    return (
+        Scenario('api-root', 'get', '/api/v1/'),
+        Scenario('users-list', 'get', '/api/v1/users/'),
+        Scenario('users-detail', 'get', '/api/v1/users/bench_admin/'),
+        Scenario('users-me', 'get', '/api/v1/users/me/'),
+        Scenario(
+            'users-me', 'patch', '/api/v1/users/me/', {'bio': 'Бенчмарк'},
+            name='users-me:patch',
+        ),
+        Scenario('categories-list', 'get', '/api/v1/categories/'),
+        Scenario(
+            'categories-detail', 'delete',
+            f'/api/v1/categories/{objects["empty_category"].slug}/',
+        ),
+        Scenario(
+            'categories-top', 'get', f'/api/v1/categories/{category.slug}/top/'
+        ),
+        Scenario('genres-list', 'get', '/api/v1/genres/'),
+        Scenario('genres-top', 'get', f'/api/v1/genres/{genre.slug}/top/'),
+        Scenario(
+            'genres-detail', 'delete',
+            f'/api/v1/genres/{objects["empty_genre"].slug}/',
+        ),
+        Scenario('titles-list', 'get', '/api/v1/titles/'),
+        Scenario(
+            'titles-list', 'get', '/api/v1/titles/?cursor=',
+            name='titles-list:cursor',
+        ),
+        Scenario(
+            'titles-list', 'get', '/api/v1/titles/?ordering=-rating&cursor=',
+            name='titles-list:rating',
+        ),
+        Scenario(
+            'titles-list', 'get', '/api/v1/titles/?search=дракон',
+            name='titles-list:search',
+        ),
+        Scenario(
+            'titles-list', 'get', f'/api/v1/titles/?genre={genre.slug}',
+            name='titles-list:genre',
+        ),
+        Scenario('titles-facets', 'get', '/api/v1/titles/facets/'),
+        Scenario(
+            'titles-facets', 'get',
+            f'/api/v1/titles/facets/?genre={genre.slug}',
+            name='titles-facets:genre',
+        ),
+        Scenario(
+            'titles-list', 'post', '/api/v1/titles/',
+            {
+                'name': 'Бенчмарк',
+                'year': 2000,
+                'category': category.slug,
+                'genre': [genre.slug],
+            },
+            name='titles-list:post',
+        ),
+        Scenario('titles-detail', 'get', title_url),
+        Scenario(
+            'titles-detail', 'patch', title_url, {'name': 'Бенчмарк'},
+            name='titles-detail:patch',
+        ),
+        Scenario('review-list', 'get', reviews_url),
+        Scenario(
+            'review-list', 'post', reviews_url,
+            {'text': 'Бенчмарк', 'score': 7},
+            name='review-list:post',
+        ),
+        Scenario('review-detail', 'get', review_url),
+        Scenario('comment-list', 'get', comments_url),
+        Scenario(
+            'comment-list', 'post', comments_url, {'text': 'Бенчмарк'},
+            name='comment-list:post',
+        ),
+        Scenario('comment-detail', 'get', comment_url),
+        Scenario(
+            'signup', 'post', '/api/v1/auth/signup/',
+            {'username': 'bench_signup', 'email': 'bench_signup@yamdb.fake'},
+        ),
+        Scenario('export', 'get', '/api/v1/export/titles.csv'),
+        Scenario(
+            'token', 'post', '/api/v1/auth/token/',
+            {'username': 'bench_admin', 'confirmation_code': 'invalid'},
+        ),
+    )
+
+
+def get_request(client, scenario):
+    from django.db import transaction
+
+    def request():
+        if scenario.method == 'get':
+            response = client.get(scenario.url)
+            if response.streaming:
+                # Потоковый ответ читается, как его читал бы сервер.
+                for _ in response.streaming_content:
+                    pass
+            return response
+        with transaction.atomic():
+            response = getattr(client, scenario.method)(
+                scenario.url, scenario.data, format='json'
+            )
+            transaction.set_rollback(True)
+        return response
+
+    return request
+
+
+def measure(client, scenario, repeat):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    request = get_request(client, scenario)
+    with CaptureQueriesContext(connection) as context:
+        response = request()
+    # Список запросов читается из журнала соединения, который
+    # очищается следующими запросами, поэтому считаем их сразу.
+    queries = len(context)
+    tracemalloc.start()
+    request()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    durations = timeit(request, repeat)
+    return {
+        'route': scenario.route,
+        'method': scenario.method.upper(),
+        'url': scenario.url,
+        'status': response.status_code,
+        'p50_ms': round(percentile(durations, 0.5), 3),
+        'p95_ms': round(percentile(durations, 0.95), 3),
+        'queries': queries,
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def get_row_counts():
+    from django.contrib.auth import get_user_model
+    from reviews.models import Comment, Review, Title
+
+    return {
+        'users': get_user_model().objects.count(),
+        'titles': Title.objects.count(),
+        'reviews': Review.objects.count(),
+        'comments': Comment.objects.count(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--db', help='Готовая база SQLite.')
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--output', help='Файл для результатов в JSON.')
+    for option, default in (
+        ('--users', 1000),
+        ('--titles', 10000),
+        ('--reviews', 100000),
+        ('--comments', 200000),
+    ):
+        parser.add_argument(option, type=int, default=default)
+    args = parser.parse_args()
+
+    # При DEBUG журнал запросов ограничен и искажает их подсчёт.
+    setup_django(args.db, DEBUG=False)
+    logging.getLogger('django.request').setLevel(logging.ERROR)
+    logging.getLogger('api.middleware').setLevel(logging.ERROR)
+    import django
+    from django.core.management import call_command
+    from rest_framework.test import APIClient
+
+    from api.authentication import get_access_token
+    from reviews.models import Title
+
+    if not Title.objects.exists():
+        call_command(
+            'generate_data',
+            users=args.users,
+            titles=args.titles,
+            reviews=args.reviews,
+            comments=args.comments,
+        )
+    objects = prepare_objects()
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {get_access_token(objects["admin"])}'
+    )
+
+    scenarios = get_scenarios(objects)
+    missing = get_route_names() - {scenario.route for scenario in scenarios}
+    if missing:
+        print(f'Маршруты без сценария: {", ".join(sorted(missing))}')
+
+    results = {}
+    for scenario in scenarios:
+        results[scenario.name] = result = measure(
+            client, scenario, args.repeat
+        )
+        print(
+            f'{scenario.name:22} {result["method"]:6} {result["status"]} '
+            f'p50={result["p50_ms"]:8.2f}ms p95={result["p95_ms"]:8.2f}ms '
+            f'queries={result["queries"]:3} '
+            f'peak={result["peak_memory_kb"]:8.1f}KiB'
+        )
+
+    if args.output:
+        report = {
+            'meta': {
+                'commit': get_git_commit(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'repeat': args.repeat,
+                'rows': get_row_counts(),
+            },
+            'routes': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+            file.write('\n')
+
+
+if __name__ == '__main__':
+    main()
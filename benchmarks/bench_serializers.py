@@ -0,0 +1,90 @@
+"""
+Микробенчмарк сериализаторов чтения: штатный путь DRF и быстрое
+представление (api.representation) на одних и тех же объектах.
+
+    python benchmarks/bench_serializers.py --objects 10000
+
+Объекты загружаются из базы заранее по планам запросов вьюсетов,
+замеряется только построение представления и рендеринг в JSON.
+"""
+
+import argparse
+
+from utils import percentile, setup_django, timeit
+
+
+def load_objects(count):
+    from django.contrib.auth import get_user_model
+    from reviews.models import Category, Comment, Genre, Review, Title
+
+    return {
+        'CategorySerializer': list(Category.objects.all()[:count]),
+        'GenreSerializer': list(Genre.objects.all()[:count]),
+        'TitleSerializerReadOnly': list(
+            Title.objects.select_related('category')
+            .prefetch_related('genre')[:count]
+        ),
+        'ReviewSerializer': list(
+            Review.objects.select_related('author')[:count]
+        ),
+        'CommentSerializer': list(
+            Comment.objects.select_related('author')[:count]
+        ),
+        'AdiminUserSerializer': list(get_user_model().objects.all()[:count]),
+    }
+
+
+def get_serialize(serializer_class, objects, context):
+    from rest_framework.renderers import JSONRenderer
+
+    renderer = JSONRenderer()
+
+    def serialize():
+        return renderer.render(
+            serializer_class(objects, many=True, context=context).data
+        )
+
+    return serialize
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--objects', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django(DEBUG=False)
+    from django.core.management import call_command
+
+    from api import serializers
+
+    count = args.objects
+    call_command(
+        'generate_data',
+        users=count,
+        categories=count,
+        genres=count,
+        titles=count,
+        reviews=count,
+        comments=count,
+        verbosity=0,
+    )
+    paths = (('drf', {'drf_representation': True}), ('fast', {}))
+    for name, objects in load_objects(count).items():
+        serializer_class = getattr(serializers, name)
+        results = {}
+        for path, context in paths:
+            serialize = get_serialize(serializer_class, objects, context)
+            results[path] = serialize(), timeit(serialize, args.repeat)
+        assert results['drf'][0] == results['fast'][0], name
+        drf, fast = (
+            percentile(results[path][1], 0.5) for path, _ in paths
+        )
+        print(
+            f'{name:24} objects={len(objects):6} drf={drf:9.2f}ms '
+            f'fast={fast:9.2f}ms speedup={drf / fast:5.2f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
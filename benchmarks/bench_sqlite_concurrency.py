@@ -0,0 +1,144 @@
+"""
+Конкурентные чтение и запись в SQLite: настройки по умолчанию
+и режим SQLITE_TUNING (WAL, mmap, BEGIN IMMEDIATE, busy_timeout).
+
+    python benchmarks/bench_sqlite_concurrency.py --readers 8 --writers 4
+
+Каждый читатель и писатель - отдельный процесс со своим соединением,
+как воркеры WSGI-сервера.
+"""
+
+import argparse
+import multiprocessing
+import random
+import shutil
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from utils import percentile, setup_django
+
+MODES = {
+    'default': {
+        'CONN_MAX_AGE': 0,
+        'OPTIONS': {'init_command': 'PRAGMA journal_mode=DELETE'},
+    },
+    'tuned': None,
+}
+
+
+def read(title_ids):
+    from reviews.models import Review, Title
+
+    list(Title.objects.select_related('category').order_by(
+        'year', 'name'
+    )[:10])
+    list(Review.objects.filter(
+        title_id=random.choice(title_ids)
+    ).select_related('author')[:10])
+
+
+def write(title_ids, user_ids):
+    from reviews.models import Review
+
+    review = Review.objects.filter(
+        title_id=random.choice(title_ids)
+    ).first()
+    review.comments.create(author_id=random.choice(user_ids), text='Бенч')
+    review.score = random.randint(1, 10)
+    review.save()
+
+
+def worker(role, db_path, mode, duration, seed):
+    database = MODES[mode]
+    setup_django(db_path, migrate=False, database=database)
+    from django.contrib.auth import get_user_model
+    from django.db import OperationalError, connection
+    from reviews.models import Title
+
+    random.seed(seed)
+    title_ids = list(
+        Title.objects.filter(score_count__gt=0).values_list('id', flat=True)
+    )
+    user_ids = list(get_user_model().objects.values_list('id', flat=True))
+    operations, errors, durations = 0, 0, []
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            if role == 'reader':
+                read(title_ids)
+            else:
+                write(title_ids, user_ids)
+            operations += 1
+        except OperationalError:
+            errors += 1
+        durations.append((time.perf_counter() - started) * 1000)
+        if database and not database.get('CONN_MAX_AGE'):
+            connection.close()
+    return role, operations, errors, durations
+
+
+def prepare_template(args):
+    template = setup_django(database=MODES['default'])
+    from django.core.management import call_command
+    from django.db import connections
+
+    call_command(
+        'generate_data',
+        users=args.users,
+        titles=args.titles,
+        reviews=args.reviews,
+        comments=0,
+        verbosity=0,
+    )
+    connections.close_all()
+    return Path(template)
+
+
+def run(mode, template, args):
+    db_path = template.with_name(f'{mode}.sqlite3')
+    shutil.copy(template, db_path)
+    with sqlite3.connect(db_path) as connection:
+        connection.execute('PRAGMA journal_mode=DELETE')
+    roles = ['reader'] * args.readers + ['writer'] * args.writers
+    with ProcessPoolExecutor(
+        len(roles), mp_context=multiprocessing.get_context('spawn')
+    ) as executor:
+        results = list(executor.map(
+            worker, roles, [str(db_path)] * len(roles),
+            [mode] * len(roles), [args.duration] * len(roles),
+            range(len(roles)),
+        ))
+    for role in ('reader', 'writer'):
+        operations = sum(r[1] for r in results if r[0] == role)
+        errors = sum(r[2] for r in results if r[0] == role)
+        durations = sorted(d for r in results if r[0] == role for d in r[3])
+        if not durations:
+            continue
+        print(
+            f'{mode:8} {role:7} {operations / args.duration:9.1f} ops/s '
+            f'p50={percentile(durations, 0.5):8.2f}ms '
+            f'p95={percentile(durations, 0.95):8.2f}ms '
+            f'errors={errors}'
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--titles', type=int, default=10000)
+    parser.add_argument('--reviews', type=int, default=100000)
+    args = parser.parse_args()
+
+    template = prepare_template(args)
+    for mode in MODES:
+        run(mode, template, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Пиковая память ответа со списком: обычный режим и потоковый
+(?stream=true) при разных размерах страницы.
+
+    python benchmarks/bench_streaming.py --titles 20000 --chunk-size 500
+
+В потоковом режиме пик памяти определяется размером порции,
+а в обычном растёт вместе с размером страницы.
+"""
+
+import argparse
+import logging
+import time
+import tracemalloc
+
+from utils import setup_django
+
+PAGE_SIZES = (100, 1000, 5000, 20000)
+
+
+def consume(response):
+    """Читает тело ответа, не накапливая его, как сервер приложений."""
+    size = 0
+    if response.streaming:
+        for part in response.streaming_content:
+            size += len(part)
+    else:
+        size = len(response.content)
+    return size
+
+
+def measure(client, url, params):
+    tracemalloc.start()
+    started = time.perf_counter()
+    response = client.get(url, params)
+    size = consume(response)
+    elapsed = (time.perf_counter() - started) * 1000
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert response.status_code == 200, response.status_code
+    return elapsed, peak, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=20000)
+    parser.add_argument('--chunk-size', type=int, default=500)
+    args = parser.parse_args()
+
+    max_page_size = max(PAGE_SIZES)
+    setup_django(
+        DEBUG=False,
+        MAX_PAGE_SIZE=max_page_size,
+        STREAMING_MAX_PAGE_SIZE=max_page_size,
+        STREAMING_CHUNK_SIZE=args.chunk_size,
+    )
+    logging.getLogger('api.middleware').setLevel(logging.ERROR)
+    from django.core.management import call_command
+    from rest_framework.test import APIClient
+
+    call_command(
+        'generate_data',
+        users=10,
+        titles=args.titles,
+        reviews=0,
+        comments=0,
+        verbosity=0,
+    )
+    client = APIClient()
+    url = '/api/v1/titles/'
+    print(f'titles={args.titles} chunk_size={args.chunk_size}')
+    for page_size in PAGE_SIZES:
+        for mode in ('false', 'true'):
+            elapsed, peak, size = measure(
+                client, url, {'page_size': page_size, 'stream': mode}
+            )
+            print(
+                f'page_size={page_size:6} stream={mode:5} '
+                f'time={elapsed:9.1f}ms peak={peak / 1024:10.1f}KiB '
+                f'body={size / 1024:10.1f}KiB'
+            )
+
+
+if __name__ == '__main__':
+    main()
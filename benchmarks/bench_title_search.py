@@ -0,0 +1,75 @@
+"""
+Сравнение поиска произведений: icontains (полный просмотр) и FTS5.
+
+    python benchmarks/bench_title_search.py --titles 1000000
+"""
+
+import argparse
+import random
+
+from utils import percentile, setup_django, timeit
+
+WORDS = (
+    'война мир ночь день город море звезда дракон король тень огонь '
+    'лёд песня дорога дом сад зима лето небо река остров лес сердце '
+    'тайна путь время свет память голос берег ветер степь гора'
+).split()
+
+QUERIES = ('дракон', 'тайна остров', 'ветер', 'зим', 'несуществующее')
+
+
+def fill_titles(count, batch_size=10000):
+    from reviews.models import Category, Title
+
+    category = Category.objects.create(name='Книги', slug='books')
+    rng = random.Random(42)
+    for start in range(0, count, batch_size):
+        Title.objects.bulk_create(
+            Title(
+                name=f'{" ".join(rng.sample(WORDS, 3))} {number}',
+                year=rng.randint(1900, 2024),
+                description=' '.join(rng.choices(WORDS, k=20)),
+                category=category,
+            )
+            for number in range(start, min(start + batch_size, count))
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--page-size', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from reviews.search import (
+        IContainsTitleSearchBackend,
+        SQLiteFTS5TitleSearchBackend,
+    )
+    from reviews.models import Title
+
+    fill_titles(args.titles)
+    backends = (
+        ('icontains', IContainsTitleSearchBackend()),
+        ('fts5', SQLiteFTS5TitleSearchBackend()),
+    )
+    print(f'titles={args.titles} repeat={args.repeat}')
+    for query in QUERIES:
+        for name, backend in backends:
+            queryset = backend.search(Title.objects.all(), query.split())
+
+            def run():
+                queryset.count()
+                list(queryset[:args.page_size])
+
+            durations = timeit(run, args.repeat)
+            print(
+                f'{query!r:18} {name:10} '
+                f'p50={percentile(durations, 0.5):9.2f}ms '
+                f'p95={percentile(durations, 0.95):9.2f}ms'
+            )
+
+
+if __name__ == '__main__':
+    main()
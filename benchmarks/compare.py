@@ -0,0 +1,67 @@
+"""
+Сравнение двух файлов с результатами bench_endpoints.py.
+
+    python benchmarks/compare.py benchmarks/baselines/endpoints.json new.json
+
+Код возврата 1, если p95 какого-либо маршрута вырос больше порога
+или выросло количество запросов к БД.
+"""
+
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def compare(baseline, current, threshold):
+    regressions = []
+    for name, new in current['routes'].items():
+        old = baseline['routes'].get(name)
+        if old is None:
+            print(f'{name:22} новый маршрут')
+            continue
+        ratio = new['p95_ms'] / max(old['p95_ms'], 1e-9)
+        marks = []
+        if ratio > 1 + threshold:
+            marks.append('p95')
+        if new['queries'] > old['queries']:
+            marks.append('queries')
+        if marks:
+            regressions.append(name)
+        print(
+            f'{name:22} p95 {old["p95_ms"]:8.2f} -> {new["p95_ms"]:8.2f}ms '
+            f'({ratio:5.2f}x) queries {old["queries"]:3} -> '
+            f'{new["queries"]:3} peak {old["peak_memory_kb"]:8.1f} -> '
+            f'{new["peak_memory_kb"]:8.1f}KiB {" ".join(marks)}'
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.2,
+        help='Допустимый относительный рост p95.',
+    )
+    args = parser.parse_args()
+    baseline, current = load(args.baseline), load(args.current)
+    print(
+        f'{baseline["meta"]["commit"]} -> {current["meta"]["commit"]}, '
+        f'строк: {baseline["meta"]["rows"]} -> {current["meta"]["rows"]}'
+    )
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f'Регрессии: {", ".join(regressions)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Общие функции для запуска бенчмарков вне тестов."""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+PROJECT_DIR = BASE_DIR / 'api_yamdb'
+
+
+def setup_django(db_path=None, migrate=True, database=None, **overrides):
+    """
+    Настраивает Django на отдельную базу SQLite и применяет миграции.
+    database дополняет настройки DATABASES['default'].
+    Возвращает путь к файлу базы.
+    """
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    if db_path is None:
+        db_path = Path(tempfile.mkdtemp()) / 'bench.sqlite3'
+
+    import django
+    from django.conf import settings
+
+    settings.DATABASES['default']['NAME'] = str(db_path)
+    settings.DATABASES['default'].update(database or {})
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    django.setup()
+
+    if migrate:
+        from django.core.management import call_command
+
+        call_command('migrate', verbosity=0)
+    return db_path
+
+
+def timeit(func, repeat):
+    """Возвращает отсортированный список длительностей вызовов, мс."""
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - started) * 1000)
+    return sorted(durations)
+
+
+def percentile(durations, share):
+    return durations[min(len(durations) - 1, int(len(durations) * share))]
+
+
+def get_git_commit():
+    """Текущий коммит, чтобы результаты можно было сравнивать по истории."""
+    try:
+        return subprocess.run(
+            ('git', 'rev-parse', '--short', 'HEAD'),
+            cwd=BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,137 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json()['rating']
+
+    def test_01_rating_follows_review_changes(self, client, admin_client,
+                                              admin, user, user_client):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения обновляется '
+            'при создании отзыва.'
+        )
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            ),
+            data={'score': 2},
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(client, title_id) == 3, (
+            'Проверьте, что рейтинг произведения обновляется '
+            'при изменении оценки в отзыве.'
+        )
+
+        response = admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(client, title_id) == 2, (
+            'Проверьте, что рейтинг произведения обновляется '
+            'при удалении отзыва.'
+        )
+
+        user.delete()
+        assert self.get_rating(client, title_id) is None, (
+            'Проверьте, что рейтинг произведения обновляется '
+            'при каскадном удалении отзывов.'
+        )
+
+    def test_02_rebuild_ratings_command(self, client, admin_client,
+                                        admin, user, user_client):
+        from reviews.models import Title
+
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        Title.objects.update(score_sum=0, score_count=0, rating=None)
+
+        call_command('rebuild_ratings', chunk_size=1)
+
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.score_sum, title.score_count, title.rating) == (
+            10, 2, 5
+        ), (
+            'Проверьте, что команда `rebuild_ratings` пересчитывает '
+            'рейтинг произведений по отзывам.'
+        )
+
+    def test_03_title_update_keeps_rating(self, client, admin_client,
+                                          admin, user, user_client):
+        from reviews.models import Title
+
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        stale_title = Title.objects.get(pk=titles[0]['id'])
+        Title.objects.filter(pk=stale_title.pk).update(score_sum=20, rating=10)
+
+        stale_title.name = 'Новое название'
+        stale_title.save()
+
+        assert self.get_rating(client, stale_title.pk) == 10, (
+            'Проверьте, что сохранение произведения не перезаписывает '
+            'рейтинг, обновлённый другими запросами.'
+        )
+
+    def test_04_title_delete_skips_cascaded_reviews(self, admin_client,
+                                                    django_user_model):
+        from reviews.models import Category, Genre, Review, Title
+
+        category = Category.objects.create(name='Фильм', slug='films')
+        genres = Genre.objects.bulk_create(
+            Genre(name=f'Жанр {number}', slug=f'genre-{number}')
+            for number in range(3)
+        )
+        users = django_user_model.objects.bulk_create(
+            django_user_model(username=f'critic{number}',
+                              email=f'critic{number}@yamdb.fake')
+            for number in range(4)
+        )
+        num_queries = []
+        for number, count in enumerate((1, 4)):
+            title = Title.objects.create(
+                name=f'Произведение {number}', year=2000, category=category
+            )
+            title.genre.set(genres[:count])
+            for user in users[:count]:
+                Review.objects.create(
+                    title=title, author=user, text='Отзыв', score=5
+                )
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.delete(
+                    self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title.pk)
+                )
+            assert response.status_code == HTTPStatus.NO_CONTENT
+            num_queries.append(len(context.captured_queries))
+        assert num_queries[0] == num_queries[1], (
+            'Проверьте, что при удалении произведения рейтинг '
+            'не обновляется для каждого удаляемого вместе с ним отзыва '
+            'и жанра.'
+        )
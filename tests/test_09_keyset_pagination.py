@@ -0,0 +1,87 @@
+import json
+from base64 import urlsafe_b64encode
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09KeysetPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def create_titles(self):
+        from reviews.models import Category, Title
+
+        category = Category.objects.create(name='Фильм', slug='films')
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {number % 4}', year=1990 + number % 3,
+                  category=category)
+            for number in range(12)
+        )
+        return list(
+            Title.objects.order_by('year', 'name', 'id')
+            .values_list('id', flat=True)
+        )
+
+    def test_01_pages_follow_keyset_ordering(self, client):
+        expected_ids = self.create_titles()
+
+        ids = []
+        url = f'{self.TITLES_URL}?cursor='
+        pages = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в режиме `cursor` не выполняется подсчёт '
+                'общего количества объектов.'
+            )
+            ids.extend(title['id'] for title in data['results'])
+            pages.append(data)
+            url = data['next']
+        assert ids == expected_ids, (
+            'Проверьте, что пагинация по ключу обходит все произведения '
+            'в порядке (`year`, `name`, `id`) без пропусков и повторов.'
+        )
+
+        response = client.get(pages[-1]['previous'])
+        assert response.json()['results'] == pages[-2]['results'], (
+            'Проверьте, что ссылка `previous` в режиме `cursor` '
+            'возвращает предыдущую страницу.'
+        )
+
+    def test_02_page_number_is_default(self, client):
+        expected_ids = self.create_titles()
+
+        data = client.get(self.TITLES_URL).json()
+        assert data['count'] == len(expected_ids), (
+            'Проверьте, что без параметра `cursor` сохраняется '
+            'постраничная пагинация с ключом `count`.'
+        )
+
+    def test_03_invalid_cursor(self, client):
+        response = client.get(f'{self.TITLES_URL}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    @pytest.mark.parametrize('url, position', [
+        (TITLES_URL, ['abc', 'x', 1]),
+        (TITLES_URL, [1990, 'x', 10 ** 30]),
+        (TITLES_URL, [None, 'x', 1]),
+        (TITLES_URL, [{'year': 1990}, 'x', 1]),
+        ('/api/v1/titles/{title_id}/reviews/', ['not a date', 1]),
+        ('/api/v1/users/', ['user', 'x']),
+    ])
+    def test_04_tampered_cursor(self, admin_client, url, position):
+        cursor = urlsafe_b64encode(
+            json.dumps({'p': position}).encode()
+        ).decode()
+        title_id, *_ = self.create_titles()
+        response = admin_client.get(
+            url.format(title_id=title_id), {'cursor': cursor}
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что курсор с некорректными значениями полей '
+            'возвращает ошибку 404, а не 500.'
+        )
@@ -0,0 +1,120 @@
+import pytest
+
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10TitleQueryBudget:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def add_titles(self, start, stop):
+        from reviews.models import Category, Genre, Title
+
+        category, _ = Category.objects.get_or_create(
+            name='Музыка', slug='music'
+        )
+        genres = [
+            Genre.objects.get_or_create(
+                name=f'Жанр {number}', slug=f'genre-{number}'
+            )[0]
+            for number in range(3)
+        ]
+        titles = Title.objects.bulk_create(
+            Title(name=f'Альбом {number}', year=2000, category=category)
+            for number in range(start, stop)
+        )
+        for title in titles:
+            title.genre.set(genres)
+
+    def test_01_list_queries_do_not_depend_on_page_size(
+            self, client, django_assert_num_queries):
+        from api.catalog import get_catalog
+
+        self.add_titles(0, 1)
+        # Справочники загружаются в каталог один раз на процесс.
+        get_catalog()
+        with django_assert_num_queries(4):
+            client.get(self.TITLES_URL)
+
+        self.add_titles(1, 5)
+        with django_assert_num_queries(4):
+            client.get(self.TITLES_URL)
+
+        with django_assert_num_queries(3):
+            client.get(f'{self.TITLES_URL}?cursor=')
+
+    def test_02_detail_and_write_queries(self, client, admin_client,
+                                         django_assert_max_num_queries):
+        titles, categories, genres = create_titles(admin_client)
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        with django_assert_max_num_queries(3):
+            client.get(detail_url)
+
+        with django_assert_max_num_queries(6):
+            admin_client.patch(detail_url, data={'name': 'Новое название'})
+
+        data = {
+            'name': 'Чужие',
+            'year': 1986,
+            'genre': [genres[0]['slug'], genres[1]['slug']],
+            'category': categories[0]['slug'],
+        }
+        with django_assert_max_num_queries(13):
+            admin_client.post(self.TITLES_URL, data=data)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10ReviewCommentQueryBudget:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_review_and_comment_queries(
+            self, client, admin_client, admin, user, user_client,
+            moderator, moderator_client, django_assert_num_queries):
+        authors_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client,
+        }
+        comments, reviews, titles = create_comments(admin_client, authors_map)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        review_url = f'{reviews_url}{reviews[0]["id"]}/'
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        comment_url = f'{comments_url}{comments[0]["id"]}/'
+
+        budget = (
+            (client.get, reviews_url, None, 5),
+            (client.get, review_url, None, 4),
+            (client.get, comments_url, None, 5),
+            (client.get, comment_url, None, 4),
+            # Изменение оценки обновляет и места произведения в рейтингах
+            # жанров и категории: +2 запроса для произведения вне рейтингов.
+            (moderator_client.patch, review_url, {'score': 1}, 9),
+            (moderator_client.patch, comment_url, {'text': 'Новый'}, 4),
+            # Создание комментария и счётчик в отзыве - одна транзакция.
+            (user_client.post, comments_url, {'text': 'Ещё'}, 6),
+            (
+                user_client.post,
+                self.REVIEWS_URL_TEMPLATE.format(title_id=titles[1]['id']),
+                {'text': 'Отзыв', 'score': 7},
+                9,
+            ),
+        )
+        for method, url, data, num_queries in budget:
+            with django_assert_num_queries(num_queries, exact=False):
+                method(url, data=data)
+
+        with django_assert_num_queries(5):
+            response = client.get(comments_url)
+        assert response.json()['count'] == len(authors_map) + 1
@@ -0,0 +1,84 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'search': query})
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_by_name_and_description(self, client, admin_client):
+        create_titles(admin_client)
+
+        assert self.search(client, 'терминатор') == ['Терминатор'], (
+            'Проверьте, что поиск по названию произведения не зависит '
+            'от регистра.'
+        )
+        assert self.search(client, 'yippie') == ['Крепкий орешек'], (
+            'Проверьте, что поиск выполняется и по описанию произведения.'
+        )
+        assert self.search(client, 'Креп') == ['Крепкий орешек'], (
+            'Проверьте, что слова запроса ищутся по префиксу.'
+        )
+        assert self.search(client, 'крепкий терминатор') == [], (
+            'Проверьте, что все слова запроса обязательны.'
+        )
+
+    def test_02_index_follows_changes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+
+        admin_client.patch(detail_url, data={'name': 'Чужой'})
+        assert self.search(client, 'Терминатор') == []
+        assert self.search(client, 'чужой') == ['Чужой'], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения.'
+        )
+
+        admin_client.delete(detail_url)
+        assert self.search(client, 'чужой') == [], (
+            'Проверьте, что поисковый индекс обновляется при удалении '
+            'произведения.'
+        )
+
+    def test_03_results_ranked_by_relevance(self, client, admin_client):
+        from reviews.models import Category, Title
+
+        category = Category.objects.create(name='Книги', slug='books')
+        Title.objects.create(
+            name='Сборник', year=2000, category=category,
+            description='Рассказы, среди которых есть один про дракона.',
+        )
+        Title.objects.create(
+            name='Дракон', year=2001, category=category,
+            description='Роман о драконе и о том, как победить дракона.',
+        )
+
+        assert self.search(client, 'дракон') == ['Дракон', 'Сборник'], (
+            'Проверьте, что результаты поиска упорядочены по релевантности.'
+        )
+
+    def test_04_cursor_requires_ordering(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get(self.TITLES_URL, {'search': 'а', 'cursor': ''})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что пагинация по ключу не подменяет порядок '
+            'релевантности результатов поиска.'
+        )
+        assert 'cursor' in response.json()
+
+        response = client.get(
+            self.TITLES_URL, {'search': 'а', 'cursor': '', 'ordering': 'name'}
+        )
+        assert response.status_code == HTTPStatus.OK
@@ -0,0 +1,77 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    CATEGORY_URL = '/api/v1/categories/'
+
+    def test_01_anonymous_reads_are_cached(self, client, admin_client,
+                                           django_assert_num_queries):
+        create_titles(admin_client)
+        for url in (self.TITLES_URL, self.CATEGORY_URL):
+            response = client.get(url)
+            with django_assert_num_queries(0):
+                cached_response = client.get(url)
+            assert cached_response.json() == response.json(), (
+                f'Проверьте, что повторный GET-запрос к `{url}` '
+                'возвращает закэшированный ответ.'
+            )
+
+        with django_assert_num_queries(4):
+            client.get(self.TITLES_URL, {'year': 1984})
+
+    def test_02_authenticated_reads_are_not_cached(self, admin_client):
+        from api.catalog import invalidate_catalog
+        from reviews.models import Category
+
+        create_titles(admin_client)
+        admin_client.get(self.CATEGORY_URL)
+
+        # update() не отправляет сигналы: версии кэша ответов остаются
+        # прежними, а каталог справочников сбрасывается явно.
+        Category.objects.filter(slug='films').update(name='Кино')
+        invalidate_catalog()
+        names = [
+            category['name']
+            for category in admin_client.get(self.CATEGORY_URL).json()[
+                'results'
+            ]
+        ]
+        assert 'Кино' in names, (
+            'Проверьте, что ответы авторизованным пользователям '
+            'не кэшируются.'
+        )
+
+    def test_03_cache_invalidated_by_changes(self, client, admin_client,
+                                             user_client):
+        titles, _, _ = create_titles(admin_client)
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        assert client.get(detail_url).json()['rating'] is None
+
+        create_single_review(user_client, titles[0]['id'], 'Отлично', 9)
+        assert client.get(detail_url).json()['rating'] == 9, (
+            'Проверьте, что после публикации отзыва кэш произведения '
+            'сбрасывается и рейтинг отображается актуальным.'
+        )
+        titles_response = client.get(self.TITLES_URL).json()
+        assert titles_response['results'][0]['rating'] == 9
+
+        admin_client.patch(detail_url, data={'genre': ['drama']})
+        genres = client.get(detail_url).json()['genre']
+        assert [genre['slug'] for genre in genres] == ['drama'], (
+            'Проверьте, что изменение жанров произведения '
+            'сбрасывает кэш произведения.'
+        )
+
+        admin_client.delete(f'{self.CATEGORY_URL}films/')
+        assert client.get(detail_url).status_code == HTTPStatus.NOT_FOUND
+        assert client.get(self.CATEGORY_URL).json()['count'] == 1
@@ -0,0 +1,109 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ConditionalGet:
+
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_list_not_modified(self, admin_client, admin, user_client,
+                                  moderator_client,
+                                  django_assert_num_queries):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        response = user_client.get(reviews_url)
+        etag = response['ETag']
+        assert etag, (
+            f'Проверьте, что ответ на GET-запрос к `{reviews_url}` '
+            'содержит заголовок `ETag`.'
+        )
+
+        # Пользователь, произведение, COUNT(*) для поля count
+        # и окно страницы с датами изменения.
+        with django_assert_num_queries(4):
+            response = user_client.get(
+                reviews_url, HTTP_IF_NONE_MATCH=etag
+            )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что при совпадении `If-None-Match` возвращается '
+            'ответ со статусом 304 без сериализации данных.'
+        )
+        assert not response.content
+
+        create_single_review(user_client, titles[0]['id'], 'Новый', 3)
+        response = user_client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после добавления отзыва `ETag` списка меняется.'
+        )
+        etag = response['ETag']
+
+        moderator_client.delete(f'{reviews_url}{reviews[0]["id"]}/')
+        response = user_client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после удаления отзыва `ETag` списка меняется.'
+        )
+
+    def test_02_detail_not_modified(self, client, admin_client, admin):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        response = client.get(detail_url)
+        assert response['Last-Modified'], (
+            f'Проверьте, что ответ на GET-запрос к `{detail_url}` '
+            'содержит заголовок `Last-Modified`.'
+        )
+        for headers in (
+            {'HTTP_IF_NONE_MATCH': response['ETag']},
+            {'HTTP_IF_MODIFIED_SINCE': response['Last-Modified']},
+        ):
+            assert client.get(
+                detail_url, **headers
+            ).status_code == HTTPStatus.NOT_MODIFIED
+
+        admin_client.patch(detail_url, data={'genre': ['drama']})
+        assert client.get(
+            detail_url, HTTP_IF_NONE_MATCH=response['ETag']
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение жанров произведения меняет его `ETag`.'
+        )
+
+    def test_03_list_validators_use_page_window(self, client, admin_client,
+                                                admin):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from reviews.models import Category, Title
+
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        url = '/api/v1/titles/?page_size=1'
+        etag = client.get(url)['ETag']
+        # Новое произведение попадает на последнюю страницу:
+        # первая страница не меняется, но меняется поле count.
+        Title.objects.create(
+            name='Последнее', year=3000,
+            category=Category.objects.get(slug=titles[0]['category']),
+        )
+        assert client.get(
+            url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.OK
+
+        cursor_url = f'{url}&cursor='
+        etag = client.get(cursor_url)['ETag']
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(cursor_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert not any(
+            'COUNT(' in query['sql'] or 'MAX(' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что в режиме `cursor` валидаторы списка считаются '
+            'по окну страницы, без агрегатов по всему списку.'
+        )
@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def stateless_auth(settings):
+    settings.STATELESS_JWT_AUTH = True
+
+
+def get_client(user):
+    from api.authentication import get_access_token
+
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {get_access_token(user)}'
+    )
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('stateless_auth')
+class Test14StatelessAuth:
+
+    USERS_URL = '/api/v1/users/'
+    USERS_ME_URL = '/api/v1/users/me/'
+
+    def test_01_user_not_loaded_from_db(self, admin,
+                                        django_assert_num_queries):
+        admin_client = get_client(admin)
+        admin_client.get(self.USERS_URL)
+
+        with django_assert_num_queries(3) as context:
+            response = admin_client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert not any(
+            'FROM "users_user" WHERE "users_user"."id"' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что в режиме STATELESS_JWT_AUTH пользователь '
+            'не загружается из БД при каждом запросе.'
+        )
+
+    def test_02_me_returns_full_user(self, user):
+        response = get_client(user).get(self.USERS_ME_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            'username': user.username,
+            'email': user.email,
+            'first_name': '',
+            'last_name': '',
+            'bio': user.bio,
+            'role': user.role,
+        }
+
+    def test_03_role_change_takes_effect(self, admin, user):
+        admin_client = get_client(admin)
+        user_client = get_client(user)
+        assert user_client.get(self.USERS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+
+        response = admin_client.patch(
+            f'{self.USERS_URL}{user.username}/', data={'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert user_client.get(self.USERS_URL).status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение роли пользователя учитывается для '
+            'токенов, выданных до изменения.'
+        )
+
+        admin.delete()
+        assert admin_client.get(self.USERS_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что токен удалённого пользователя не принимается.'
+        )
+
+    def test_04_version_cache_expires(self, settings, admin, user):
+        from django.contrib.auth import get_user_model
+        from django.db.models import F
+
+        user_client = get_client(user)
+        settings.TOKEN_VERSION_CACHE_TIMEOUT = 0
+        assert user_client.get(self.USERS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+
+        # Изменение в обход сигналов не сбрасывает кэш версий.
+        get_user_model().objects.filter(pk=user.pk).update(
+            role='admin', token_version=F('token_version') + 1
+        )
+        assert user_client.get(self.USERS_URL).status_code == HTTPStatus.OK, (
+            'Проверьте, что версия данных пользователя хранится в кэше '
+            'не дольше TOKEN_VERSION_CACHE_TIMEOUT секунд.'
+        )
@@ -0,0 +1,87 @@
+from datetime import timedelta
+from http import HTTPStatus
+from smtplib import SMTPException
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def signup(self, client, username):
+        return client.post(self.URL_SIGNUP, data={
+            'email': f'{username}@yamdb.fake',
+            'username': username,
+        })
+
+    def test_01_signup_queues_email(self, client):
+        from users.models import OutboxEmail
+
+        outbox_before_count = len(mail.outbox)
+        response = self.signup(client, 'queued')
+
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == outbox_before_count, (
+            'Письмо с кодом подтверждения не должно отправляться '
+            'во время запроса на регистрацию.'
+        )
+        email = OutboxEmail.objects.get()
+        assert email.recipient == 'queued@yamdb.fake'
+        assert email.status == OutboxEmail.Status.PENDING
+
+    def test_02_batch_uses_one_connection(self, client):
+        from users.models import OutboxEmail
+
+        for index in range(3):
+            self.signup(client, f'user{index}')
+
+        with mock.patch.object(
+            EmailBackend, 'open', autospec=True, side_effect=lambda self: True
+        ) as open_connection:
+            call_command('send_outbox_emails', '--once')
+
+        assert open_connection.call_count == 1
+        assert len(mail.outbox) == 3
+        assert {message.to[0] for message in mail.outbox} == {
+            f'user{index}@yamdb.fake' for index in range(3)
+        }
+        assert not OutboxEmail.objects.exclude(
+            status=OutboxEmail.Status.SENT
+        ).exists()
+
+    def test_03_failed_email_retried_with_backoff(self, client):
+        from users.models import OutboxEmail
+        from users.services import send_pending_emails
+
+        self.signup(client, 'retry')
+        started = timezone.now()
+        with mock.patch.object(
+            EmailBackend, 'send_messages', side_effect=SMTPException('down')
+        ):
+            assert send_pending_emails(max_attempts=2) == (0, 1)
+
+        email = OutboxEmail.objects.get()
+        assert email.status == OutboxEmail.Status.PENDING
+        assert email.attempts == 1
+        assert email.last_error == 'down'
+        assert email.next_attempt_at > started + timedelta(seconds=10)
+        assert send_pending_emails() == (0, 0), (
+            'Письмо не должно отправляться повторно до истечения задержки.'
+        )
+
+        OutboxEmail.objects.update(next_attempt_at=timezone.now())
+        with mock.patch.object(
+            EmailBackend, 'send_messages', side_effect=SMTPException('down')
+        ):
+            send_pending_emails(max_attempts=2)
+        email.refresh_from_db()
+        assert email.status == OutboxEmail.Status.FAILED
+        assert email.attempts == 2
+        assert not mail.outbox
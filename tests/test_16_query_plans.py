@@ -0,0 +1,119 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+SCAN = re.compile(r'\bSCAN \w+')
+TEMP_BTREE = re.compile(
+    r'USE TEMP B-TREE FOR (GROUP BY|DISTINCT|count\(DISTINCT)'
+)
+TEMP_SORT = 'USE TEMP B-TREE FOR ORDER BY'
+COUNT_QUERY = 'SELECT COUNT(*) AS "__count" FROM'
+
+
+def get_query_plan(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def get_unbounded_steps(sql, plan):
+    """
+    Шаги плана, объём работы которых растёт с размером таблицы:
+    любой SCAN (в том числе по индексу), кроме чтения в порядке
+    индекса, которое останавливается на LIMIT, и временные B-деревья
+    для группировки и DISTINCT.
+    """
+    bounded_scan = ' LIMIT ' in sql and not any(
+        step.startswith('USE TEMP B-TREE') for step in plan
+    )
+    return [
+        step for step in plan
+        if TEMP_BTREE.search(step) or SCAN.search(step) and not bounded_scan
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16QueryPlans:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    # Списки, строки которых допустимо сортировать во временном
+    # B-дереве, и причина для каждого.
+    SORTED_URLS = {
+        'genre=': (
+            'жанры произведения хранятся в GenreTitle, а порядок - '
+            'в Title: ни один индекс не даёт их вместе, сортируются '
+            'только произведения выбранных жанров'
+        ),
+    }
+
+    def get_urls(self, admin_client, authors_map):
+        comments, reviews, titles = create_comments(admin_client, authors_map)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        genres = ','.join(titles[0]['genre'])
+        return (
+            '/api/v1/categories/',
+            '/api/v1/genres/',
+            self.TITLES_URL,
+            f'{self.TITLES_URL}?genre={genres}',
+            f'{self.TITLES_URL}?genre={genres}&genre_match=all',
+            f'{self.TITLES_URL}?category={titles[0]["category"]}',
+            reviews_url,
+            comments_url,
+            '/api/v1/users/',
+        )
+
+    def test_01_list_queries_use_indexes(self, admin_client, admin, user,
+                                         user_client, moderator,
+                                         moderator_client):
+        authors_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client,
+        }
+        list_urls = self.get_urls(admin_client, authors_map)
+        for list_url in list_urls:
+            separator = '&' if '?' in list_url else '?'
+            for url in (list_url, f'{list_url}{separator}cursor='):
+                with CaptureQueriesContext(connection) as context:
+                    admin_client.get(url)
+                for query in context.captured_queries:
+                    if not query['sql'].startswith('SELECT'):
+                        continue
+                    plan = get_query_plan(query['sql'])
+                    # Число объектов для нумерации страниц без фильтров
+                    # читает индекс целиком; пагинация по ключу его
+                    # не считает.
+                    if query['sql'].startswith(COUNT_QUERY):
+                        assert url == list_url, (
+                            f'Запрос при GET-запросе к `{url}` считает '
+                            f'объекты:\n{query["sql"]}'
+                        )
+                        if '?' not in list_url:
+                            continue
+                    steps = get_unbounded_steps(query['sql'], plan)
+                    assert not steps, (
+                        f'Запрос при GET-запросе к `{url}` читает таблицу '
+                        f'целиком:\n{query["sql"]}\n{plan}'
+                    )
+                    if any(
+                        marker in list_url for marker in self.SORTED_URLS
+                    ):
+                        continue
+                    assert TEMP_SORT not in plan, (
+                        f'Запрос при GET-запросе к `{url}` сортирует строки '
+                        f'во временном B-дереве:\n{query["sql"]}\n{plan}'
+                    )
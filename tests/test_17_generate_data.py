@@ -0,0 +1,69 @@
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import Count
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17GenerateData:
+
+    SIZES = {
+        'users': 20,
+        'categories': 3,
+        'genres': 5,
+        'titles': 50,
+        'reviews': 300,
+        'comments': 400,
+    }
+
+    def test_01_sizes_and_distribution(self, django_user_model):
+        from reviews.models import Comment, GenreTitle, Review, Title
+
+        call_command('generate_data', verbosity=0, **self.SIZES)
+
+        assert django_user_model.objects.count() == self.SIZES['users']
+        assert Title.objects.count() == self.SIZES['titles']
+        assert Comment.objects.count() == self.SIZES['comments']
+        assert 0 < Review.objects.count() <= self.SIZES['reviews']
+        assert not Title.objects.filter(genre_title__isnull=True).exists()
+        assert GenreTitle.objects.count() >= self.SIZES['titles']
+
+        counts = sorted(
+            Title.objects.annotate(count=Count('reviews'))
+            .values_list('count', flat=True),
+            reverse=True,
+        )
+        assert counts[0] > 5 * counts[len(counts) // 2], (
+            'Отзывы должны распределяться по произведениям неравномерно.'
+        )
+        title = Title.objects.get(pk=Review.objects.values('title_id')[:1])
+        assert title.score_count == title.reviews.count(), (
+            'После генерации рейтинг произведений должен быть пересчитан.'
+        )
+
+    def test_02_appends_to_existing_data(self, django_user_model):
+        from reviews.models import Title
+
+        call_command('generate_data', verbosity=0, **self.SIZES)
+        call_command('generate_data', verbosity=0, **self.SIZES)
+
+        assert django_user_model.objects.count() == 2 * self.SIZES['users']
+        assert Title.objects.count() == 2 * self.SIZES['titles']
+
+    @pytest.mark.parametrize('args', (
+        ('--categories=0',),
+        ('--genres=0',),
+        ('--users=0',),
+        ('--users=0', '--reviews=0'),
+        ('--users=-1',),
+        ('--batch-size=0',),
+        ('--max-genres=0',),
+    ))
+    def test_03_invalid_sizes(self, args):
+        from reviews.models import Title
+
+        with pytest.raises(CommandError):
+            call_command('generate_data', *args, verbosity=0)
+        assert not Title.objects.exists(), (
+            'Проверьте, что при недопустимых размерах команда '
+            'завершается ошибкой до записи данных.'
+        )
@@ -0,0 +1,75 @@
+import json
+import logging
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18RequestTiming:
+
+    TITLES_URL = '/api/v1/titles/'
+    LOGGER = 'api.middleware'
+
+    def get_records(self, caplog, level):
+        return [
+            json.loads(record.getMessage())
+            for record in caplog.records
+            if record.name == self.LOGGER and record.levelno == level
+        ]
+
+    def test_01_server_timing_header(self, client, admin_client, caplog,
+                                     settings):
+        settings.REQUEST_TIMING_SAMPLE_RATE = 1
+        create_titles(admin_client)
+        caplog.set_level(logging.INFO, logger=self.LOGGER)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.TITLES_URL)
+        queries = len(context)
+
+        header = response.headers.get('Server-Timing', '')
+        metrics = dict(re.findall(r'(\w+);dur=([\d.]+)', header))
+        assert {'db', 'serialize', 'render', 'total'} <= set(metrics), (
+            'Ответ должен содержать заголовок Server-Timing со временем '
+            'запросов к БД, сериализации, рендеринга и общим временем.'
+        )
+        assert f'desc="{queries} queries"' in header
+
+        record = self.get_records(caplog, logging.INFO)[-1]
+        assert record['view'] == 'TitleViewSet'
+        assert record['action'] == 'list'
+        assert record['queries'] == queries
+        assert record['status'] == 200
+
+    def test_02_sampling(self, client, settings):
+        response = client.get(self.TITLES_URL)
+        assert 'Server-Timing' not in response.headers, (
+            'Проверьте, что заголовок Server-Timing по умолчанию выключен.'
+        )
+        settings.REQUEST_TIMING_SAMPLE_RATE = 1
+        response = client.get(self.TITLES_URL)
+        assert 'Server-Timing' in response.headers
+        settings.REQUEST_TIMING_SAMPLE_RATE = 0
+        response = client.get(self.TITLES_URL)
+        assert 'Server-Timing' not in response.headers
+
+    def test_03_slow_request_logged_with_sql(self, client, settings,
+                                             caplog):
+        settings.REQUEST_TIMING_SLOW_MS = 0
+        caplog.set_level(logging.INFO, logger=self.LOGGER)
+        response = client.get(self.TITLES_URL)
+        assert 'Server-Timing' not in response.headers
+
+        record = self.get_records(caplog, logging.WARNING)[-1]
+        assert record['sql'], (
+            'Медленный запрос должен журналироваться вместе с SQL.'
+        )
+        assert all('reviews_' in query['sql'] for query in record['sql'])
+        assert not self.get_records(caplog, logging.INFO), (
+            'Медленные запросы журналируются и без выборки '
+            'REQUEST_TIMING_SAMPLE_RATE.'
+        )
@@ -0,0 +1,90 @@
+import re
+
+import pytest
+
+
+@pytest.fixture
+def metrics_registry():
+    from api.metrics import metrics
+
+    metrics.reset()
+    yield metrics
+    metrics.reset()
+
+
+def get_value(text, name, **labels):
+    for line in text.splitlines():
+        match = re.fullmatch(rf'{name}\{{(.*)\}} (\S+)', line)
+        if match and all(
+            f'{label}="{value}"' in match.group(1)
+            for label, value in labels.items()
+        ):
+            return float(match.group(2))
+    return 0
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('metrics_registry')
+class Test19Metrics:
+
+    METRICS_URL = '/metrics'
+
+    def test_01_requests_by_basename_and_method(self, client, settings):
+        settings.METRICS_DIR = None
+        for _ in range(2):
+            client.get('/api/v1/titles/')
+        client.post('/api/v1/auth/signup/', data={})
+
+        response = client.get(self.METRICS_URL)
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+        text = response.content.decode()
+
+        assert get_value(
+            text, 'yamdb_http_requests_total', view='titles', method='GET'
+        ) == 2
+        assert get_value(
+            text, 'yamdb_http_request_duration_seconds_count',
+            view='titles', method='GET',
+        ) == 2
+        assert get_value(
+            text, 'yamdb_http_request_duration_seconds_bucket',
+            view='titles', method='GET', le='+Inf',
+        ) == 2
+        assert get_value(
+            text, 'yamdb_http_errors_total',
+            view='signup', method='POST', status='400',
+        ) == 1
+        assert get_value(
+            text, 'yamdb_db_queries_total', view='titles', method='GET'
+        ) > 0
+        assert get_value(
+            text, 'yamdb_cache_requests_total', cache='responses',
+            result='miss',
+        ) == 1
+        assert get_value(
+            text, 'yamdb_cache_requests_total', cache='responses',
+            result='hit',
+        ) == 1
+
+    def test_02_processes_aggregated_from_files(self, client, settings,
+                                                tmp_path, metrics_registry):
+        import json
+
+        settings.METRICS_DIR = str(tmp_path)
+        other_process = {
+            'counters': [[
+                'yamdb_http_requests_total',
+                [['method', 'GET'], ['view', 'titles']],
+                5,
+            ]],
+            'histograms': [],
+        }
+        (tmp_path / '1-other.json').write_text(json.dumps(other_process))
+        client.get('/api/v1/titles/')
+
+        text = client.get(self.METRICS_URL).content.decode()
+        assert get_value(
+            text, 'yamdb_http_requests_total', view='titles', method='GET'
+        ) == 6
+        assert (tmp_path / metrics_registry.file_name).exists()
@@ -0,0 +1,24 @@
+import pytest
+from django.db import connection
+
+
+@pytest.mark.django_db
+class Test20SQLiteTuning:
+
+    def get_pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_01_pragmas_applied_on_connect(self, settings):
+        pragmas = settings.SQLITE_PRAGMAS
+        assert self.get_pragma('busy_timeout') == int(
+            pragmas['busy_timeout']
+        )
+        assert self.get_pragma('cache_size') == int(pragmas['cache_size'])
+        # 1 - NORMAL, 2 - MEMORY.
+        assert self.get_pragma('synchronous') == 1
+        assert self.get_pragma('temp_store') == 2
+
+    def test_02_transactions_take_write_lock_immediately(self):
+        assert connection.transaction_mode == 'IMMEDIATE'
@@ -0,0 +1,112 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection, connections
+
+from tests.utils import create_titles
+
+REPLICA = 'replica_test'
+
+
+@pytest.fixture
+def make_replica(settings, tmp_path):
+    """
+    Копирует текущее состояние тестовой БД в файл SQLite,
+    который играет роль отстающей реплики.
+    """
+    from django.db.backends.sqlite3.base import DatabaseWrapper
+
+    path = tmp_path / f'{REPLICA}.sqlite3'
+    replica = DatabaseWrapper(
+        {**connection.settings_dict, 'NAME': str(path)}, alias=REPLICA
+    )
+    # Соединение создаётся вне settings.DATABASES, поэтому
+    # тестовый класс не запрещает обращения к нему.
+    connections[REPLICA] = replica
+    settings.DATABASE_REPLICAS = [REPLICA]
+
+    def snapshot():
+        replica.close()
+        path.unlink(missing_ok=True)
+        with connection.cursor() as cursor:
+            cursor.execute('VACUUM INTO %s', [str(path)])
+
+    yield snapshot
+    replica.close()
+    del connections[REPLICA]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21ReadReplicas:
+
+    TITLES_URL = '/api/v1/titles/'
+    USERS_URL = '/api/v1/users/'
+
+    def get_count(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return response.json()['count']
+
+    def test_01_reads_from_replica_and_sticks_after_write(
+            self, admin_client, user_superuser_client, settings,
+            make_replica):
+        titles, categories, genres = create_titles(admin_client)
+        make_replica()
+        data = {
+            'name': 'Новое произведение',
+            'year': 2000,
+            'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'],
+        }
+        response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+
+        assert self.get_count(
+            user_superuser_client, self.TITLES_URL
+        ) == len(titles), (
+            'Безопасные запросы к произведениям должны читать с реплики.'
+        )
+        assert self.get_count(
+            admin_client, self.TITLES_URL
+        ) == len(titles) + 1, (
+            'Пользователь, изменивший данные, должен сразу видеть '
+            'свои изменения.'
+        )
+
+    def test_02_pin_expires(self, admin_client, settings, make_replica):
+        settings.REPLICA_PIN_SECONDS = 0
+        titles, _, _ = create_titles(admin_client)
+        make_replica()
+        admin_client.delete(f'{self.TITLES_URL}{titles[0]["id"]}/')
+
+        assert self.get_count(admin_client, self.TITLES_URL) == len(titles)
+
+    def test_03_other_views_use_primary(self, admin_client,
+                                        user_superuser_client, make_replica):
+        make_replica()
+        admin_client.post(self.USERS_URL, data={
+            'username': 'new_user', 'email': 'new_user@yamdb.fake'
+        })
+        assert self.get_count(user_superuser_client, self.USERS_URL) == 3
+
+    def test_04_response_cache_is_filled_from_primary(self, client,
+                                                      admin_client,
+                                                      make_replica):
+        titles, categories, genres = create_titles(admin_client)
+        make_replica()
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Новое произведение',
+            'year': 2000,
+            'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'],
+        })
+        assert response.status_code == HTTPStatus.CREATED
+
+        for _ in range(2):
+            assert self.get_count(client, self.TITLES_URL) == (
+                len(titles) + 1
+            ), (
+                'Проверьте, что анонимный ответ, который сохраняется '
+                'в общий кэш, читается с основной БД, а не с отстающей '
+                'реплики.'
+            )
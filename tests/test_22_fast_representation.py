@@ -0,0 +1,74 @@
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22FastRepresentation:
+
+    def render(self, serializer_class, instances, **context):
+        return JSONRenderer().render(
+            serializer_class(instances, many=True, context=context).data
+        )
+
+    def assert_same_json(self, serializer_class, instances):
+        fast = self.render(serializer_class, instances)
+        assert fast == self.render(
+            serializer_class, instances, drf_representation=True
+        ), (
+            f'Быстрое представление `{serializer_class.__name__}` '
+            'должно совпадать с представлением DRF байт в байт.'
+        )
+        return fast
+
+    def test_01_same_json_as_drf(self, admin_client, admin, user,
+                                 user_client, moderator, moderator_client):
+        from api.serializers import (
+            AdiminUserSerializer, CategorySerializer, CommentSerializer,
+            GenreSerializer, ReviewSerializer, TitleSerializerReadOnly,
+        )
+        from reviews.models import Category, Comment, Genre, Review, Title
+
+        authors_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client,
+        }
+        create_comments(admin_client, authors_map)
+        # Произведение без жанров, описания и рейтинга.
+        Title.objects.create(
+            name='Без отзывов', year=2000, category=Category.objects.first()
+        )
+
+        titles = Title.objects.select_related('category').prefetch_related(
+            'genre'
+        ).order_by('id')
+        cases = (
+            (CategorySerializer, Category.objects.all()),
+            (GenreSerializer, Genre.objects.all()),
+            (TitleSerializerReadOnly, titles),
+            (ReviewSerializer, Review.objects.select_related('author')),
+            (CommentSerializer, Comment.objects.select_related('author')),
+            (AdiminUserSerializer, type(admin).objects.all()),
+        )
+        for serializer_class, queryset in cases:
+            assert self.assert_same_json(serializer_class, queryset) != b'[]'
+
+    def test_02_fast_path_skips_drf_fields(self, admin_client, monkeypatch):
+        from rest_framework import fields
+
+        from api.serializers import TitleSerializerReadOnly
+        from reviews.models import Category, Title
+
+        category = Category.objects.create(name='Фильм', slug='movie')
+        Title.objects.create(name='Фильм', year=2000, category=category)
+
+        def fail(*args, **kwargs):
+            raise AssertionError('Вызван Field.get_attribute.')
+
+        monkeypatch.setattr(fields.Field, 'get_attribute', fail)
+        data = TitleSerializerReadOnly(
+            Title.objects.select_related('category'), many=True
+        ).data
+        assert data[0]['category'] == {'name': 'Фильм', 'slug': 'movie'}
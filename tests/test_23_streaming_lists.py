@@ -0,0 +1,134 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23StreamingLists:
+
+    TITLES_URL = '/api/v1/titles/'
+    USERS_URL = '/api/v1/users/'
+
+    def add_titles(self, count):
+        from reviews.models import Category, Genre, Title
+
+        category = Category.objects.create(name='Музыка', slug='music')
+        genres = [
+            Genre.objects.create(name=f'Жанр {number}', slug=f'genre-{number}')
+            for number in range(2)
+        ]
+        titles = Title.objects.bulk_create(
+            Title(name=f'Альбом {number}', year=2000, category=category)
+            for number in range(count)
+        )
+        for title in titles:
+            title.genre.set(genres)
+
+    def get_streamed(self, client, url, **params):
+        response = client.get(url, {'stream': 'true', **params})
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            'Проверьте, что при `stream=true` список отдаётся '
+            'через StreamingHttpResponse.'
+        )
+        assert response['Content-Type'] == 'application/json'
+        return list(response.streaming_content)
+
+    def test_01_same_body_as_regular_list(self, client, admin_client,
+                                          settings):
+        settings.STREAMING_CHUNK_SIZE = 2
+        self.add_titles(7)
+        for api_client, url, params in (
+            (client, self.TITLES_URL, {}),
+            (client, self.TITLES_URL, {'page': 2, 'page_size': 3}),
+            (admin_client, self.USERS_URL, {}),
+        ):
+            parts = self.get_streamed(api_client, url, **params)
+            expected = api_client.get(
+                url, {'stream': 'false', **params}
+            ).content
+            assert b''.join(parts).replace(
+                b'stream=true', b'stream=false'
+            ) == expected, (
+                f'Проверьте, что потоковый ответ `{url}` совпадает '
+                'с обычным ответом для той же страницы.'
+            )
+        parts = self.get_streamed(client, self.TITLES_URL, page_size=7)
+        # Заголовок, четыре порции по два объекта и окончание.
+        assert len(parts) == 6
+
+    def test_02_page_size_limits(self, client, settings):
+        settings.MAX_PAGE_SIZE = 3
+        settings.STREAMING_MAX_PAGE_SIZE = 5
+        self.add_titles(7)
+        response = client.get(self.TITLES_URL, {'page_size': 7})
+        assert len(response.json()['results']) == 3
+        parts = self.get_streamed(client, self.TITLES_URL, page_size=7)
+        assert b'"next":"' in parts[0]
+        assert len(b''.join(parts).split(b'"id":')) == 6
+
+    def test_03_rows_are_read_in_chunks(self, client, settings,
+                                        django_assert_num_queries):
+        settings.STREAMING_CHUNK_SIZE = 2
+        from api.catalog import get_catalog
+
+        self.add_titles(5)
+        get_catalog()
+        response = client.get(
+            self.TITLES_URL, {'stream': 'true', 'page_size': 5}
+        )
+        # Один запрос строк, прочитанных порциями, и по запросу
+        # связей с жанрами на каждую из трёх порций; категории и жанры
+        # берутся из загруженного каталога.
+        with django_assert_num_queries(4):
+            list(response.streaming_content)
+
+    def test_04_cursor_is_not_supported(self, client):
+        response = client.get(self.TITLES_URL, {'stream': 'true', 'cursor': ''})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_05_validators_do_not_load_rows(self, client):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from reviews.models import Title
+
+        self.add_titles(5)
+        params = {'stream': 'true', 'page_size': 3}
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.TITLES_URL, params)
+        assert not [
+            query['sql'] for query in context.captured_queries
+            if '"reviews_title"."description"' in query['sql']
+        ], (
+            'Проверьте, что ETag потокового списка считается без чтения '
+            'строк страницы: строки читаются только при отправке ответа.'
+        )
+        etag = response['ETag']
+        list(response.streaming_content)
+        response = client.get(
+            self.TITLES_URL, params, HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        Title.objects.filter(
+            pk=Title.objects.order_by('year', 'name', 'id')[1].pk
+        ).delete()
+        response = client.get(
+            self.TITLES_URL, params, HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ETag потокового списка меняется, когда '
+            'меняется состав страницы.'
+        )
+        list(response.streaming_content)
+
+        with CaptureQueriesContext(connection) as context:
+            client.get(self.TITLES_URL, {'page_size': 3})
+        assert len([
+            query['sql'] for query in context.captured_queries
+            if '"reviews_title"."description"' in query['sql']
+        ]) == 1, (
+            'Проверьте, что окно страницы для ETag читает только id '
+            'и даты изменения, без полных строк.'
+        )
@@ -0,0 +1,119 @@
+import csv
+import gzip
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24Export:
+
+    EXPORT_URL_TEMPLATE = '/api/v1/export/{dataset}.{export_format}'
+
+    @pytest.fixture
+    def catalog(self, admin_client, admin, user, user_client, moderator,
+                moderator_client):
+        authors_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client,
+        }
+        return create_comments(admin_client, authors_map)
+
+    def get_export(self, client, dataset, export_format):
+        response = client.get(self.EXPORT_URL_TEMPLATE.format(
+            dataset=dataset, export_format=export_format
+        ))
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            'Проверьте, что выгрузка отдаётся через StreamingHttpResponse.'
+        )
+        return b''.join(response.streaming_content)
+
+    def test_01_export_is_admin_only(self, client, user_client,
+                                     moderator_client):
+        url = self.EXPORT_URL_TEMPLATE.format(
+            dataset='titles', export_format='csv'
+        )
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        for api_client in (user_client, moderator_client):
+            assert api_client.get(url).status_code == HTTPStatus.FORBIDDEN
+
+    def test_02_csv_ndjson_and_gzip(self, admin_client, catalog):
+        from reviews.models import Review
+
+        comments, reviews, titles = catalog
+        content = self.get_export(admin_client, 'titles', 'csv')
+        rows = list(csv.DictReader(io.StringIO(content.decode())))
+        assert [
+            (int(row['id']), row['name'], row['description'])
+            for row in rows
+        ] == [
+            (title['id'], title['name'], title['description'])
+            for title in titles
+        ]
+
+        content = self.get_export(admin_client, 'review', 'ndjson')
+        rows = [json.loads(line) for line in content.decode().splitlines()]
+        assert [row['id'] for row in rows] == sorted(
+            review['id'] for review in reviews
+        )
+        review = Review.objects.get(pk=rows[0]['id'])
+        assert rows[0]['author'] == review.author_id
+        assert rows[0]['title_id'] == review.title_id
+
+        compressed = self.get_export(admin_client, 'comments', 'ndjson.gz')
+        assert gzip.decompress(compressed) == self.get_export(
+            admin_client, 'comments', 'ndjson'
+        )
+
+        response = admin_client.get(self.EXPORT_URL_TEMPLATE.format(
+            dataset='unknown', export_format='csv'
+        ))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_export_can_be_imported(self, catalog, tmp_path,
+                                       monkeypatch):
+        from django.contrib.auth import get_user_model
+
+        from reviews.models import Category, Comment, Genre, Review, Title
+
+        models = (
+            get_user_model(), Category, Genre, Title, Review, Comment
+        )
+
+        def snapshot():
+            return {
+                model.__name__: list(
+                    model.objects.order_by('pk').values_list(
+                        *(
+                            field.attname
+                            for field in model._meta.concrete_fields
+                            if field.attname not in (
+                                'pub_date', 'updated_at', 'password',
+                                'last_login', 'date_joined', 'is_active',
+                            )
+                        )
+                    )
+                )
+                for model in models
+            }
+
+        exported = snapshot()
+        call_command(
+            'export_data', output_dir=str(tmp_path / 'static' / 'data')
+        )
+        for model in reversed(models):
+            model.objects.all().delete()
+
+        monkeypatch.chdir(tmp_path)
+        call_command('import_data_from_csv')
+        assert snapshot() == exported, (
+            'Проверьте, что данные, выгруженные командой `export_data`, '
+            'загружаются командой `import_data_from_csv` без потерь.'
+        )
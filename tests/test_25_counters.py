@@ -0,0 +1,100 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25Counters:
+
+    TITLE_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/{review_id}/'
+
+    @pytest.fixture
+    def catalog(self, admin_client, admin, user, user_client, moderator,
+                moderator_client):
+        authors_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client,
+        }
+        return create_comments(admin_client, authors_map)
+
+    def get_counts(self, client, title_id, review_id):
+        title = client.get(
+            self.TITLE_URL_TEMPLATE.format(title_id=title_id)
+        ).json()
+        review = client.get(self.REVIEW_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id
+        )).json()
+        return title['reviews_count'], review['comments_count']
+
+    def test_01_counters_follow_changes(self, admin_client, user, catalog):
+        from reviews.models import Comment, Review
+
+        comments, reviews, titles = catalog
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        assert self.get_counts(admin_client, title_id, review_id) == (3, 3)
+
+        # Сохранение отзыва, загруженного до появления комментария,
+        # не должно перезаписывать счётчик.
+        stale_review = Review.objects.get(pk=review_id)
+        Comment.objects.create(
+            review_id=review_id, author=user, text='Ещё один'
+        )
+        stale_review.text = 'Изменённый текст'
+        stale_review.save()
+        assert self.get_counts(admin_client, title_id, review_id) == (3, 4)
+
+        review_url = self.REVIEW_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id
+        )
+        response = admin_client.delete(
+            f'{review_url}comments/{comments[0]["id"]}/'
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_counts(admin_client, title_id, review_id) == (3, 3)
+
+        # Каскадное удаление отзывов и комментариев вместе с автором.
+        user.delete()
+        assert self.get_counts(admin_client, title_id, review_id) == (2, 1)
+
+    def test_02_rebuild_counters(self, admin_client, catalog):
+        from reviews.models import Review, Title
+
+        comments, reviews, titles = catalog
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        Title.objects.update(score_count=0, score_sum=0, rating=None)
+        Review.objects.update(comments_count=10)
+        call_command('rebuild_counters', chunk_size=1)
+        assert self.get_counts(admin_client, title_id, review_id) == (3, 3)
+        assert set(
+            Review.objects.exclude(pk=review_id)
+            .values_list('comments_count', flat=True)
+        ) == {0}
+
+    def test_03_cascade_skips_counters(self, admin_client, catalog):
+        from reviews.models import Review, Title
+
+        comments, reviews, titles = catalog
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        for delete in (
+            lambda: admin_client.delete(self.REVIEW_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id
+            )),
+            lambda: Review.objects.filter(title_id=title_id).delete(),
+            lambda: Title.objects.get(pk=titles[1]['id']).delete(),
+        ):
+            with CaptureQueriesContext(connection) as context:
+                delete()
+            assert not [
+                query['sql'] for query in context.captured_queries
+                if query['sql'].startswith('UPDATE "reviews_review"')
+            ], (
+                'Проверьте, что комментарии, удаляемые вместе с отзывом '
+                'или произведением, не обновляют счётчик удаляемого отзыва.'
+            )
@@ -0,0 +1,120 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27Catalog:
+
+    CATEGORY_URL = '/api/v1/categories/'
+    GENRE_URL = '/api/v1/genres/'
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def test_01_lists_are_served_from_memory(self, admin_client,
+                                             django_assert_num_queries):
+        create_titles(admin_client)
+        for url in (self.CATEGORY_URL, self.GENRE_URL):
+            response = admin_client.get(url)
+            # Единственный запрос - пользователь из токена.
+            with django_assert_num_queries(1):
+                assert admin_client.get(url).json() == response.json(), (
+                    f'Проверьте, что список `{url}` берётся из каталога '
+                    'справочников без запросов к БД.'
+                )
+
+        response = admin_client.get(self.CATEGORY_URL, {'search': 'фил'})
+        assert [
+            category['slug'] for category in response.json()['results']
+        ] == ['films']
+        response = admin_client.get(self.GENRE_URL, {'search': 'DRAMA'})
+        assert response.json()['count'] == 1
+
+    def test_02_changes_reach_other_workers(self, admin_client):
+        from api.catalog import CatalogStore
+        from reviews.models import Category, Genre
+
+        create_titles(admin_client)
+        other_worker = CatalogStore()
+        catalog = other_worker.get()
+        assert other_worker.get() is catalog
+
+        category = Category.objects.get(slug='films')
+        category.name = 'Кино'
+        category.save()
+        Genre.objects.get(slug='drama').delete()
+
+        catalog = other_worker.get()
+        assert catalog.get_by_slug(Category, 'films').name == 'Кино', (
+            'Проверьте, что изменение категории сбрасывает каталог '
+            'во всех процессах через версию в общем кэше.'
+        )
+        assert catalog.get_by_slug(Genre, 'drama') is None
+
+    def test_03_snapshot_has_max_age(self, admin_client, settings,
+                                     monkeypatch):
+        from api import catalog as catalog_module
+        from reviews.models import Category
+
+        create_titles(admin_client)
+        settings.CATALOG_MAX_AGE = 60
+        now = catalog_module.monotonic()
+        monkeypatch.setattr(catalog_module, 'monotonic', lambda: now)
+        other_worker = catalog_module.CatalogStore()
+        catalog = other_worker.get()
+
+        # Изменение, о котором версия в кэше не сообщила.
+        Category.objects.filter(slug='films').update(name='Кино')
+        monkeypatch.setattr(catalog_module, 'monotonic', lambda: now + 59)
+        assert other_worker.get() is catalog
+        monkeypatch.setattr(catalog_module, 'monotonic', lambda: now + 60)
+        assert other_worker.get().get_by_slug(
+            Category, 'films'
+        ).name == 'Кино', (
+            'Проверьте, что каталог перечитывается не реже раза '
+            'в CATALOG_MAX_AGE секунд.'
+        )
+
+    def test_04_titles_use_catalog(self, admin_client):
+        from reviews.models import Category, Genre
+
+        titles, categories, _ = create_titles(admin_client)
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        Genre.objects.create(name='Аниме', slug='anime').titles.add(
+            titles[0]['id']
+        )
+        category = Category.objects.get(slug=categories[0]['slug'])
+        category.name = 'Кино'
+        category.save()
+
+        title = admin_client.get(detail_url).json()
+        assert title['category'] == {'name': 'Кино', 'slug': 'films'}
+        assert [genre['slug'] for genre in title['genre']] == [
+            'anime', 'comedy', 'horror'
+        ], 'Проверьте, что жанры произведения упорядочены по названию.'
+
+    def test_05_write_validates_slugs(self, admin_client):
+        from reviews.models import Category
+
+        create_titles(admin_client)
+        data = {
+            'name': 'Чужие',
+            'year': 1986,
+            'genre': ['drama'],
+            'category': 'unknown',
+        }
+        response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'category' in response.json()
+
+        # Категория добавлена в обход сигналов: каталог её не знает,
+        # но проверка slug находит её в БД.
+        Category.objects.bulk_create([Category(name='Мультфильм', slug='toon')])
+        data['category'] = 'toon'
+        response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['category']['slug'] == 'toon'
@@ -0,0 +1,116 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28Facets:
+
+    FACETS_URL = '/api/v1/titles/facets/'
+
+    @pytest.fixture
+    def titles(self):
+        from reviews.models import Category, Genre, Title
+
+        movie = Category.objects.create(name='Фильм', slug='movie')
+        book = Category.objects.create(name='Книга', slug='book')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        for name, year, category, genres, rating in (
+            ('Драмеди', 1985, movie, (drama, comedy), 8),
+            ('Драма', 1999, movie, (drama,), 8),
+            ('Комедия', 2004, book, (comedy,), None),
+            ('Повесть', 1981, book, (), 3),
+        ):
+            title = Title.objects.create(
+                name=name, year=year, category=category
+            )
+            title.genre.set(genres)
+            # Рейтинг ведётся отзывами; для фасетов задаём его напрямую.
+            Title.objects.filter(pk=title.pk).update(rating=rating)
+
+    def get_facets(self, client, **params):
+        response = client.get(self.FACETS_URL, params)
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+
+    def test_01_facet_counts(self, client, titles):
+        facets = self.get_facets(client)
+        assert facets['count'] == 4
+        assert facets['category'] == [
+            {'slug': 'book', 'name': 'Книга', 'count': 2},
+            {'slug': 'movie', 'name': 'Фильм', 'count': 2},
+        ]
+        assert facets['genre'] == [
+            {'slug': 'drama', 'name': 'Драма', 'count': 2},
+            {'slug': 'comedy', 'name': 'Комедия', 'count': 2},
+        ]
+        assert facets['decade'] == [
+            {'decade': 1980, 'count': 2},
+            {'decade': 1990, 'count': 1},
+            {'decade': 2000, 'count': 1},
+        ]
+        assert facets['rating'] == [
+            {'rating': 3, 'count': 1},
+            {'rating': 8, 'count': 2},
+            {'rating': None, 'count': 1},
+        ]
+
+        facets = self.get_facets(client, genre='drama')
+        assert facets['count'] == 2
+        assert facets['category'] == [
+            {'slug': 'movie', 'name': 'Фильм', 'count': 2}
+        ]
+        assert facets['genre'] == [
+            {'slug': 'drama', 'name': 'Драма', 'count': 2},
+            {'slug': 'comedy', 'name': 'Комедия', 'count': 1},
+        ]
+        facets = self.get_facets(client, search='комедия', year=2004)
+        assert facets['count'] == 1
+        assert facets['rating'] == [{'rating': None, 'count': 1}]
+
+        response = client.get(self.FACETS_URL, {'genre_match': 'some'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_queries_do_not_depend_on_catalog_size(
+            self, client, titles, django_assert_num_queries):
+        from api.catalog import get_catalog
+        from reviews.models import Category, Genre, Title
+
+        get_catalog()
+        with django_assert_num_queries(2):
+            self.get_facets(client, year=1985)
+
+        category = Category.objects.create(name='Музыка', slug='music')
+        genres = Genre.objects.bulk_create(
+            Genre(name=f'Жанр {number}', slug=f'genre-{number}')
+            for number in range(10)
+        )
+        Title.objects.create(
+            name='Альбом', year=1985, category=category
+        ).genre.set(genres)
+        get_catalog()
+        with django_assert_num_queries(2):
+            facets = self.get_facets(client, year=1985)
+        assert len(facets['genre']) == 12, (
+            'Проверьте, что жанры, добавленные в обход сигналов, '
+            'дочитываются из БД.'
+        )
+
+    def test_03_unfiltered_facets_are_cached(self, client, titles,
+                                            django_assert_num_queries):
+        from reviews.models import Category, Title
+
+        self.get_facets(client)
+        with django_assert_num_queries(0):
+            assert self.get_facets(client)['count'] == 4
+
+        Title.objects.create(
+            name='Новинка', year=2024, category=Category.objects.first()
+        )
+        facets = self.get_facets(client)
+        assert facets['count'] == 5, (
+            'Проверьте, что кэш фасетов сбрасывается при изменении '
+            'произведений.'
+        )
+        assert facets['decade'][-1] == {'decade': 2020, 'count': 1}
@@ -0,0 +1,168 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.test_16_query_plans import TEMP_SORT, get_query_plan
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29Leaderboards:
+
+    CATEGORY_TOP_URL_TEMPLATE = '/api/v1/categories/{slug}/top/'
+    GENRE_TOP_URL_TEMPLATE = '/api/v1/genres/{slug}/top/'
+
+    @pytest.fixture
+    def titles(self, settings, django_user_model):
+        from reviews.models import Category, Genre, Title
+
+        settings.LEADERBOARD_SIZE = 2
+        settings.LEADERBOARD_MIN_REVIEWS = 2
+        movie = Category.objects.create(name='Фильм', slug='movie')
+        Category.objects.create(name='Книга', slug='book')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        self.users = [
+            django_user_model.objects.create(
+                username=f'critic{number}', email=f'critic{number}@yamdb.fake'
+            )
+            for number in range(3)
+        ]
+        titles = {}
+        for name in ('Альфа', 'Бета', 'Гамма'):
+            title = Title.objects.create(name=name, year=2000, category=movie)
+            title.genre.add(drama)
+            titles[name] = title
+        return titles
+
+    def rate(self, title, *scores):
+        from reviews.models import Review
+
+        start = title.reviews.count()
+        for user, score in zip(self.users[start:], scores):
+            Review.objects.create(
+                title=title, author=user, text='Отзыв', score=score
+            )
+
+    def get_top(self, client, url_template, slug):
+        response = client.get(url_template.format(slug=slug))
+        assert response.status_code == HTTPStatus.OK
+        return [
+            (title['name'], title['rating'], title['reviews_count'])
+            for title in response.json()
+        ]
+
+    def get_boards(self, client):
+        return {
+            slug: self.get_top(client, url_template, slug)
+            for url_template, slug in (
+                (self.CATEGORY_TOP_URL_TEMPLATE, 'movie'),
+                (self.CATEGORY_TOP_URL_TEMPLATE, 'book'),
+                (self.GENRE_TOP_URL_TEMPLATE, 'drama'),
+            )
+        }
+
+    def test_01_incremental_updates(self, client, titles):
+        from reviews.leaderboards import rebuild_leaderboards
+
+        self.rate(titles['Альфа'], 8)
+        assert self.get_top(client, self.GENRE_TOP_URL_TEMPLATE, 'drama') == [
+        ], 'Проверьте, что в рейтинг попадают только произведения с ' \
+           'LEADERBOARD_MIN_REVIEWS оценками.'
+
+        self.rate(titles['Альфа'], 6)
+        self.rate(titles['Бета'], 9, 9)
+        self.rate(titles['Гамма'], 5, 5)
+        expected = [('Бета', 9, 2), ('Альфа', 7, 2)]
+        assert self.get_boards(client) == {
+            'movie': expected, 'book': [], 'drama': expected,
+        }, 'Проверьте, что рейтинг ограничен LEADERBOARD_SIZE местами.'
+
+        # Оценка 6 не проходит в заполненный рейтинг.
+        self.rate(titles['Гамма'], 10)
+        assert self.get_top(
+            client, self.GENRE_TOP_URL_TEMPLATE, 'drama'
+        ) == expected
+
+        # Бета теряет оценку и выбывает: освободившееся место занимает
+        # следующее произведение.
+        titles['Бета'].reviews.first().delete()
+        expected = [('Альфа', 7, 2), ('Гамма', 6, 3)]
+        boards = self.get_boards(client)
+        assert boards == {
+            'movie': expected, 'book': [], 'drama': expected,
+        }
+
+        rebuild_leaderboards()
+        assert self.get_boards(client) == boards, (
+            'Проверьте, что пересчёт рейтингов совпадает с их '
+            'последовательным обновлением.'
+        )
+
+    def test_02_category_genre_and_delete(self, client, titles):
+        from reviews.models import Category
+
+        for name, scores in (
+            ('Альфа', (8, 6)), ('Бета', (9, 9)), ('Гамма', (6, 5)),
+        ):
+            self.rate(titles[name], *scores)
+
+        title = titles['Бета']
+        title.category = Category.objects.get(slug='book')
+        title.save()
+        assert self.get_boards(client) == {
+            'movie': [('Альфа', 7, 2), ('Гамма', 5, 2)],
+            'book': [('Бета', 9, 2)],
+            'drama': [('Бета', 9, 2), ('Альфа', 7, 2)],
+        }, 'Проверьте, что при смене категории произведение переходит ' \
+           'в рейтинг новой категории.'
+
+        titles['Альфа'].genre.clear()
+        assert self.get_top(client, self.GENRE_TOP_URL_TEMPLATE, 'drama') == [
+            ('Бета', 9, 2), ('Гамма', 5, 2)
+        ]
+
+        titles['Бета'].delete()
+        assert self.get_boards(client) == {
+            'movie': [('Альфа', 7, 2), ('Гамма', 5, 2)],
+            'book': [],
+            'drama': [('Гамма', 5, 2)],
+        }
+
+    def test_03_rebuild_command(self, client, titles, capsys):
+        from reviews.models import LeaderboardEntry
+
+        self.rate(titles['Альфа'], 8, 6)
+        self.rate(titles['Бета'], 9, 9)
+        boards = self.get_boards(client)
+        LeaderboardEntry.objects.all().delete()
+
+        call_command('rebuild_leaderboards')
+        assert 'мест: 4' in capsys.readouterr().out
+        assert self.get_boards(client) == boards
+
+    def test_04_top_is_single_index_range(self, client, titles):
+        self.rate(titles['Альфа'], 8, 6)
+        response = client.get(
+            self.GENRE_TOP_URL_TEMPLATE.format(slug='unknown')
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+        for url_template, slug, index in (
+            (self.CATEGORY_TOP_URL_TEMPLATE, 'movie',
+             'leaderboard_category_idx'),
+            (self.GENRE_TOP_URL_TEMPLATE, 'drama', 'leaderboard_genre_idx'),
+        ):
+            with CaptureQueriesContext(connection) as context:
+                self.get_top(client, url_template, slug)
+            queries = [
+                query['sql'] for query in context.captured_queries
+                if 'reviews_leaderboardentry' in query['sql']
+            ]
+            assert len(queries) == 1, (
+                'Проверьте, что рейтинг читается одним запросом.'
+            )
+            plan = get_query_plan(queries[0])
+            assert any(index in step for step in plan), plan
+            assert TEMP_SORT not in plan, plan
@@ -0,0 +1,134 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.test_16_query_plans import TEMP_SORT, get_query_plan
+
+MULTI_INDEX = 'MULTI-INDEX OR'
+
+ORDERINGS = {
+    'id': 'id',
+    'name': 'title_name_idx',
+    'year': 'title_year_name_idx',
+    'rating': 'title_rating_idx',
+}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30TitleOrdering:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        from reviews.models import Category, Title
+
+        category = Category.objects.create(name='Фильм', slug='films')
+        # Повторяющиеся названия, годы и оценки, произведения без оценок.
+        Title.objects.bulk_create(
+            Title(
+                name=f'Произведение {number % 7}',
+                year=1990 + number % 3,
+                category=category,
+                rating=None if number % 5 == 0 else number % 3 + 5,
+                score_count=0 if number % 5 == 0 else number % 2 + 1,
+            )
+            for number in range(15)
+        )
+        return list(Title.objects.values(
+            'id', 'name', 'year', 'rating', 'score_count'
+        ))
+
+    def get_expected_ids(self, titles, ordering):
+        from api.views import TitleViewSet
+
+        field = ordering.lstrip('-')
+        key = TitleViewSet.ordering_keys[field]
+        # NULL в SQLite меньше любого значения.
+        ids = [
+            title['id'] for title in sorted(titles, key=lambda title: [
+                (title[name] is not None, title[name]) for name in key
+            ])
+        ]
+        return ids[::-1] if ordering.startswith('-') else ids
+
+    def get_plans(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        plans = [
+            get_query_plan(query['sql'])
+            for query in context.captured_queries
+            if query['sql'].startswith('SELECT "reviews_title"."id"')
+        ]
+        return response.json(), plans
+
+    @pytest.mark.parametrize('ordering', [
+        prefix + field for field in ORDERINGS for prefix in ('', '-')
+    ])
+    def test_01_orderings_use_indexes(self, client, titles, ordering):
+        expected_ids = self.get_expected_ids(titles, ordering)
+        index = ORDERINGS[ordering.lstrip('-')]
+
+        # Окно страницы для валидаторов ETag и сама страница.
+        data, plans = self.get_plans(
+            client, f'{self.TITLES_URL}?ordering={ordering}&page=2&page_size=4'
+        )
+        assert [title['id'] for title in data['results']] == (
+            expected_ids[4:8]
+        ), f'Проверьте сортировку списка произведений `{ordering}`.'
+        assert len(plans) == 2
+        for plan in plans:
+            assert TEMP_SORT not in plan, (
+                f'Проверьте, что сортировка `{ordering}` читает индекс '
+                f'без сортировки во временном B-дереве:\n{plan}'
+            )
+            if index != 'id':
+                assert any(index in step for step in plan), plan
+
+        ids = []
+        url = f'{self.TITLES_URL}?ordering={ordering}&cursor=&page_size=4'
+        while url:
+            # Окно для валидаторов ETag и страница; на границе
+            # произведений без оценок каждое читается двумя
+            # диапазонами индекса.
+            data, plans = self.get_plans(client, url)
+            assert len(plans) <= 4
+            for plan in plans:
+                assert TEMP_SORT not in plan and MULTI_INDEX not in plan, (
+                    f'Проверьте, что пагинация по ключу с сортировкой '
+                    f'`{ordering}` читает диапазон индекса:\n{plan}'
+                )
+            ids.extend(title['id'] for title in data['results'])
+            url, previous = data['next'], data['previous']
+        assert ids == expected_ids, (
+            'Проверьте, что пагинация по ключу обходит произведения '
+            f'в порядке `{ordering}` без пропусков и повторов.'
+        )
+
+        ids = [title['id'] for title in data['results']]
+        while previous:
+            data, _ = self.get_plans(client, previous)
+            ids[:0] = [title['id'] for title in data['results']]
+            previous = data['previous']
+        assert ids == expected_ids, (
+            'Проверьте ссылки `previous` при сортировке '
+            f'`{ordering}`.'
+        )
+
+    def test_02_default_and_invalid_ordering(self, client, titles):
+        for params, ordering in (
+            ({}, 'year'),
+            ({'ordering': 'description'}, 'year'),
+            ({'ordering': '-rating,id'}, '-rating'),
+        ):
+            response = client.get(self.TITLES_URL, {**params, 'page_size': 20})
+            assert [
+                title['id'] for title in response.json()['results']
+            ] == self.get_expected_ids(titles, ordering), (
+                'Проверьте, что без `ordering` и с недопустимым полем '
+                'сохраняется сортировка по году и названию, а из '
+                'нескольких полей учитывается первое.'
+            )
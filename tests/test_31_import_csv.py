@@ -0,0 +1,69 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31ImportCsv:
+
+    def test_01_bad_values_skip_only_their_rows(self, tmp_path, monkeypatch,
+                                                capsys):
+        from reviews.models import Category, Title
+
+        data_dir = tmp_path / 'static' / 'data'
+        data_dir.mkdir(parents=True)
+        (data_dir / 'category.csv').write_text(
+            'id,name,slug\n1,Фильм,movie\n', encoding='utf-8'
+        )
+        (data_dir / 'titles.csv').write_text(
+            'id,name,year,category\n'
+            '1,Чужой,1979,1\n'
+            '2,Ошибка,abc,1\n'
+            '3,Чужие,1986,1\n',
+            encoding='utf-8',
+        )
+        (data_dir / 'review.csv').write_text(
+            'id,title_id,text,author,score,pub_date\n'
+            '1,1,Отзыв,1,5,не дата\n',
+            encoding='utf-8',
+        )
+        monkeypatch.chdir(tmp_path)
+
+        call_command('import_data_from_csv')
+
+        assert sorted(Title.objects.values_list('name', flat=True)) == [
+            'Чужие', 'Чужой'
+        ], (
+            'Проверьте, что строка с некорректным значением пропускается, '
+            'а остальные строки пачки сохраняются.'
+        )
+        assert Category.objects.count() == 1
+        output = capsys.readouterr().out
+        assert 'Title id=2' in output
+        assert 'Review id=1' in output
+        assert 'Рейтинг пересчитан' in output, (
+            'Проверьте, что после ошибочных строк импорт продолжается.'
+        )
+
+    def test_02_import_resets_cached_responses(self, client, tmp_path,
+                                               monkeypatch):
+        data_dir = tmp_path / 'static' / 'data'
+        data_dir.mkdir(parents=True)
+        (data_dir / 'category.csv').write_text(
+            'id,name,slug\n1,Фильм,movie\n', encoding='utf-8'
+        )
+        (data_dir / 'titles.csv').write_text(
+            'id,name,year,category\n1,Чужой,1979,1\n', encoding='utf-8'
+        )
+        monkeypatch.chdir(tmp_path)
+        urls = ('/api/v1/categories/', '/api/v1/titles/')
+        for url in urls:
+            assert client.get(url).json()['count'] == 0
+
+        call_command('import_data_from_csv')
+
+        for url in urls:
+            assert client.get(url).json()['count'] == 1, (
+                f'Проверьте, что после импорта ответ на GET-запрос к `{url}` '
+                'не берётся из кэша и каталога справочников: bulk_create '
+                'не отправляет сигналы.'
+            )